@@ -5,28 +5,17 @@ from pathlib import Path
 import pyautogui
 import pyperclip
 
+from agents.locator import TemplateLocator
+from agents.readiness import ResponseProbe
+from agents.tracer import PhaseTracer
 from globals.constants import (
-    COEFFICIENT_OF_LOSS_MAX, COEFFICIENT_OF_LOSS_MIN, NETUNO_RESULTS_PATH,
+    COEFFICIENT_OF_LOSS_MAX, COEFFICIENT_OF_LOSS_MIN, KEYSTROKE_PAUSE,
     PATH_TO_LOWER_TANK_RADIO_BUTTON, RAINFALL_SUBSTITUTION_PERCENT_MAX,
     RAINFALL_SUBSTITUTION_PERCENT_MIN)
+from globals.utils import get_export_path, saturate
 
 logger = logging.getLogger("triton")
-pyautogui.PAUSE = 0.08
-
-
-def saturate(value: float, lower_limit: float, upper_limit: float) -> float:
-    """
-    Saturates a given value between lower and upper limits, inclusive.
-
-    Args:
-        value (float): Value to be saturated.
-        lower_limit (float): Lower boundary.
-        upper_limit (float): Upper boundary.
-
-    Returns:
-        float: Value after saturation is applied.
-    """
-    return min(upper_limit, max(lower_limit, value))
+pyautogui.PAUSE = KEYSTROKE_PAUSE
 
 
 class Mover:
@@ -35,91 +24,161 @@ class Mover:
     and movements based on known UI elements.
     """
 
+    # Keys pressed by each movement, also replayed by the keystroke plans of `plans.py`
+    FROM_STARTUP_TO_FILE_SELECTION = ("down", "down", "up")
+    FROM_FILE_SELECTION_TO_DATE = ("down",) * 2
+    FROM_DATE_TO_INITIAL_RUN_OFF_FIELD = ("down",)
+    FROM_INITIAL_RUN_OFF_TO_CATCHMENT_AREA_FIELD = ("tab",)
+    FROM_CATCHMENT_AREA_TO_WATER_DEMAND_FIELD = ("tab",)
+    FROM_WATER_DEMAND_TO_RESIDENTS_FIELD = ("tab",) * 2
+    FROM_RESIDENTS_TO_RAINWATER_REPLACEMENT = ("tab",) * 2
+    FROM_RAINWATER_REPLACEMENT_TO_COEFFICIENT_OF_LOSS = ("tab",)
+    FROM_COEFFICIENT_OF_LOSS_TO_UPPER_TANK_BUTTON = ("tab",) * 2
+    FROM_LOWER_TANK_FIELD_TO_SIMULATE_BUTTON = ("tab",)
+    FROM_SIMULATE_TO_EXPORT_BUTTON = ("tab",)
+    FROM_DATE_TO_SIMULATE_BUTTON = ("tab",) * 15
+    FROM_EXPORT_TO_FILE_SELECTION = ("tab",) * 5 + ("up",) * 3
+
+    lower_tank_locator = TemplateLocator(PATH_TO_LOWER_TANK_RADIO_BUTTON)
+
     @staticmethod
     def from_startup_to_file_selection():
-        pyautogui.press(["down", "down", "up"])
+        pyautogui.press(Mover.FROM_STARTUP_TO_FILE_SELECTION)
 
     @staticmethod
     def from_file_selection_to_date():
-        pyautogui.press("down", 2)
+        pyautogui.press(Mover.FROM_FILE_SELECTION_TO_DATE)
 
     @staticmethod
     def from_date_to_initial_run_off_field():
-        pyautogui.press("down")
+        pyautogui.press(Mover.FROM_DATE_TO_INITIAL_RUN_OFF_FIELD)
 
     @staticmethod
     def from_initial_run_off_to_catchment_area_field():
-        pyautogui.press("tab")
+        pyautogui.press(Mover.FROM_INITIAL_RUN_OFF_TO_CATCHMENT_AREA_FIELD)
 
     @staticmethod
     def from_catchment_area_to_water_demand_field():
-        pyautogui.press("tab")
+        pyautogui.press(Mover.FROM_CATCHMENT_AREA_TO_WATER_DEMAND_FIELD)
 
     @staticmethod
     def from_water_demand_to_residents_field():
-        pyautogui.press("tab", 2)
+        pyautogui.press(Mover.FROM_WATER_DEMAND_TO_RESIDENTS_FIELD)
 
     @staticmethod
     def from_residents_to_rainwater_replacement():
-        pyautogui.press("tab", 2)
+        pyautogui.press(Mover.FROM_RESIDENTS_TO_RAINWATER_REPLACEMENT)
 
     @staticmethod
     def from_rainwater_replacement_to_coefficient_of_loss():
-        pyautogui.press("tab")
+        pyautogui.press(Mover.FROM_RAINWATER_REPLACEMENT_TO_COEFFICIENT_OF_LOSS)
 
     @staticmethod
     def from_coefficient_of_loss_to_upper_tank_button():
-        pyautogui.press("tab", 2)
+        pyautogui.press(Mover.FROM_COEFFICIENT_OF_LOSS_TO_UPPER_TANK_BUTTON)
 
     @staticmethod
     def to_lower_tank_radio_button():
-        pyautogui.moveTo(pyautogui.locateCenterOnScreen(
-            PATH_TO_LOWER_TANK_RADIO_BUTTON, grayscale=True, confidence=0.9))
+        pyautogui.moveTo(Mover.lower_tank_locator.locate())
 
     @staticmethod
     def from_lower_tank_field_to_simulate_button():
-        pyautogui.press("tab")
+        pyautogui.press(Mover.FROM_LOWER_TANK_FIELD_TO_SIMULATE_BUTTON)
 
     @staticmethod
     def from_simulate_to_export_button():
-        pyautogui.press("tab")
+        pyautogui.press(Mover.FROM_SIMULATE_TO_EXPORT_BUTTON)
 
     @staticmethod
     def from_date_to_simulate_button():
-        pyautogui.press("tab", 15)
+        pyautogui.press(Mover.FROM_DATE_TO_SIMULATE_BUTTON)
 
     @staticmethod
     def from_export_to_file_selection():
-        pyautogui.press("tab", 5)
-        pyautogui.press("up", 3)
+        pyautogui.press(Mover.FROM_EXPORT_TO_FILE_SELECTION)
 
 
 class NetunoAutomator:
     """
     Automates operations in the Netuno 4 application, using a combinations of movements from
     the `Mover` class and key presses.
+
+    The date currently set in the form is tracked, so it is only typed again when it
+    changes (or after the form is set up from scratch, by `run_first_simulation()`).
+
+    With a `ResponseProbe`, Windows Explorer is waited for instead of a fixed time, and how
+    long it takes to open and to close is recorded as the response time of the steps of
+    `AdaptiveTimer`, to be collected with `pop_responses()`.
     """
 
     wait: float
+    tracer: PhaseTracer
+    current_date: str | None
+    probe: ResponseProbe | None
+    responses: list[tuple[str, float]]
 
-    def __init__(self, extra_wait: float) -> None:
+    def __init__(
+            self,
+            extra_wait: float,
+            tracer: PhaseTracer | None = None,
+            probe: ResponseProbe | None = None) -> None:
         self.wait = extra_wait / 10
+        self.tracer = tracer or PhaseTracer()
+        self.current_date = None
+        self.probe = probe
+        self.responses = []
+
+    def set_delays(self, keystroke_pause: float, explorer_wait: float) -> None:
+        """
+        Sets the delays used while automating Netuno 4, such as the ones learned by
+        `AdaptiveTimer`.
+
+        Args:
+            keystroke_pause (float): Pause after every keystroke, in seconds.
+            explorer_wait (float): Wait before pasting a path into Windows Explorer, in
+                seconds.
+        """
+        pyautogui.PAUSE = keystroke_pause
+        self.wait = explorer_wait
+
+    def pop_responses(self) -> list[tuple[str, float]]:
+        """
+        Collects the response times measured since the last call, by step of
+        `AdaptiveTimer`.
+
+        Returns:
+            list[tuple[str, float]]: Step and response time, in seconds, of each response.
+        """
+        responses, self.responses = self.responses, []
+        return responses
 
     def _select_file_in_explorer(self, file_path: Path) -> None:
         """
         Selects a file in Windows Explorer, by copying and pasting the desired path, then
-        pressing 'Enter'.
+        pressing 'Enter'. With a probe, the times Explorer takes to open and to close are
+        recorded as the response times of the Explorer wait and the keystroke pause.
 
         Args:
             file_path (Path): Path to the file to be selected in Explorer.
+
+        Raises:
+            NetunoUnresponsiveError: If Explorer does not open or close in time.
         """
-        pyperclip.copy(file_path.resolve())
-        logger.debug(f"Selecting file at '{file_path.resolve()}'")
-        time.sleep(self.wait)
-        pyautogui.keyDown("ctrl")
-        pyautogui.press("v")
-        pyautogui.keyUp("ctrl")
-        pyautogui.press("enter")
+        with self.tracer.span("file_selection"):
+            pyperclip.copy(file_path.resolve())
+            logger.debug(f"Selecting file at '{file_path.resolve()}'")
+            if self.probe is None:
+                time.sleep(self.wait)
+            else:
+                self.responses.append(("explorer_wait", self.probe.wait_for_explorer()))
+            pyautogui.keyDown("ctrl")
+            pyautogui.press("v")
+            pyautogui.keyUp("ctrl")
+            if self.probe is None:
+                pyautogui.press("enter")
+                return
+            pyautogui.press("enter", _pause=False)
+            self.responses.append(("keystroke_pause", self.probe.wait_for_netuno()))
 
     def _type_float_value(self, value: float) -> None:
         """
@@ -131,7 +190,8 @@ class NetunoAutomator:
         pyautogui.write(str(value).replace(".", ","))
 
     def _type_date(self, date: str) -> None:
-        pyautogui.write(date)
+        with self.tracer.span("date_typing"):
+            pyautogui.write(date)
 
     def _type_initial_run_off(self, initial_run_off: float) -> None:
         self._type_float_value(initial_run_off)
@@ -182,10 +242,7 @@ class NetunoAutomator:
         Returns:
             Path: Path to the export file.
         """
-        export_path = Path(
-            NETUNO_RESULTS_PATH,
-            original_file_path.stem.split(".", 1)[0]
-            ).with_suffix(".out.csv")
+        export_path = get_export_path(original_file_path)
         self._select_file_in_explorer(export_path)
         return export_path
 
@@ -193,7 +250,11 @@ class NetunoAutomator:
         Mover.from_startup_to_file_selection()
         self._select_file_in_explorer(precipitation_path)
         Mover.from_file_selection_to_date()
+        if date == self.current_date:
+            logger.debug(f"Keeping date '{date}', which is already set")
+            return
         self._type_date(date)
+        self.current_date = date
 
     def _set_simulation_parameters(
             self,
@@ -239,9 +300,10 @@ class NetunoAutomator:
         self._type_lower_tank_capacity(lower_tank_capacity)
 
     def _simulate_and_start_export(self) -> None:
-        pyautogui.press("space")
-        Mover.from_simulate_to_export_button()
-        pyautogui.press("space")
+        with self.tracer.span("simulate_export"):
+            pyautogui.press("space")
+            Mover.from_simulate_to_export_button()
+            pyautogui.press("space")
 
     def run_first_simulation(
             self,
@@ -274,6 +336,7 @@ class NetunoAutomator:
         Returns:
             Path: Path to the export file containing the simulation results.
         """
+        self.current_date = None
         self._setup_precipitation_file(precipitation_path, date)
         self._set_simulation_parameters(
             initial_run_off_disposal,
@@ -0,0 +1,164 @@
+import hashlib
+import json
+import logging
+import sqlite3
+from collections.abc import Mapping
+from pathlib import Path
+
+from globals.types import Variable
+
+logger = logging.getLogger("triton")
+
+HASH_CHUNK_SIZE = 1 << 20
+
+
+class ResultCache:
+    """
+    Persistent cache of simulation results, kept in a SQLite database and addressed by the
+    contents of the precipitation file together with everything else that affects the
+    simulation (parameters and initial date), so renamed or copied files still hit it.
+
+    The cache is bound to a version tag (e.g. a fingerprint of the Netuno 4 executable):
+    opening it with a different tag discards every entry. Once it holds more than
+    `max_entries` results, the least recently used ones are evicted.
+    """
+
+    path: Path
+    version: str
+    max_entries: int
+    connection: sqlite3.Connection
+    hits: int
+    misses: int
+
+    def __init__(self, path: Path, version: str, max_entries: int) -> None:
+        """
+        Opens the cache at the given path, creating it if needed, and discards its entries
+        if they were stored by a different version.
+
+        Args:
+            path (Path): Path to the SQLite database of the cache.
+            version (str): Version tag of the entries, such as `netuno_version()`.
+            max_entries (int): Maximum number of results kept.
+        """
+        self.path = path
+        self.version = version
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, variables TEXT, last_used INTEGER)")
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT)")
+            row = self.connection.execute(
+                "SELECT value FROM metadata WHERE name = 'version'").fetchone()
+            if row and row[0] != version:
+                count = self.connection.execute("DELETE FROM entries").rowcount
+                logger.info(
+                    f"Discarded {count} cached result(s) from version '{row[0]}', since "
+                    f"the current version is '{version}'")
+            self.connection.execute(
+                "INSERT OR REPLACE INTO metadata VALUES ('version', ?)", (version,))
+
+    @staticmethod
+    def netuno_version(netuno_exe_path: Path) -> str:
+        """
+        Fingerprints the Netuno 4 executable, so results cached with a different build of
+        Netuno 4 are discarded.
+
+        Args:
+            netuno_exe_path (Path): Path to the Netuno 4 executable.
+
+        Returns:
+            str: Version tag, derived from the contents of the executable.
+        """
+        digest = hashlib.sha256()
+        with open(netuno_exe_path, "rb") as executable:
+            while chunk := executable.read(HASH_CHUNK_SIZE):
+                digest.update(chunk)
+        return f"netuno-{digest.hexdigest()[:16]}"
+
+    @staticmethod
+    def key_for(
+            precipitation_file: Path,
+            parameters: Mapping[str, float],
+            initial_date: str) -> str:
+        """
+        Computes the key of the results of a simulation.
+
+        Args:
+            precipitation_file (Path): Path to the precipitation file.
+            parameters (Mapping[str, float]): Simulation parameters.
+            initial_date (str): Initial date of the simulation.
+
+        Returns:
+            str: Hexadecimal SHA-256 digest of the file contents, parameters and date.
+        """
+        digest = hashlib.sha256()
+        with open(precipitation_file, "rb") as input_file:
+            while chunk := input_file.read(HASH_CHUNK_SIZE):
+                digest.update(chunk)
+        digest.update(b"\0" + json.dumps(dict(parameters), sort_keys=True).encode())
+        digest.update(b"\0" + initial_date.encode())
+        return digest.hexdigest()
+
+    def _next_use(self) -> int:
+        """Retrieves an increasing counter used to order entries by their last use."""
+        return self.connection.execute(
+            "SELECT COALESCE(MAX(last_used), 0) + 1 FROM entries").fetchone()[0]
+
+    def get(self, key: str) -> dict[str, Variable] | None:
+        """
+        Retrieves cached results, marking them as the most recently used.
+
+        Args:
+            key (str): Key of the results, from `key_for()`.
+
+        Returns:
+            dict[str, Variable] | None: Dictionary mapping metric names to their
+            corresponding Variables, or None if the results are not cached.
+        """
+        row = self.connection.execute(
+            "SELECT variables FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        with self.connection:
+            self.connection.execute(
+                "UPDATE entries SET last_used = ? WHERE key = ?", (self._next_use(), key))
+        return {
+            metric: Variable(label=label, unit=unit, value=value)
+            for metric, (label, unit, value) in json.loads(row[0]).items()
+        }
+
+    def put(self, key: str, results: dict[str, Variable]) -> None:
+        """
+        Stores results in the cache, evicting the least recently used ones if it is full.
+
+        Args:
+            key (str): Key of the results, from `key_for()`.
+            results (dict[str, Variable]): Dictionary mapping metric names to their
+                corresponding Variables.
+        """
+        variables = json.dumps({
+            metric: (variable.label, variable.unit, variable.value)
+            for metric, variable in results.items()
+        })
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?)",
+                (key, variables, self._next_use()))
+            evicted = self.connection.execute(
+                "DELETE FROM entries WHERE key IN (SELECT key FROM entries "
+                "ORDER BY last_used DESC LIMIT -1 OFFSET ?)", (self.max_entries,)).rowcount
+        if evicted:
+            logger.debug(f"Evicted {evicted} cached result(s)")
+
+    def close(self) -> None:
+        """Closes the connection to the database."""
+        self.connection.close()
@@ -1,28 +1,147 @@
 import logging
+import os
+import queue
+import tarfile
+import threading
+from collections import deque
+from collections.abc import Collection, Iterable
 from pathlib import Path
 
 from globals.constants import NETUNO_RESULTS_PATH
 
 logger = logging.getLogger("triton")
 
+_STOP = None
+
 
 class Declutter:
+    """
+    Deletes the results files exported by Netuno 4, so their directory (which is listed by
+    Windows Explorer on every file selection) does not grow with every simulation.
+
+    Once started, files are only deleted after being released, i.e. after their results are
+    durably saved, in batches, by a background thread. The last `keep` files released are
+    kept for debugging, and every file released can be added to a compressed tarball before
+    being deleted, instead of being lost.
+    """
 
     results_path: Path
+    keep: int
+    archive_path: Path | None
+    recent: deque[str]
+    archive: tarfile.TarFile | None
+    batches: queue.Queue
+    worker: threading.Thread | None
 
-    def __init__(self, results_path: Path) -> None:
+    def __init__(
+            self,
+            results_path: Path,
+            keep: int = 0,
+            archive_path: Path | None = None) -> None:
+        """
+        Initializes the declutter, which only deletes files released after `start()`.
+
+        Args:
+            results_path (Path): Directory where Netuno 4 exports the results files.
+            keep (int, optional): Number of files most recently released that are kept.
+                Defaults to 0.
+            archive_path (Path | None, optional): Path to the tarball (compressed with
+                gzip) to which released files are added, which is overwritten. Defaults to
+                None, in which case files are not archived.
+        """
         self.results_path = results_path
+        self.keep = keep
+        self.archive_path = archive_path
+        self.recent = deque()
+        self.archive = None
+        self.batches = queue.Queue()
+        self.worker = None
+
+    def clear_results_files(self, names: Collection[str] | None = None) -> bool:
+        """
+        Deletes results files right away, in the calling thread.
 
-    def clear_results_files(self) -> bool:
-        results_files = list(self.results_path.iterdir())
-        if not results_files:
+        Args:
+            names (Collection[str] | None, optional): Names of the files to be deleted.
+                Defaults to None, in which case every file is deleted.
+
+        Returns:
+            bool: Whether any file was deleted.
+        """
+        counter = 0
+        with os.scandir(self.results_path) as entries:
+            for entry in entries:
+                if entry.is_file() and (names is None or entry.name in names):
+                    os.unlink(entry.path)
+                    counter += 1
+        if not counter:
             return False
-        for counter, file in enumerate(results_files, start=1):
-            file.unlink()
         logger.debug(
             f"Deleted {counter} results file(s) at '{self.results_path.resolve()}'")
         return True
 
+    def start(self) -> None:
+        """Opens the archive, if any, and starts deleting released files in background."""
+        if self.archive_path:
+            self.archive = tarfile.open(self.archive_path, "w:gz")
+        self.worker = threading.Thread(target=self._work, daemon=True)
+        self.worker.start()
+
+    def release(self, names: Iterable[str]) -> None:
+        """
+        Releases a batch of results files, whose results were durably saved, so they can be
+        archived and deleted.
+
+        Args:
+            names (Iterable[str]): Names of the files.
+        """
+        if batch := list(names):
+            self.batches.put(batch)
+
+    def _work(self) -> None:
+        """Processes the batches of released files, in order, until told to stop."""
+        while (batch := self.batches.get()) is not _STOP:
+            try:
+                self._process(batch)
+            except OSError as exception:
+                logger.warning(f"Unable to clear results files. Details: {exception}")
+
+    def _process(self, batch: list[str]) -> None:
+        """
+        Archives a batch of released files, if enabled, then deletes the files released
+        before the last `keep` ones, listing the directory once.
+
+        Args:
+            batch (list[str]): Names of the files released.
+        """
+        self.recent.extend(batch)
+        expired = set()
+        while len(self.recent) > self.keep:
+            expired.add(self.recent.popleft())
+        released = set(batch)
+        counter = 0
+        with os.scandir(self.results_path) as entries:
+            for entry in entries:
+                if self.archive and entry.name in released:
+                    self.archive.add(entry.path, arcname=entry.name)
+                if entry.name in expired:
+                    os.unlink(entry.path)
+                    counter += 1
+        logger.debug(
+            f"Deleted {counter} results file(s) at '{self.results_path.resolve()}', "
+            f"keeping {len(self.recent)}")
+
+    def stop(self) -> None:
+        """Waits for the released files to be processed, then closes the archive, if any."""
+        if self.worker:
+            self.batches.put(_STOP)
+            self.worker.join()
+            self.worker = None
+        if self.archive:
+            self.archive.close()
+            self.archive = None
+            logger.info(f"Archived results files at '{self.archive_path.resolve()}'")
+
     @staticmethod
     def remove_results_dir() -> None:
         try:
@@ -0,0 +1,135 @@
+import logging
+import os
+import re
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from agents.parsers import FileNameParser
+
+logger = logging.getLogger("triton")
+
+
+class InputDiscovery:
+    """
+    Finds the precipitation (CSV) files to be simulated, lazily, in one or more root
+    directories and, optionally, in all of their subdirectories, so processing can start
+    as soon as the first file is found, no matter how large the trees are.
+
+    Files can be filtered by glob patterns matched against the end of their paths (e.g.
+    '*.csv' or 'SSP245/*.csv'), and by regular expressions searched in the city, model and
+    scenario parsed from their names.
+    """
+
+    roots: list[Path]
+    recursive: bool
+    include: list[str]
+    exclude: list[str]
+    metadata_patterns: dict[str, re.Pattern]
+
+    def __init__(
+            self,
+            roots: Iterable[Path],
+            recursive: bool = False,
+            include: Iterable[str] = (),
+            exclude: Iterable[str] = (),
+            city: re.Pattern | None = None,
+            model: re.Pattern | None = None,
+            scenario: re.Pattern | None = None) -> None:
+        """
+        Initializes the discovery.
+
+        Args:
+            roots (Iterable[Path]): Directories where files are searched, in order.
+            recursive (bool, optional): Whether subdirectories are searched as well.
+                Defaults to False.
+            include (Iterable[str], optional): Glob patterns of which files must match at
+                least one, if any. Defaults to no patterns.
+            exclude (Iterable[str], optional): Glob patterns of which files must match
+                none. Defaults to no patterns.
+            city (re.Pattern | None, optional): Pattern searched in the city of each file.
+                Defaults to None (any city).
+            model (re.Pattern | None, optional): Pattern searched in the model of each file.
+                Defaults to None (any model).
+            scenario (re.Pattern | None, optional): Pattern searched in the scenario of each
+                file. Defaults to None (any scenario).
+        """
+        self.roots = list(roots)
+        self.recursive = recursive
+        self.include = list(include)
+        self.exclude = list(exclude)
+        self.metadata_patterns = {
+            field: pattern
+            for field, pattern in (("city", city), ("model", model), ("scenario", scenario))
+            if pattern is not None
+        }
+
+    def _walk(self, root: Path) -> Iterator[Path]:
+        """
+        Lists, lazily, the files of a directory and, if recursive, of its subdirectories,
+        depth-first. Symbolic links to directories are not followed.
+
+        Args:
+            root (Path): Directory to be listed.
+
+        Yields:
+            Iterator[Path]: Files found, in the order the file system lists them.
+        """
+        directories = [root]
+        while directories:
+            subdirectories = []
+            try:
+                with os.scandir(directories.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            yield Path(entry.path)
+                        elif self.recursive and entry.is_dir(follow_symlinks=False):
+                            subdirectories.append(Path(entry.path))
+            except OSError as exception:
+                logger.warning(f"Unable to list a directory. Details: {exception}")
+            directories.extend(reversed(subdirectories))
+
+    def _matches(self, file: Path) -> bool:
+        """
+        Checks whether a file is a CSV file that passes every filter.
+
+        Args:
+            file (Path): Path to the file.
+
+        Returns:
+            bool: Whether the file should be simulated.
+        """
+        if ".csv" != file.suffix.casefold():
+            return False
+        if self.include and not any(file.match(pattern) for pattern in self.include):
+            return False
+        if any(file.match(pattern) for pattern in self.exclude):
+            return False
+        if not self.metadata_patterns:
+            return True
+        try:
+            metadata = dict(zip(
+                ("city", "model", "scenario"), FileNameParser.get_metadata(file)))
+        except ValueError:
+            logger.warning(f"Skipping file '{file.name}', whose name could not be parsed")
+            return False
+        return all(
+            pattern.search(metadata[field])
+            for field, pattern in self.metadata_patterns.items())
+
+    def __iter__(self) -> Iterator[Path]:
+        """
+        Finds the files to be simulated, lazily, root by root. Files reachable from more
+        than one root are only yielded once.
+
+        Yields:
+            Iterator[Path]: Paths to the files.
+        """
+        seen = set()
+        for root in self.roots:
+            for file in self._walk(root):
+                if not self._matches(file):
+                    continue
+                if (resolved := str(file.resolve())) in seen:
+                    continue
+                seen.add(resolved)
+                yield file
@@ -0,0 +1,113 @@
+import logging
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from typing import Any
+
+logger = logging.getLogger("triton")
+
+
+class ParallelDispatcher:
+    """
+    Distributes tasks over a pool of processes, yielding their results in the same order
+    as the tasks were given. Failed tasks are reported and skipped, without interrupting the
+    remaining ones.
+    """
+
+    workers: int
+
+    def __init__(self, workers: int) -> None:
+        """
+        Initializes the dispatcher.
+
+        Args:
+            workers (int): Number of worker processes.
+        """
+        self.workers = workers
+
+    @staticmethod
+    def _submit(executor: ProcessPoolExecutor, function: Callable[[Any], Any], task: Any
+                ) -> Future:
+        """
+        Submits a task to the pool. If the pool is already broken, the returned future
+        holds the error, so it is handled when its result is awaited, like any other.
+
+        Args:
+            executor (ProcessPoolExecutor): Pool of processes.
+            function (Callable[[Any], Any]): Picklable function to be applied to the task.
+            task (Any): Picklable task.
+
+        Returns:
+            Future: Future result of the task.
+        """
+        try:
+            return executor.submit(function, task)
+        except BrokenProcessPool as exception:
+            future = Future()
+            future.set_exception(exception)
+            return future
+
+    def imap(
+            self,
+            function: Callable[[Any], Any],
+            tasks: Iterable[Any]) -> Iterator[tuple[Any, Any | None]]:
+        """
+        Applies a function to every task in a pool of processes, submitting tasks lazily,
+        up to twice the number of workers ahead of the results being consumed.
+
+        When a worker process dies (which breaks the whole pool), a new pool is created and
+        the pending tasks are run again, starting with the one whose result was awaited,
+        alone. If it breaks the pool again, it is skipped.
+
+        Args:
+            function (Callable[[Any], Any]): Picklable function to be applied to each task.
+            tasks (Iterable[Any]): Picklable tasks.
+
+        Yields:
+            Iterator[tuple[Any, Any | None]]: Each task with its result, in the same order
+            as the tasks, or with None if it failed.
+        """
+        tasks = iter(tasks)
+        pending: deque[list[Any | Future | None]] = deque()
+        isolated = False
+        executor = ProcessPoolExecutor(self.workers)
+        try:
+            while True:
+                window = 1 if isolated else 2 * self.workers
+                new_tasks = islice(tasks, max(0, window - len(pending)))
+                pending.extend([task, None] for task in new_tasks)
+                if not pending:
+                    return
+                for entry in list(pending)[:window]:
+                    if entry[1] is None:
+                        entry[1] = self._submit(executor, function, entry[0])
+
+                task, future = pending.popleft()
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    executor = ProcessPoolExecutor(self.workers)
+                    if isolated:
+                        logger.error(
+                            f"Task '{task}' broke the process pool again and was skipped")
+                        isolated = False
+                        yield task, None
+                        continue
+                    logger.warning(
+                        f"Process pool broke while running task '{task}', restarting it")
+                    for entry in pending:
+                        entry[1] = None
+                    pending.appendleft([task, None])
+                    isolated = True
+                    continue
+                except Exception as exception:
+                    logger.error(
+                        f"Task '{task}' failed and was skipped. Details: {exception}")
+                    result = None
+                isolated = False
+                yield task, result
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -1,23 +1,131 @@
+import csv
+import io
+import json
 import logging
+import os
+import time
+from collections.abc import Iterable
 from datetime import datetime
 from pathlib import Path
+from typing import TextIO
 
-import pandas as pd
-
-from globals.constants import OUTPUT_COLUMNS
-from globals.types import ResultTuple
+from agents.manifest import RunManifest
+from globals.constants import OUTPUT_COLUMNS, SIMULATION_RESULT_UNITS
+from globals.types import ResultTuple, WideResultTuple
 
 logger = logging.getLogger("triton")
 
 
 class CSVExporter:
+    """
+    Writes results to a CSV file through a single handle, kept open during the whole run,
+    with the standard `csv` module. Results are kept in memory until they are saved, either
+    explicitly or once `flush_rows` rows or `flush_interval` seconds have accumulated, and
+    each save writes whole rows only, flushed and synced to disk.
+
+    In the 'wide' layout, the results of each simulation are written as a single row, with
+    one column per metric, instead of one row per metric. Labels and units of the metrics
+    are then written once, to a JSON sidecar file next to the output file.
+    """
 
     output_path: Path
-    content: list[ResultTuple]
+    columns: tuple[str, ...]
+    layout: str
+    metadata: dict[str, dict[str, str]]
+    metadata_saved: bool
+    content: list[ResultTuple | WideResultTuple]
+    sources: list[Path]
+    manifest: RunManifest | None
+    flush_rows: int | None
+    flush_interval: float | None
+    last_save_time: float
+    output_file: TextIO | None
+
+    def __init__(
+            self,
+            parent_output_dir: Path,
+            columns: tuple[str, ...] = OUTPUT_COLUMNS,
+            flush_rows: int | None = None,
+            flush_interval: float | None = None,
+            layout: str = "long"):
+        """
+        Initializes the exporter, with a new timestamped output file.
 
-    def __init__(self, parent_output_dir: Path):
+        Args:
+            parent_output_dir (Path): Directory of the output file.
+            columns (tuple[str, ...], optional): Columns of the results, as given to
+                `add_results()`. Defaults to `globals.constants.OUTPUT_COLUMNS`.
+            flush_rows (int | None, optional): Number of rows after which results are
+                saved automatically. Defaults to None (disabled).
+            flush_interval (float | None, optional): Time, in seconds, after which results
+                are saved automatically. Defaults to None (disabled).
+            layout (str, optional): Layout of the output file, either 'long' (one row per
+                metric) or 'wide' (one row per simulation). Defaults to 'long'.
+        """
         self.output_path = Path(parent_output_dir, self._get_base_file_name())
+        self.layout = layout
+        self.columns = self._wide_columns(columns) if layout == "wide" else columns
+        self.metadata = {}
+        self.metadata_saved = False
         self.content = []
+        self.sources = []
+        self.manifest = None
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.last_save_time = time.monotonic()
+        self.output_file = None
+
+    @classmethod
+    def resume(
+            cls,
+            output_path: Path,
+            columns: tuple[str, ...] = OUTPUT_COLUMNS,
+            flush_rows: int | None = None,
+            flush_interval: float | None = None,
+            layout: str = "long") -> "CSVExporter":
+        """
+        Creates an exporter that appends to an existing output file.
+
+        Args:
+            output_path (Path): Path to the existing output file.
+            columns (tuple[str, ...], optional): Columns of the results, as given to
+                `add_results()`. Defaults to `globals.constants.OUTPUT_COLUMNS`.
+            flush_rows (int | None, optional): Number of rows after which results are
+                saved automatically. Defaults to None (disabled).
+            flush_interval (float | None, optional): Time, in seconds, after which results
+                are saved automatically. Defaults to None (disabled).
+            layout (str, optional): Layout of the output file, either 'long' or 'wide'.
+                Defaults to 'long'.
+
+        Returns:
+            CSVExporter: New exporter for the given file.
+        """
+        exporter = cls(output_path.parent, columns, flush_rows, flush_interval, layout)
+        exporter.output_path = output_path
+        return exporter
+
+    @staticmethod
+    def _wide_columns(columns: tuple[str, ...]) -> tuple[str, ...]:
+        """
+        Converts the columns of the results into the columns of the 'wide' layout.
+
+        Args:
+            columns (tuple[str, ...]): Columns of the results, i.e. `OUTPUT_COLUMNS`
+                followed by any swept parameters.
+
+        Returns:
+            tuple[str, ...]: City, model and scenario, followed by any swept parameters and
+            one column per metric.
+        """
+        return (
+            OUTPUT_COLUMNS[:3]
+            + columns[len(OUTPUT_COLUMNS):]
+            + tuple(SIMULATION_RESULT_UNITS))
+
+    @property
+    def metadata_path(self) -> Path:
+        """Path to the JSON file with labels and units of metrics, in the 'wide' layout."""
+        return self.output_path.with_suffix(".metadata.json")
 
     def _get_base_file_name(self) -> str:
         """
@@ -28,24 +136,185 @@ class CSVExporter:
         """
         return f"{datetime.now().strftime('%Y-%m-%dT%H-%M')}-consolidated.csv"
 
-    def add_results(self, result: list[ResultTuple]) -> None:
+    def use_manifest(self, manifest: RunManifest) -> None:
+        """
+        Records the input files of every batch saved from now on in the given manifest. If
+        the output file has rows written after the last update of the manifest, they are
+        discarded, since their input files will be processed again. Output files without a
+        record in the manifest are kept as they are.
+
+        Args:
+            manifest (RunManifest): Manifest corresponding to the output file.
+        """
+        self.manifest = manifest
+        recorded_size = manifest.output_size
+        if recorded_size is None or not self.output_path.is_file():
+            return
+        if self.output_path.stat().st_size > recorded_size:
+            logger.warning(
+                f"Discarding results written to '{self.output_path.name}' after the last "
+                f"update of its manifest")
+            os.truncate(self.output_path, recorded_size)
+
+    def add_results(self, result: list[ResultTuple], sources: Iterable[Path] = ()) -> None:
         """
         Includes the provided results in the next batch that will be saved.
 
         Args:
             result (list[ResultTuple]): List of results to be included.
+            sources (Iterable[Path], optional): Input files from which the results were
+                obtained, to be recorded in the manifest (if any) once saved. Defaults to
+                no files.
         """
+        if self.layout == "wide":
+            result = self._to_wide(result)
         self.content.extend(result)
+        self.sources.extend(sources)
+        if self._is_flush_due():
+            self.save_results()
+
+    def _to_wide(self, result: list[ResultTuple]) -> list[WideResultTuple]:
+        """
+        Converts results into the 'wide' layout, merging the consecutive rows of each
+        simulation into a single row and recording the label and unit of every metric. A
+        simulation ends where the identifier (city, model, scenario and parameters) changes
+        or a metric repeats, so consecutive simulations of files with the same identifier
+        are kept apart.
+
+        Args:
+            result (list[ResultTuple]): List of results, with one row per metric.
+
+        Returns:
+            list[WideResultTuple]: List of results, with one row per simulation.
+        """
+        rows = []
+        identifier, values = None, {}
+        for city, model, scenario, metric, label, value, unit, *parameters in result:
+            row_identifier = (city, model, scenario, *parameters)
+            if row_identifier != identifier or metric in values:
+                if identifier is not None:
+                    rows.append(self._to_wide_row(identifier, values))
+                identifier, values = row_identifier, {}
+            values[metric] = value
+            if metric not in self.metadata:
+                self.metadata[metric] = {"label": label, "unit": unit}
+                self.metadata_saved = False
+        if identifier is not None:
+            rows.append(self._to_wide_row(identifier, values))
+        return rows
+
+    @staticmethod
+    def _to_wide_row(identifier: tuple, values: dict[str, float]) -> WideResultTuple:
+        """
+        Builds a row of the 'wide' layout from the metrics of a single simulation.
+
+        Args:
+            identifier (tuple): City, model, scenario and parameters of the simulation.
+            values (dict[str, float]): Value of each metric of the simulation.
+
+        Returns:
+            WideResultTuple: Row with the identifier followed by the value of every metric,
+            or None for metrics missing from the simulation.
+        """
+        return identifier + tuple(values.get(metric) for metric in SIMULATION_RESULT_UNITS)
+
+    def _save_metadata(self) -> None:
+        """Writes the labels and units of the metrics to the JSON sidecar file."""
+        with open(self.metadata_path, "w", encoding="utf-8") as metadata_file:
+            json.dump(self.metadata, metadata_file, ensure_ascii=False, indent=4)
+        self.metadata_saved = True
+
+    def _is_flush_due(self) -> bool:
+        """
+        Checks whether enough rows or time accumulated since the last save.
+
+        Returns:
+            bool: Whether the current batch should be saved.
+        """
+        if self.flush_rows and len(self.content) >= self.flush_rows:
+            return True
+        return bool(
+            self.flush_interval and self.content
+            and time.monotonic() - self.last_save_time >= self.flush_interval)
+
+    def _trim_partial_row(self) -> None:
+        """
+        Discards the end of the output file after its last line break, which can only be
+        a row partially written by a run that crashed.
+        """
+        with open(self.output_path, "rb+") as output_file:
+            size = output_file.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            output_file.seek(-1, os.SEEK_END)
+            if output_file.read(1) == b"\n":
+                return
+            position = size
+            while position > 0:
+                chunk_start = max(0, position - io.DEFAULT_BUFFER_SIZE)
+                output_file.seek(chunk_start)
+                line_break = output_file.read(position - chunk_start).rfind(b"\n")
+                if line_break >= 0:
+                    position = chunk_start + line_break + 1
+                    break
+                position = chunk_start
+            logger.warning(
+                f"Discarding a partially written row at the end of "
+                f"'{self.output_path.name}'")
+            output_file.truncate(position)
+
+    def _open(self) -> TextIO:
+        """
+        Opens the output file for appending, writing the header if it is empty.
+
+        Returns:
+            TextIO: Handle of the output file.
+        """
+        if self.output_path.is_file():
+            self._trim_partial_row()
+        output_file = open(self.output_path, "a", newline="", encoding="utf-8")
+        if os.fstat(output_file.fileno()).st_size == 0:
+            output_file.write(",".join(self.columns) + "\n")
+        return output_file
+
+    def _write_rows(self) -> int:
+        """
+        Writes the current batch of results to the output file, opening it if needed.
+
+        Returns:
+            int: Size of the output file after the write, in bytes.
+        """
+        if self.output_file is None:
+            self.output_file = self._open()
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(self.content)
+        self.output_file.write(buffer.getvalue())
+        self.output_file.flush()
+        os.fsync(self.output_file.fileno())
+        return os.fstat(self.output_file.fileno()).st_size
 
     def save_results(self) -> None:
         """
-        Saves the current batch of results (if any) to the output file,
-        then resets the batch.
+        Saves the current batch of results (if any) to the output file, as whole rows in a
+        single write, flushing it to disk, then records the input files in the manifest (if
+        any) and resets the batch.
         """
         if not self.content:
             logger.warning("No new results to save")
             return
-        include_header = not self.output_path.is_file()
-        pd.DataFrame(self.content, columns=OUTPUT_COLUMNS).to_csv(
-            self.output_path, sep=",", index=False, header=include_header, mode="a")
+        if self.layout == "wide" and not self.metadata_saved:
+            self._save_metadata()
+        output_size = self._write_rows()
+        if self.manifest:
+            self.manifest.mark_completed(self.sources, output_size)
         self.content = []
+        self.sources = []
+        self.last_save_time = time.monotonic()
+
+    def close(self) -> None:
+        """Closes the output file and the manifest, if open, without saving results."""
+        if self.output_file:
+            self.output_file.close()
+            self.output_file = None
+        if self.manifest:
+            self.manifest.close()
@@ -0,0 +1,171 @@
+import hashlib
+import logging
+import sqlite3
+import warnings
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+
+from agents.dispatcher import ParallelDispatcher
+from agents.parsers import FileNameParser, PrecipitationParser
+from globals.constants import INITIAL_DATES
+from globals.types import IndexEntry
+
+logger = logging.getLogger("triton")
+
+
+def inspect_file(precipitation_file: Path) -> IndexEntry:
+    """
+    Validates a precipitation file and gathers what the index keeps about it. The file is
+    read once, to be both hashed and parsed. Its values are parsed at once, with NumPy, so
+    non-numeric rows fail the whole read, and negative or non-finite values are checked
+    over the whole array.
+
+    Args:
+        precipitation_file (Path): Path to the precipitation file.
+
+    Returns:
+        IndexEntry: Entry of the file, whose `error` describes why it is invalid, if so.
+    """
+    stat = precipitation_file.stat()
+    content = precipitation_file.read_bytes()
+    digest = hashlib.sha256(content).hexdigest()
+    entry = IndexEntry(
+        path=precipitation_file, size=stat.st_size, mtime_ns=stat.st_mtime_ns,
+        digest=digest, city="", model="", scenario="", rows=0)
+    try:
+        entry.city, entry.model, entry.scenario = FileNameParser.get_metadata(
+            precipitation_file)
+    except ValueError:
+        entry.error = "name is not in the format 'city_model_scenario.csv'"
+        return entry
+    if entry.scenario not in INITIAL_DATES:
+        entry.error = f"unknown scenario '{entry.scenario}'"
+        return entry
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            values = PrecipitationParser(precipitation_file).to_array(content)
+    except ValueError as exception:
+        entry.error = f"non-numeric row ({exception})"
+        return entry
+    entry.rows = len(values)
+    if entry.rows == 0:
+        entry.error = "no precipitation values"
+    elif (invalid := np.flatnonzero(~np.isfinite(values) | (values < 0))).size:
+        entry.error = (
+            f"{invalid.size} negative or non-finite value(s), the first one at row "
+            f"{invalid[0] + 1}")
+    return entry
+
+
+class InputIndex:
+    """
+    Index of the precipitation files of a directory, kept in a SQLite database, with the
+    size, modification time, hash, city, model, scenario and number of rows of each file.
+
+    Building it validates every file upfront (see `inspect_file()`), in parallel, so
+    problems are found before any simulation starts. Files whose size and modification time
+    did not change since they were indexed are not read again. Since the expected length of
+    each scenario depends on the dataset, files whose number of rows differs from most
+    files of the same scenario are also considered invalid.
+    """
+
+    path: Path
+    connection: sqlite3.Connection
+
+    def __init__(self, path: Path) -> None:
+        """
+        Opens the index at the given path, creating it if needed.
+
+        Args:
+            path (Path): Path to the SQLite database of the index.
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, digest TEXT, "
+                "city TEXT, model TEXT, scenario TEXT, rows INTEGER, error TEXT)")
+
+    def _load(self) -> dict[str, IndexEntry]:
+        """
+        Retrieves every entry of the index.
+
+        Returns:
+            dict[str, IndexEntry]: Entries, by resolved path of their files.
+        """
+        return {
+            path: IndexEntry(Path(path), *fields)
+            for path, *fields in self.connection.execute("SELECT * FROM files")
+        }
+
+    @staticmethod
+    def _check_row_counts(entries: Iterable[IndexEntry]) -> None:
+        """
+        Marks as invalid the files whose number of rows differs from the most common one
+        among the valid files of the same scenario.
+
+        Args:
+            entries (Iterable[IndexEntry]): Entries of the indexed files.
+        """
+        by_scenario = defaultdict(list)
+        for entry in entries:
+            if entry.error is None:
+                by_scenario[entry.scenario].append(entry)
+        for scenario, scenario_entries in by_scenario.items():
+            expected_rows = Counter(entry.rows for entry in scenario_entries).most_common(1)
+            for entry in scenario_entries:
+                if entry.rows != expected_rows[0][0]:
+                    entry.error = (
+                        f"{entry.rows} rows, while most files of scenario '{scenario}' "
+                        f"have {expected_rows[0][0]}")
+
+    def build(self, files: Iterable[Path], workers: int) -> list[IndexEntry]:
+        """
+        Indexes the given precipitation files, validating the ones that are new or changed
+        in a pool of processes, and drops the files no longer given from the index. Row
+        counts are compared across the given files every time, so their result is not
+        stored.
+
+        Args:
+            files (Iterable[Path]): Precipitation files.
+            workers (int): Number of worker processes.
+
+        Returns:
+            list[IndexEntry]: Entries of the files, in the same order as given.
+        """
+        indexed = self._load()
+        entries: dict[str, IndexEntry | None] = {}
+        for file in files:
+            path = str(file.resolve())
+            stat = file.stat()
+            entry = indexed.get(path)
+            if entry and (entry.size, entry.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                entry.path = file
+                entries[path] = entry
+            else:
+                entries[path] = None
+        changed = [Path(path) for path, entry in entries.items() if entry is None]
+        if changed:
+            logger.info(f"Indexing {len(changed)} new or changed precipitation file(s)")
+            for file, entry in ParallelDispatcher(workers).imap(inspect_file, changed):
+                entries[str(file)] = entry or IndexEntry(
+                    file, 0, 0, "", "", "", "", 0, "could not be read")
+
+        with self.connection:
+            self.connection.execute("DELETE FROM files")
+            self.connection.executemany(
+                "INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(path, entry.size, entry.mtime_ns, entry.digest, entry.city, entry.model,
+                  entry.scenario, entry.rows, entry.error)
+                 for path, entry in entries.items()])
+        self._check_row_counts(entries.values())
+        return list(entries.values())
+
+    def close(self) -> None:
+        """Closes the connection to the database."""
+        self.connection.close()
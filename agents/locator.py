@@ -0,0 +1,163 @@
+import logging
+from pathlib import Path
+
+import numpy as np
+import pyautogui
+from PIL import Image
+
+from globals.constants import LOCATOR_CONFIDENCE, LOCATOR_SEARCH_MARGIN, NETUNO_WINDOW_TITLE
+
+logger = logging.getLogger("triton")
+
+
+class TemplateLocator:
+    """
+    Finds a UI element on the screen by matching a template image (with OpenCV, through
+    `PyAutoGUI`), remembering where it was last found, relative to the Netuno 4 window.
+
+    The template is decoded once, to grayscale, on the first search. Later searches first
+    match it only in a small region around the position where it was last found (moved
+    along with the window, if the window moved without being resized), and only fall back to
+    searching the whole screen when it is not found there. Hits and misses of the region
+    search are counted.
+    """
+
+    template_path: Path
+    confidence: float
+    margin: int
+    window_title: str
+    template: np.ndarray | None
+    last_hit: tuple[int, int] | None
+    window_geometry: tuple[int, int, int, int] | None
+    hits: int
+    misses: int
+
+    def __init__(
+            self,
+            template_path: Path,
+            confidence: float = LOCATOR_CONFIDENCE,
+            margin: int = LOCATOR_SEARCH_MARGIN,
+            window_title: str = NETUNO_WINDOW_TITLE) -> None:
+        """
+        Initializes the locator, without loading the template yet.
+
+        Args:
+            template_path (Path): Path to the template image.
+            confidence (float, optional): Minimum confidence of a match. Defaults to
+                `globals.constants.LOCATOR_CONFIDENCE`.
+            margin (int, optional): Margin, in pixels, around the template in the region
+                search. Defaults to `globals.constants.LOCATOR_SEARCH_MARGIN`.
+            window_title (str, optional): Text contained in the title of the window the
+                element belongs to. Defaults to `globals.constants.NETUNO_WINDOW_TITLE`.
+        """
+        self.template_path = template_path
+        self.confidence = confidence
+        self.margin = margin
+        self.window_title = window_title
+        self.template = None
+        self.last_hit = None
+        self.window_geometry = None
+        self.hits = 0
+        self.misses = 0
+
+    def _get_template(self) -> np.ndarray:
+        """
+        Retrieves the template, decoding it to a grayscale array the first time.
+
+        Returns:
+            np.ndarray: Template, as expected by OpenCV.
+        """
+        if self.template is None:
+            with Image.open(self.template_path) as image:
+                self.template = np.array(image.convert("L"))
+        return self.template
+
+    def _get_window_geometry(self) -> tuple[int, int, int, int] | None:
+        """
+        Retrieves the geometry of the first visible window with the given title, which is
+        only available on Windows.
+
+        Returns:
+            tuple[int, int, int, int] | None: Left, top, width and height of the window, or
+            None if it could not be found.
+        """
+        try:
+            windows = pyautogui.getWindowsWithTitle(self.window_title)
+        except (AttributeError, NotImplementedError, pyautogui.PyAutoGUIException):
+            return None
+        for window in windows:
+            if window.visible:
+                return window.left, window.top, window.width, window.height
+        return None
+
+    def _expected_position(
+            self, geometry: tuple[int, int, int, int] | None) -> tuple[int, int] | None:
+        """
+        Computes where the element is expected to be, from where it was last found.
+
+        Args:
+            geometry (tuple[int, int, int, int] | None): Current geometry of the window.
+
+        Returns:
+            tuple[int, int] | None: Expected center of the element on the screen, or None
+            if it was never found or the window was resized since then.
+        """
+        if self.last_hit is None:
+            return None
+        if geometry is None or self.window_geometry is None:
+            return self.last_hit if geometry == self.window_geometry else None
+        if geometry[2:] != self.window_geometry[2:]:
+            return None
+        return (
+            self.last_hit[0] + geometry[0] - self.window_geometry[0],
+            self.last_hit[1] + geometry[1] - self.window_geometry[1])
+
+    def _search_region(self, position: tuple[int, int]) -> tuple[int, int] | None:
+        """
+        Matches the template in a small region of the screen around a position.
+
+        Args:
+            position (tuple[int, int]): Expected center of the element.
+
+        Returns:
+            tuple[int, int] | None: Center of the element, or None if it is not there.
+        """
+        height, width = self._get_template().shape
+        left = max(position[0] - width // 2 - self.margin, 0)
+        top = max(position[1] - height // 2 - self.margin, 0)
+        region = (left, top, width + 2 * self.margin, height + 2 * self.margin)
+        try:
+            box = pyautogui.locate(
+                self._get_template(), pyautogui.screenshot(region=region),
+                grayscale=True, confidence=self.confidence)
+        except pyautogui.ImageNotFoundException:
+            return None
+        if box is None:
+            return None
+        center = pyautogui.center(box)
+        return left + center[0], top + center[1]
+
+    def locate(self) -> tuple[int, int] | None:
+        """
+        Finds the center of the element on the screen, around where it was last found
+        first, then on the whole screen.
+
+        Returns:
+            tuple[int, int] | None: Center of the element, or None if it was not found.
+        """
+        geometry = self._get_window_geometry()
+        expected = self._expected_position(geometry)
+        position = self._search_region(expected) if expected else None
+        if position is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            position = pyautogui.locateCenterOnScreen(
+                self._get_template(), grayscale=True, confidence=self.confidence)
+        logger.debug(
+            f"Located '{Path(self.template_path).name}' at {position} "
+            f"(region hits: {self.hits}, misses: {self.misses})")
+        if position is not None:
+            self.last_hit = tuple(position)
+            self.window_geometry = geometry
+        return position
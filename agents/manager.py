@@ -1,9 +1,11 @@
 import logging
 import subprocess
-import time
+import sys
 from pathlib import Path
 
-from globals.constants import NETUNO_STARTUP_WAIT_TIME
+from agents.readiness import FixedWaitProbe, IdleProbe, WindowProbe
+from globals.constants import NETUNO_EXIT_TIMEOUT, NETUNO_STARTUP_WAIT_TIME
+from globals.errors import NetunoStartupTimeoutError
 
 logger = logging.getLogger("triton")
 
@@ -11,43 +13,80 @@ logger = logging.getLogger("triton")
 class ProcessManager:
 
     wait_after_start: float
+    probe: FixedWaitProbe | IdleProbe | WindowProbe
     current_process: subprocess.Popen
 
-    def __init__(self, wait_after_start: float = NETUNO_STARTUP_WAIT_TIME) -> None:
+    def __init__(
+            self,
+            wait_after_start: float = NETUNO_STARTUP_WAIT_TIME,
+            probe: FixedWaitProbe | IdleProbe | WindowProbe | None = None) -> None:
         """
         Initializes the ProcessManager class.
 
         Args:
             wait_after_start (float, optional): Time, in seconds, to wait after initializing
-                Netuno before returning. Defaults to
+                Netuno before returning, if no probe is given. Defaults to
                 `globals.constants.NETUNO_STARTUP_WAIT_TIME`.
+            probe (FixedWaitProbe | IdleProbe | WindowProbe | None, optional): Probe that
+                waits until Netuno is ready to receive input after it is initialized.
+                Defaults to None, in which case it waits `wait_after_start` seconds.
         """
         self.wait_after_start = wait_after_start
+        self.probe = probe or FixedWaitProbe(wait_after_start)
         self.current_process = None
 
     def run_netuno(self, path_to_netuno: Path) -> subprocess.Popen:
         """
         Executes the Netuno application in a new process, returning the corresponding Popen
-        object.
+        object. Python scripts (such as the `fake_netuno.py` stand-in) are executed by the
+        current interpreter.
 
         Args:
             path_to_netuno (Path): Path to the Netuno executable file.
 
+        Raises:
+            NetunoExitedError: If the process exits before it is ready.
+            NetunoStartupTimeoutError: If it is not ready before the timeout of the probe,
+                in which case the process is terminated.
+
         Returns:
             subprocess.Popen: New Popen instance corresponding to the process executing
             Netuno.
         """
-        self.current_process = subprocess.Popen(args=(path_to_netuno,))
+        if Path(path_to_netuno).suffix.casefold() == ".py":
+            self.current_process = subprocess.Popen(args=(sys.executable, path_to_netuno))
+        else:
+            self.current_process = subprocess.Popen(args=(path_to_netuno,))
+        try:
+            waited = self.probe.wait_until_ready(self.current_process)
+        except NetunoStartupTimeoutError:
+            self.current_process.terminate()
+            raise
         logger.debug(
-            f"Successfully spawned new process #{self.current_process.pid} with Netuno 4")
-        time.sleep(self.wait_after_start)
+            f"Successfully spawned new process #{self.current_process.pid} with Netuno 4, "
+            f"ready after {waited:.3f}s")
         return self.current_process
 
     def restart_netuno(self) -> None:
         """
         Restarts the Netuno process, terminating the current one and starting a new one
-        with the same executable.
+        with the same executable once the current one has exited, so its window is gone.
+        Processes that do not exit within `globals.constants.NETUNO_EXIT_TIMEOUT` seconds
+        are killed.
         """
         logger.info(f"Terminating Netuno process #{self.current_process.pid}")
         self.current_process.terminate()
-        self.current_process = self.run_netuno(self.current_process.args[0])
+        try:
+            self.current_process.wait(timeout=NETUNO_EXIT_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            logger.warning(
+                f"Netuno process #{self.current_process.pid} did not exit after "
+                f"{NETUNO_EXIT_TIMEOUT} seconds, killing it")
+            self.current_process.kill()
+            self.current_process.wait()
+        self.current_process = self.run_netuno(self.current_process.args[-1])
+
+    def terminate(self) -> None:
+        """Terminates the current Netuno process, if any was started."""
+        if self.current_process is not None:
+            self.current_process.terminate()
@@ -0,0 +1,107 @@
+import logging
+import sqlite3
+from collections.abc import Iterable
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger("triton")
+
+
+class RunManifest:
+    """
+    Persistent record of the input files whose results were durably written to an output
+    file, kept in a SQLite database next to it, so an interrupted run can be resumed.
+
+    Besides the files, the manifest records the size of the output file after each save,
+    so rows written after the last record (whose files are not in the manifest) can be
+    discarded when resuming.
+    """
+
+    path: Path
+    connection: sqlite3.Connection
+
+    def __init__(self, path: Path) -> None:
+        """
+        Opens the manifest at the given path, creating it if needed.
+
+        Args:
+            path (Path): Path to the SQLite database of the manifest.
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS completed_files ("
+                "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, completed_at TEXT)")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS output (id INTEGER PRIMARY KEY, size INTEGER)")
+
+    @staticmethod
+    def path_for(output_path: Path) -> Path:
+        """
+        Retrieves the path of the manifest corresponding to an output file.
+
+        Args:
+            output_path (Path): Path to the output file.
+
+        Returns:
+            Path: Path to the manifest, in the same directory as the output file.
+        """
+        return output_path.with_suffix(".manifest.sqlite")
+
+    @staticmethod
+    def _fingerprint(input_file: Path) -> tuple[str, int, int]:
+        """
+        Identifies an input file by its absolute path, size and modification time.
+
+        Args:
+            input_file (Path): Path to the input file.
+
+        Returns:
+            tuple[str, int, int]: Absolute path, size (in bytes) and modification time (in
+            nanoseconds) of the file.
+        """
+        status = input_file.stat()
+        return str(input_file.resolve()), status.st_size, status.st_mtime_ns
+
+    @property
+    def output_size(self) -> int | None:
+        """Size of the output file when the manifest was last updated, if ever."""
+        row = self.connection.execute("SELECT size FROM output WHERE id = 0").fetchone()
+        return row[0] if row else None
+
+    def is_completed(self, input_file: Path) -> bool:
+        """
+        Checks whether an input file was completed, and has not changed since then.
+
+        Args:
+            input_file (Path): Path to the input file.
+
+        Returns:
+            bool: Whether the results of the file were durably written.
+        """
+        path, size, mtime_ns = self._fingerprint(input_file)
+        row = self.connection.execute(
+            "SELECT size, mtime_ns FROM completed_files WHERE path = ?", (path,)).fetchone()
+        return row == (size, mtime_ns)
+
+    def mark_completed(self, input_files: Iterable[Path], output_size: int) -> None:
+        """
+        Records input files as completed, together with the current size of the output
+        file, in a single transaction.
+
+        Args:
+            input_files (Iterable[Path]): Input files whose results were durably written.
+            output_size (int): Size of the output file, in bytes, after writing them.
+        """
+        completed_at = datetime.now().isoformat()
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO completed_files VALUES (?, ?, ?, ?)",
+                (self._fingerprint(file) + (completed_at,) for file in input_files))
+            self.connection.execute(
+                "INSERT OR REPLACE INTO output VALUES (0, ?)", (output_size,))
+
+    def close(self) -> None:
+        """Closes the connection to the database."""
+        self.connection.close()
@@ -0,0 +1,87 @@
+from datetime import datetime
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from agents.exporter import CSVExporter
+from globals.constants import OUTPUT_COLUMNS
+
+
+class ParquetExporter(CSVExporter):
+    """
+    Writes results to a Parquet file through a single writer, kept open during the whole
+    run. Text columns are dictionary-encoded and the other ones (values of the metrics and
+    swept parameters) are stored as float64. Every save writes a new row group, but the file
+    is only readable after `close()`, which writes its footer, so runs cannot be resumed.
+    """
+
+    schema: pa.Schema
+    output_file: pq.ParquetWriter | None
+
+    def __init__(
+            self,
+            parent_output_dir: Path,
+            columns: tuple[str, ...] = OUTPUT_COLUMNS,
+            flush_rows: int | None = None,
+            flush_interval: float | None = None,
+            layout: str = "long"):
+        """
+        Initializes the exporter, with a new timestamped output file.
+
+        Args:
+            parent_output_dir (Path): Directory of the output file.
+            columns (tuple[str, ...], optional): Columns of the results, as given to
+                `add_results()`. Defaults to `globals.constants.OUTPUT_COLUMNS`.
+            flush_rows (int | None, optional): Number of rows after which results are
+                saved automatically. Defaults to None (disabled).
+            flush_interval (float | None, optional): Time, in seconds, after which results
+                are saved automatically. Defaults to None (disabled).
+            layout (str, optional): Layout of the output file, either 'long' (one row per
+                metric) or 'wide' (one row per simulation). Defaults to 'long'.
+        """
+        super().__init__(parent_output_dir, columns, flush_rows, flush_interval, layout)
+        self.schema = pa.schema([
+            (column, self._column_type(column)) for column in self.columns])
+
+    @staticmethod
+    def _column_type(column: str) -> pa.DataType:
+        """
+        Retrieves the type of a column of the output file.
+
+        Args:
+            column (str): Name of the column.
+
+        Returns:
+            pa.DataType: Dictionary-encoded string for text columns, float64 otherwise.
+        """
+        if column in OUTPUT_COLUMNS and column != "value":
+            return pa.dictionary(pa.int32(), pa.string())
+        return pa.float64()
+
+    def _get_base_file_name(self) -> str:
+        """
+        Retrieves the base file name for new Parquet files.
+
+        Returns:
+            str: Base name for new files.
+        """
+        return f"{datetime.now().strftime('%Y-%m-%dT%H-%M')}-consolidated.parquet"
+
+    def _write_rows(self) -> int:
+        """
+        Writes the current batch of results to the output file as a new row group, opening
+        it if needed.
+
+        Returns:
+            int: Size of the output file after the write, in bytes.
+        """
+        if self.output_file is None:
+            self.output_file = pq.ParquetWriter(self.output_path, self.schema)
+        arrays = [
+            pa.array(values, field.type.value_type).dictionary_encode()
+            if pa.types.is_dictionary(field.type) else pa.array(values, field.type)
+            for field, values in zip(self.schema, zip(*self.content))
+        ]
+        self.output_file.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+        return self.output_path.stat().st_size
@@ -1,14 +1,27 @@
 import csv
+import io
 import logging
+import math
+import os
 import re
-from pathlib import Path
+from datetime import date, datetime
+from pathlib import Path, PureWindowsPath
+
+import numpy as np
 
 from agents.sleeper import Sleeper
-from globals.constants import SIMULATION_OUTPUT_ATTRIBUTES
+from globals.constants import (
+    SIMULATION_DATE_FORMATS, SIMULATION_OUTPUT_ATTRIBUTES, SIMULATION_RESULT_LABELS,
+    SIMULATION_RESULT_UNITS, SIMULATION_SETTING_LABELS)
+from globals.errors import (
+    IncompleteResultsError, MismatchedSettingError, UnknownResultLabelError)
 from globals.types import ResultTuple, Variable
 
 logger = logging.getLogger("triton")
 
+TAIL_CHUNK_SIZE = 4096
+METRICS_BY_LABEL = {label: metric for metric, label in SIMULATION_RESULT_LABELS.items()}
+
 
 class FileNameParser:
 
@@ -53,6 +66,41 @@ class FileNameParser:
         return city, model, scenario
 
 
+class PrecipitationParser:
+
+    precipitation_file: Path
+
+    def __init__(self, precipitation_file: Path):
+        self.precipitation_file = precipitation_file
+
+    def to_list(self) -> list[float]:
+        """
+        Reads the daily precipitation values from a Netuno 4 input file, which contains one
+        value (in mm) per row and no headers. Blank rows are ignored.
+
+        Returns:
+            list[float]: Daily precipitation values, in the same order as in the file.
+        """
+        with open(self.precipitation_file) as csv_file:
+            return [float(row) for row in csv_file if row.strip()]
+
+    def to_array(self, content: bytes | None = None) -> np.ndarray:
+        """
+        Reads the daily precipitation values from a Netuno 4 input file into a NumPy array,
+        the same way as `to_list()`.
+
+        Args:
+            content (bytes | None, optional): Content of the file, if already read, so it
+                is not read again. Defaults to None, in which case the file is read.
+
+        Returns:
+            np.ndarray: 1-D array of daily precipitation values.
+        """
+        if content is None:
+            return np.loadtxt(self.precipitation_file, dtype=float, ndmin=1)
+        return np.loadtxt(io.StringIO(content.decode()), dtype=float, ndmin=1)
+
+
 class ResultParser:
 
     results_file: Path
@@ -76,59 +124,173 @@ class ResultParser:
             value = value.replace(".", "").replace(",", ".")
         return float(value)
 
+    def _read_tail(self, label: str) -> str:
+        """
+        Reads the end of the CSV generated by Netuno 4 from the last occurrence of a label,
+        seeking backwards from the end of the file in chunks until the label is found, so
+        the (long) echo of the precipitation series before it is never read.
+
+        Args:
+            label (str): Label to be found.
+
+        Returns:
+            str: Decoded end of the file, starting at the label, or an empty string if the
+            file does not contain the label.
+        """
+        encoding = SIMULATION_OUTPUT_ATTRIBUTES["encoding"]
+        encoded_label = label.encode(encoding)
+        with open(self.results_file, "rb") as results_file:
+            position = results_file.seek(0, os.SEEK_END)
+            tail = b""
+            while position > 0:
+                chunk_start = max(0, position - TAIL_CHUNK_SIZE)
+                results_file.seek(chunk_start)
+                tail = results_file.read(position - chunk_start) + tail
+                position = chunk_start
+                if (label_start := tail.rfind(encoded_label)) >= 0:
+                    return tail[label_start:].decode(encoding)
+        return ""
+
+    def _read_results_section(self) -> str:
+        """
+        Reads the results section at the end of the CSV generated by Netuno 4, with
+        `_read_tail()`.
+
+        Returns:
+            str: Decoded results section, after its starting label, or an empty string if
+            the file has no results section.
+        """
+        start_label = SIMULATION_OUTPUT_ATTRIBUTES["start_of_results_label"]
+        return self._read_tail(start_label).removeprefix(start_label)
+
+    def get_settings(self) -> dict[str, str]:
+        """
+        Retrieves the settings echoed by Netuno 4 in the CSV it generated: the path to the
+        precipitation file, in its first line, and the date and parameters between the echo
+        of the precipitation series and the results section, read with `_read_tail()`.
+
+        Returns:
+            dict[str, str]: First value of each setting, by its label.
+        """
+        encoding = SIMULATION_OUTPUT_ATTRIBUTES["encoding"]
+        start_label = SIMULATION_OUTPUT_ATTRIBUTES["start_of_results_label"]
+        with open(self.results_file, "rb") as results_file:
+            first_line = results_file.readline().decode(encoding)
+        settings_section = self._read_tail(
+            SIMULATION_SETTING_LABELS["initial_run_off_disposal"]).split(start_label)[0]
+        reader = csv.reader(
+            [first_line, *settings_section.splitlines()],
+            delimiter=SIMULATION_OUTPUT_ATTRIBUTES["delimiter"])
+        return {row[0].strip(): row[1].strip() for row in reader if len(row) >= 2}
+
+    @staticmethod
+    def _parse_date(value: str) -> date | None:
+        """
+        Parses a date in any of the formats of `SIMULATION_DATE_FORMATS`.
+
+        Args:
+            value (str): Date to be parsed.
+
+        Returns:
+            date | None: Parsed date, or None if it is in no known format.
+        """
+        for date_format in SIMULATION_DATE_FORMATS:
+            try:
+                return datetime.strptime(value, date_format).date()
+            except ValueError:
+                continue
+        return None
+
+    def check_settings(
+            self,
+            precipitation_path: Path,
+            initial_date: str,
+            parameters: dict[str, float]) -> None:
+        """
+        Checks that the results were simulated with the given inputs, as echoed by Netuno 4
+        in the CSV it generated: the name of the precipitation file, the initial date and
+        the parameters in `SIMULATION_SETTING_LABELS`. Results files are still exported
+        when a keystroke is lost while the inputs are entered, but for other inputs.
+
+        Args:
+            precipitation_path (Path): Path to the precipitation file.
+            initial_date (str): Initial date of the simulation.
+            parameters (dict[str, float]): Simulation parameters, as in
+                `SIMULATION_PARAMETERS`.
+
+        Raises:
+            MismatchedSettingError: If any setting differs from the given input.
+        """
+        settings = self.get_settings()
+        found = {
+            setting: settings.get(label, "")
+            for setting, label in SIMULATION_SETTING_LABELS.items()}
+        if PureWindowsPath(found["precipitation_path"]).name != precipitation_path.name:
+            raise MismatchedSettingError(
+                self.results_file, "precipitation_path", precipitation_path.name,
+                found["precipitation_path"])
+        if self._parse_date(found["date"]) != self._parse_date(initial_date):
+            raise MismatchedSettingError(
+                self.results_file, "date", initial_date, found["date"])
+        for setting, value in parameters.items():
+            if setting not in found:
+                continue
+            # The percentage of rainwater replacement is exported as a fraction
+            if setting == "rainwater_replacement_percentage":
+                value /= 100
+            try:
+                matches = math.isclose(self._float_from_string(found[setting]), value)
+            except ValueError:
+                matches = False
+            if not matches:
+                raise MismatchedSettingError(
+                    self.results_file, setting, str(value), found[setting])
+
     def _get_results(self) -> list[dict[str, str | float]]:
         """
-        Retrieves the simulation results from the CSV generated by Netuno 4.
+        Retrieves the simulation results from the CSV generated by Netuno 4, reading only
+        its results section.
 
         Returns:
             list[dict[str, str | float]]: List of dictionaries containing label and values
             for all results found in the file.
         """
-        results = []
         Sleeper.until_file_is_available(self.results_file)
-        with open(
-                self.results_file,
-                newline="",
-                encoding=SIMULATION_OUTPUT_ATTRIBUTES["encoding"]) as csv_file:
-            reader = csv.reader(
-                csv_file, delimiter=SIMULATION_OUTPUT_ATTRIBUTES["delimiter"])
-            results_section = False
-            for row in reader:
-                if SIMULATION_OUTPUT_ATTRIBUTES["start_of_results_label"] in row:
-                    results_section = True
-                    continue
-                if results_section:
-                    results.append({
-                        "label": row[0],
-                        "value": self._float_from_string(row[1])
-                    })
-        return results
+        reader = csv.reader(
+            self._read_results_section().splitlines(),
+            delimiter=SIMULATION_OUTPUT_ATTRIBUTES["delimiter"])
+        return [
+            {"label": row[0], "value": self._float_from_string(row[1])}
+            for row in reader if len(row) >= 2
+        ]
 
     def parse_results(self) -> dict[str, Variable]:
         """
-        Parses the results from `_get_results()` into a dictionary with matching Variables.
+        Parses the results from `_get_results()` into a dictionary with matching Variables,
+        identifying the metric of each result by its label, so the order of the results in
+        the file does not matter.
+
+        Raises:
+            UnknownResultLabelError: If a result has a label of no known metric.
+            IncompleteResultsError: If any metric has no result in the file.
 
         Returns:
             dict[str, Variable]: Dictionary mapping metric names to their corresponding
-            Variables.
+            Variables, in the order of `globals.constants.SIMULATION_RESULT_UNITS`.
         """
         logger.info(f"Parsing results from file '{self.results_file.name}'")
-        results = self._get_results()
+        values = {}
+        for result in self._get_results():
+            if (metric := METRICS_BY_LABEL.get(result["label"].strip())) is None:
+                raise UnknownResultLabelError(result["label"])
+            values[metric] = result["value"]
+        if missing_metrics := [
+                metric for metric in SIMULATION_RESULT_UNITS if metric not in values]:
+            raise IncompleteResultsError(self.results_file, missing_metrics)
         return {
-            "potential_savings": Variable(
-                label=results[0]["label"], unit="%", value=results[0]["value"]),
-            "average_rainwater_consumption": Variable(
-                label=results[1]["label"], unit="liters/day", value=results[1]["value"]),
-            "average_drinking_water_consumption": Variable(
-                label=results[2]["label"], unit="liters/day", value=results[2]["value"]),
-            "average_rainwater_overflow": Variable(
-                label=results[3]["label"], unit="liters/day", value=results[3]["value"]),
-            "period_when_demand_is_fully_met": Variable(
-                label=results[4]["label"], unit="days", value=results[4]["value"]),
-            "period_when_demand_is_partially_met": Variable(
-                label=results[5]["label"], unit="%", value=results[5]["value"]),
-            "period_when_demand_is_not_met": Variable(
-                label=results[6]["label"], unit="%", value=results[6]["value"]),
+            metric: Variable(
+                label=SIMULATION_RESULT_LABELS[metric], unit=unit, value=values[metric])
+            for metric, unit in SIMULATION_RESULT_UNITS.items()
         }
 
     def to_list(self, city: str, model: str, scenario: str,) -> list[ResultTuple]:
@@ -0,0 +1,113 @@
+import queue
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+from globals.constants import PIPELINE_DEPTH
+
+_STOP = object()
+
+
+class Pipeline:
+    """
+    Runs a stage over a sequence of tasks in a background thread, while the calling thread
+    consumes the results, so both overlap: the stage starts the next task as soon as it
+    returns the result of the previous one, instead of waiting for it to be consumed.
+
+    The stage and the calling thread are connected by bounded queues, so the stage never
+    gets more than `depth` tasks ahead of the results being consumed, and the tasks are
+    only taken from their iterable in the calling thread. The stage stops at the first task
+    that fails, whose error is raised in the calling thread, in order.
+    """
+
+    depth: int
+
+    def __init__(self, depth: int = PIPELINE_DEPTH) -> None:
+        """
+        Initializes the pipeline.
+
+        Args:
+            depth (int, optional): Maximum number of tasks given to the stage ahead of the
+                results being consumed. Defaults to `globals.constants.PIPELINE_DEPTH`.
+        """
+        self.depth = depth
+
+    @staticmethod
+    def _work(
+            function: Callable[[Any], Any],
+            tasks: queue.Queue,
+            results: queue.Queue,
+            stop: threading.Event) -> None:
+        """
+        Applies a function to every task received, in order, until told to stop or a task
+        fails.
+
+        Args:
+            function (Callable[[Any], Any]): Function applied to each task.
+            tasks (queue.Queue): Queue of tasks.
+            results (queue.Queue): Queue of each task with its result (or error), and
+                whether it failed.
+            stop (threading.Event): Event set when no more tasks should be run.
+        """
+        while (task := tasks.get()) is not _STOP and not stop.is_set():
+            try:
+                results.put((task, function(task), False))
+            except BaseException as exception:
+                results.put((task, exception, True))
+                return
+
+    def imap(
+            self,
+            function: Callable[[Any], Any],
+            tasks: Iterable[Any]) -> Iterator[tuple[Any, Any]]:
+        """
+        Applies a function to every task in a background thread, taking tasks lazily, up to
+        `depth` tasks ahead of the results being consumed.
+
+        When the iteration ends early (e.g. because of an error in the calling thread), the
+        pending tasks are discarded and the stage is awaited, after it finishes its current
+        task. Close the iterator explicitly (e.g. with `contextlib.closing()`) to make sure
+        it is stopped before moving on.
+
+        Args:
+            function (Callable[[Any], Any]): Function applied to each task.
+            tasks (Iterable[Any]): Tasks.
+
+        Raises:
+            BaseException: Any error raised by the function, once the results of the
+                previous tasks are consumed.
+
+        Yields:
+            Iterator[tuple[Any, Any]]: Each task with its result, in the same order as the
+            tasks.
+        """
+        tasks = iter(tasks)
+        inbox = queue.Queue(self.depth)
+        outbox = queue.Queue(self.depth)
+        stop = threading.Event()
+        worker = threading.Thread(
+            target=self._work, args=(function, inbox, outbox, stop), daemon=True)
+        worker.start()
+        pending = 0
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and pending < self.depth:
+                    task = next(tasks, _STOP)
+                    exhausted = task is _STOP
+                    if not exhausted:
+                        inbox.put(task)
+                        pending += 1
+                if not pending:
+                    return
+                task, result, failed = outbox.get()
+                pending -= 1
+                if failed:
+                    raise result
+                yield task, result
+        finally:
+            stop.set()
+            while not inbox.empty():
+                inbox.get_nowait()
+            inbox.put(_STOP)
+            worker.join()
@@ -0,0 +1,324 @@
+import logging
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import nullcontext
+from itertools import groupby
+from pathlib import Path
+
+import pyautogui
+
+from agents.automators import Mover, NetunoAutomator
+from agents.readiness import ResponseProbe
+from agents.tracer import PhaseTracer
+from globals.constants import (
+    COEFFICIENT_OF_LOSS_MAX, COEFFICIENT_OF_LOSS_MIN, PLAN_KEY_INTERVAL,
+    RAINFALL_SUBSTITUTION_PERCENT_MAX, RAINFALL_SUBSTITUTION_PERCENT_MIN)
+from globals.types import PlanStep
+from globals.utils import get_export_path, saturate
+
+logger = logging.getLogger("triton")
+
+
+def keys(*sequences: Iterable[str], phase: str | None = None) -> PlanStep:
+    """
+    Creates a step that presses keys, in order.
+
+    Args:
+        *sequences (Iterable[str]): Names of the keys (or characters) to be pressed.
+        phase (str | None, optional): Phase traced while pressing them. Defaults to None.
+
+    Returns:
+        PlanStep: Step of the plan.
+    """
+    return PlanStep(
+        "keys", tuple(key for sequence in sequences for key in sequence), None, phase)
+
+
+def value_keys(value: float) -> tuple[str, ...]:
+    """
+    Lists the characters typed for a value, with commas instead of dots.
+
+    Args:
+        value (float): Value to be typed.
+
+    Returns:
+        tuple[str, ...]: Characters to be pressed.
+    """
+    return tuple(str(value).replace(".", ","))
+
+
+class KeystrokePlan:
+    """
+    Immutable sequence of the inputs sent to Netuno 4 for a simulation, compiled once and
+    replayed for every file: keys to be pressed (navigation and field values), paths pasted
+    into Windows Explorer and the date, which are filled in when replaying, the click on the
+    lower tank option, and pauses only where a window needs time to respond.
+
+    Consecutive keys are merged into a single step, so each one is sent in a single call to
+    `PyAutoGUI`. Plans can be inspected and timed without Netuno 4.
+    """
+
+    steps: tuple[PlanStep, ...]
+
+    def __init__(self, steps: Iterable[PlanStep]) -> None:
+        """
+        Initializes the plan, merging consecutive keys of the same phase.
+
+        Args:
+            steps (Iterable[PlanStep]): Steps of the plan, in order.
+        """
+        merged = []
+        for step in steps:
+            if (
+                    merged and step.kind == "keys" and merged[-1].kind == "keys"
+                    and step.phase == merged[-1].phase):
+                merged[-1] = PlanStep("keys", merged[-1].keys + step.keys, None, step.phase)
+            elif step.kind != "keys" or step.keys:
+                merged.append(step)
+        self.steps = tuple(merged)
+
+    def __iter__(self) -> Iterator[PlanStep]:
+        return iter(self.steps)
+
+    @property
+    def keystrokes(self) -> int:
+        """Number of keys pressed by the steps of the plan, excluding the date."""
+        return sum(len(step.keys) for step in self.steps)
+
+    def estimate_duration(
+            self, key_interval: float, keystroke_pause: float, explorer_wait: float
+            ) -> float:
+        """
+        Estimates the time spent waiting while replaying the plan, disregarding how long
+        Netuno 4 and `PyAutoGUI` take to process each input.
+
+        Args:
+            key_interval (float): Interval between consecutive keys, in seconds.
+            keystroke_pause (float): Pause of each pause step, after the date is typed and
+                after each of the 4 keystrokes that paste a path, in seconds.
+            explorer_wait (float): Wait before pasting each path, in seconds.
+
+        Returns:
+            float: Estimated time, in seconds.
+        """
+        duration = 0.0
+        for step in self.steps:
+            if step.kind == "keys":
+                duration += len(step.keys) * key_interval
+            elif step.kind in ("date", "pause"):
+                duration += keystroke_pause
+            elif step.kind == "paste":
+                duration += explorer_wait + 4 * keystroke_pause
+        return duration
+
+    @classmethod
+    def first_simulation(
+            cls,
+            initial_run_off_disposal: float,
+            catchment_area: float,
+            daily_water_demand: float,
+            number_of_residents: int,
+            rainwater_replacement_percentage: int,
+            coefficient_of_loss: float,
+            upper_tank_capacity: float,
+            lower_tank_capacity: float) -> "KeystrokePlan":
+        """
+        Compiles the plan that sets up every simulation parameter and runs a simulation, as
+        `NetunoAutomator.run_first_simulation()`.
+
+        Args:
+            initial_run_off_disposal (float): Value for initial run off disposal.
+            catchment_area (float): Value for catchment area.
+            daily_water_demand (float): Value for daily water demand.
+            number_of_residents (int): Value for number of residentes.
+            rainwater_replacement_percentage (int): Value for rainwater replacement
+                percentage.
+            coefficient_of_loss (float): Value for coefficient of loss.
+            upper_tank_capacity (float): Value for upper tank capacity.
+            lower_tank_capacity (float): Value for lower tank capacity.
+
+        Returns:
+            KeystrokePlan: Compiled plan.
+        """
+        replacement = saturate(
+            rainwater_replacement_percentage,
+            RAINFALL_SUBSTITUTION_PERCENT_MIN,
+            RAINFALL_SUBSTITUTION_PERCENT_MAX)
+        coefficient_of_loss = saturate(
+            coefficient_of_loss, COEFFICIENT_OF_LOSS_MIN, COEFFICIENT_OF_LOSS_MAX)
+        return cls((
+            keys(Mover.FROM_STARTUP_TO_FILE_SELECTION),
+            PlanStep("paste", slot="precipitation_path"),
+            keys(Mover.FROM_FILE_SELECTION_TO_DATE),
+            PlanStep("date", slot="date"),
+            keys(
+                Mover.FROM_DATE_TO_INITIAL_RUN_OFF_FIELD,
+                value_keys(initial_run_off_disposal),
+                Mover.FROM_INITIAL_RUN_OFF_TO_CATCHMENT_AREA_FIELD,
+                value_keys(catchment_area),
+                Mover.FROM_CATCHMENT_AREA_TO_WATER_DEMAND_FIELD,
+                value_keys(daily_water_demand),
+                Mover.FROM_WATER_DEMAND_TO_RESIDENTS_FIELD,
+                str(number_of_residents),
+                Mover.FROM_RESIDENTS_TO_RAINWATER_REPLACEMENT,
+                ("down",) * (replacement // 10),
+                Mover.FROM_RAINWATER_REPLACEMENT_TO_COEFFICIENT_OF_LOSS,
+                value_keys(coefficient_of_loss),
+                Mover.FROM_COEFFICIENT_OF_LOSS_TO_UPPER_TANK_BUTTON,
+                ("space",)),
+            # The window of the upper tank takes a while to open and to close
+            PlanStep("pause"),
+            keys(("up",), value_keys(upper_tank_capacity), ("enter",)),
+            PlanStep("pause"),
+            PlanStep("click"),
+            keys(
+                value_keys(lower_tank_capacity),
+                Mover.FROM_LOWER_TANK_FIELD_TO_SIMULATE_BUTTON),
+            *cls._simulate_and_export(),
+        ))
+
+    @classmethod
+    def simulation(cls) -> "KeystrokePlan":
+        """
+        Compiles the plan that runs a simulation with the parameters already set up, as
+        `NetunoAutomator.run_simulation()`.
+
+        Returns:
+            KeystrokePlan: Compiled plan.
+        """
+        return cls((
+            keys(Mover.FROM_EXPORT_TO_FILE_SELECTION, Mover.FROM_STARTUP_TO_FILE_SELECTION),
+            PlanStep("paste", slot="precipitation_path"),
+            keys(Mover.FROM_FILE_SELECTION_TO_DATE),
+            PlanStep("date", slot="date"),
+            keys(Mover.FROM_DATE_TO_SIMULATE_BUTTON),
+            *cls._simulate_and_export(),
+        ))
+
+    @staticmethod
+    def _simulate_and_export() -> tuple[PlanStep, ...]:
+        """Steps that run the simulation, then export its results to a file."""
+        return (
+            keys(("space",), phase="simulate_export"),
+            PlanStep("pause", phase="simulate_export"),
+            keys(Mover.FROM_SIMULATE_TO_EXPORT_BUTTON, ("space",), phase="simulate_export"),
+            PlanStep("paste", slot="export_path"),
+        )
+
+
+class PlannedAutomator(NetunoAutomator):
+    """
+    Automates Netuno 4 like `NetunoAutomator`, but replaying compiled keystroke plans (see
+    `KeystrokePlan`) instead of sending each input separately: keys are sent in as few calls
+    as possible, `PLAN_KEY_INTERVAL` seconds apart, and the keystroke pause is only waited
+    where the plan requires it, instead of after every key. Paths and dates are still
+    entered as by `NetunoAutomator`.
+    """
+
+    key_interval: float
+    first_plans: dict[tuple[tuple[str, float], ...], KeystrokePlan]
+    plan: KeystrokePlan
+
+    def __init__(
+            self,
+            extra_wait: float,
+            tracer: PhaseTracer | None = None,
+            probe: ResponseProbe | None = None) -> None:
+        super().__init__(extra_wait, tracer, probe)
+        self.key_interval = PLAN_KEY_INTERVAL
+        self.first_plans = {}
+        self.plan = KeystrokePlan.simulation()
+
+    def set_delays(self, keystroke_pause: float, explorer_wait: float) -> None:
+        """
+        Sets the delays used while automating Netuno 4, as `NetunoAutomator.set_delays()`.
+        The interval between keys never exceeds the keystroke pause.
+
+        Args:
+            keystroke_pause (float): Pause where plans require it, in seconds.
+            explorer_wait (float): Wait before pasting a path into Windows Explorer, in
+                seconds.
+        """
+        super().set_delays(keystroke_pause, explorer_wait)
+        self.key_interval = min(PLAN_KEY_INTERVAL, keystroke_pause)
+
+    def _run_step(self, step: PlanStep, slots: dict[str, Path | str]) -> None:
+        """
+        Sends the inputs of a step of a plan to Netuno 4.
+
+        Args:
+            step (PlanStep): Step to be run.
+            slots (dict[str, Path | str]): Paths and date filled into the plan.
+        """
+        if step.kind == "keys":
+            pyautogui.write(list(step.keys), interval=self.key_interval, _pause=False)
+        elif step.kind == "paste":
+            self._select_file_in_explorer(slots[step.slot])
+        elif step.kind == "date":
+            if slots[step.slot] == self.current_date:
+                logger.debug(f"Keeping date '{self.current_date}', which is already set")
+                return
+            self._type_date(slots[step.slot])
+            self.current_date = slots[step.slot]
+        elif step.kind == "click":
+            Mover.to_lower_tank_radio_button()
+            pyautogui.leftClick()
+        elif step.kind == "pause":
+            time.sleep(pyautogui.PAUSE)
+
+    def replay(self, plan: KeystrokePlan, precipitation_path: Path, date: str) -> Path:
+        """
+        Replays a plan, filling in the paths and date of a precipitation file. The date is
+        only typed when it differs from the one already set.
+
+        Args:
+            plan (KeystrokePlan): Plan to be replayed.
+            precipitation_path (Path): Path to the input file containing precipitation data.
+            date (str): Reference date for the file.
+
+        Returns:
+            Path: Path to the export file containing the simulation results.
+        """
+        slots = {
+            "precipitation_path": precipitation_path,
+            "export_path": get_export_path(precipitation_path),
+            "date": date,
+        }
+        for phase, steps in groupby(plan, key=lambda step: step.phase):
+            with self.tracer.span(phase) if phase else nullcontext():
+                for step in steps:
+                    self._run_step(step, slots)
+        return slots["export_path"]
+
+    def run_first_simulation(
+            self, precipitation_path: Path, date: str, **parameters: float) -> Path:
+        """
+        Sets up every simulation parameter and runs a simulation with the provided file,
+        compiling the plan for the given parameters the first time they are used.
+
+        Args:
+            precipitation_path (Path): Path to the input file containing precipitation data.
+            date (str): Reference date for the file.
+            **parameters (float): Simulation parameters, as in `SIMULATION_PARAMETERS`.
+
+        Returns:
+            Path: Path to the export file containing the simulation results.
+        """
+        key = tuple(sorted(parameters.items()))
+        if key not in self.first_plans:
+            self.first_plans[key] = KeystrokePlan.first_simulation(**parameters)
+        self.current_date = None
+        return self.replay(self.first_plans[key], precipitation_path, date)
+
+    def run_simulation(self, precipitation_path: Path, date: str) -> Path:
+        """
+        Runs a simulation with the provided file, assuming setup was already completed.
+
+        Args:
+            precipitation_path (Path): Path to the input file containing precipitation data.
+            date (str): Reference date for the file.
+
+        Returns:
+            Path: Path to the export file containing the simulation results.
+        """
+        return self.replay(self.plan, precipitation_path, date)
@@ -0,0 +1,320 @@
+import ctypes
+import logging
+import subprocess
+import time
+
+import psutil
+
+from agents.sleeper import Sleeper
+from globals.constants import (
+    NETUNO_IDLE_CHECKS, NETUNO_IDLE_CPU_PERCENT, NETUNO_RESPONSE_PROBE_INTERVAL,
+    NETUNO_RESPONSE_TIMEOUT, NETUNO_STARTUP_PROBE_INTERVAL, NETUNO_STARTUP_TIMEOUT,
+    NETUNO_STARTUP_WAIT_TIME, NETUNO_WINDOW_TITLE)
+from globals.errors import (
+    CustomTimeoutError, NetunoExitedError, NetunoStartupTimeoutError,
+    NetunoUnresponsiveError)
+
+logger = logging.getLogger("triton")
+
+
+class FixedWaitProbe:
+    """Assumes Netuno 4 is ready after a fixed wait, however long it actually takes."""
+
+    wait: float
+
+    def __init__(self, wait: float = NETUNO_STARTUP_WAIT_TIME) -> None:
+        """
+        Initializes the probe.
+
+        Args:
+            wait (float, optional): Time, in seconds, to wait after starting Netuno 4.
+                Defaults to `globals.constants.NETUNO_STARTUP_WAIT_TIME`.
+        """
+        self.wait = wait
+
+    def wait_until_ready(self, process: subprocess.Popen) -> float:
+        """
+        Waits the fixed time.
+
+        Args:
+            process (subprocess.Popen): Process running Netuno 4.
+
+        Returns:
+            float: Time waited, in seconds.
+        """
+        time.sleep(self.wait)
+        return self.wait
+
+
+class PollingProbe:
+    """
+    Polls Netuno 4 until it is ready to receive input, returning as soon as it is. Fails if
+    the process exits or takes longer than the timeout. Subclasses define what "ready"
+    means through `is_ready()`.
+    """
+
+    readiness: str = "ready"
+    timeout: float
+    tick: float
+
+    def __init__(
+            self,
+            timeout: float = NETUNO_STARTUP_TIMEOUT,
+            tick: float = NETUNO_STARTUP_PROBE_INTERVAL) -> None:
+        """
+        Initializes the probe.
+
+        Args:
+            timeout (float, optional): Maximum time, in seconds, to wait for Netuno 4.
+                Defaults to `globals.constants.NETUNO_STARTUP_TIMEOUT`.
+            tick (float, optional): Interval between checks, in seconds. Defaults to
+                `globals.constants.NETUNO_STARTUP_PROBE_INTERVAL`.
+        """
+        self.timeout = timeout
+        self.tick = tick
+
+    def is_ready(self, process: subprocess.Popen) -> bool:
+        """
+        Checks whether Netuno 4 is ready to receive input.
+
+        Args:
+            process (subprocess.Popen): Process running Netuno 4.
+
+        Returns:
+            bool: Whether it is ready.
+        """
+        raise NotImplementedError
+
+    def _check(self, process: subprocess.Popen) -> bool:
+        """
+        Checks whether Netuno 4 is ready, after checking that its process is still running.
+
+        Args:
+            process (subprocess.Popen): Process running Netuno 4.
+
+        Raises:
+            NetunoExitedError: If the process exited.
+
+        Returns:
+            bool: Whether it is ready.
+        """
+        if (return_code := process.poll()) is not None:
+            raise NetunoExitedError(process.pid, return_code)
+        return self.is_ready(process)
+
+    def wait_until_ready(self, process: subprocess.Popen) -> float:
+        """
+        Waits until Netuno 4 is ready to receive input.
+
+        Args:
+            process (subprocess.Popen): Process running Netuno 4.
+
+        Raises:
+            NetunoExitedError: If the process exits before it is ready.
+            NetunoStartupTimeoutError: If it is not ready before the timeout.
+
+        Returns:
+            float: Time waited, in seconds.
+        """
+        try:
+            return Sleeper.until_true(lambda: self._check(process), self.tick, self.timeout)
+        except CustomTimeoutError as error:
+            raise NetunoStartupTimeoutError(self.readiness, self.timeout) from error
+
+
+class WindowProbe(PollingProbe):
+    """
+    Considers Netuno 4 ready once a visible window of its process has its name in the
+    title, so windows of a previous process that is still closing are ignored. Window
+    titles are read with `PyGetWindow` (through `PyAutoGUI`) and their processes with the
+    Win32 API, which only exist on Windows.
+    """
+
+    readiness = "showing its window"
+    title: str
+
+    def __init__(
+            self,
+            timeout: float = NETUNO_STARTUP_TIMEOUT,
+            tick: float = NETUNO_STARTUP_PROBE_INTERVAL,
+            title: str = NETUNO_WINDOW_TITLE) -> None:
+        """
+        Initializes the probe.
+
+        Args:
+            timeout (float, optional): Maximum time, in seconds, to wait for Netuno 4.
+                Defaults to `globals.constants.NETUNO_STARTUP_TIMEOUT`.
+            tick (float, optional): Interval between checks, in seconds. Defaults to
+                `globals.constants.NETUNO_STARTUP_PROBE_INTERVAL`.
+            title (str, optional): Text contained in the title of the window. Defaults to
+                `globals.constants.NETUNO_WINDOW_TITLE`.
+        """
+        super().__init__(timeout, tick)
+        self.title = title
+
+    @staticmethod
+    def _get_window_pid(window: object) -> int:
+        """
+        Retrieves the ID of the process that created a window.
+
+        Args:
+            window (object): Window, as returned by `pyautogui.getWindowsWithTitle()`.
+
+        Returns:
+            int: ID of the process.
+        """
+        pid = ctypes.c_ulong()
+        ctypes.windll.user32.GetWindowThreadProcessId(window._hWnd, ctypes.byref(pid))
+        return pid.value
+
+    def is_ready(self, process: subprocess.Popen) -> bool:
+        # PyAutoGUI requires a display as soon as it is imported, which headless runs lack
+        import pyautogui
+        return any(
+            window.visible and self._get_window_pid(window) == process.pid
+            for window in pyautogui.getWindowsWithTitle(self.title))
+
+
+class IdleProbe(PollingProbe):
+    """
+    Considers Netuno 4 ready once its process stops using the CPU, i.e. once it finished
+    loading and is waiting for input, read with `psutil`. Startups that wait on the disk or
+    the network may look idle too early, in which case `WindowProbe` is more reliable.
+    """
+
+    readiness = "idle"
+    checks: int
+    idle_checks: int
+    stats: psutil.Process | None
+
+    def __init__(
+            self,
+            timeout: float = NETUNO_STARTUP_TIMEOUT,
+            tick: float = NETUNO_STARTUP_PROBE_INTERVAL,
+            checks: int = NETUNO_IDLE_CHECKS) -> None:
+        """
+        Initializes the probe.
+
+        Args:
+            timeout (float, optional): Maximum time, in seconds, to wait for Netuno 4.
+                Defaults to `globals.constants.NETUNO_STARTUP_TIMEOUT`.
+            tick (float, optional): Interval between checks, in seconds. Defaults to
+                `globals.constants.NETUNO_STARTUP_PROBE_INTERVAL`.
+            checks (int, optional): Number of consecutive checks in which the CPU usage of
+                the process must be below `globals.constants.NETUNO_IDLE_CPU_PERCENT`.
+                Defaults to `globals.constants.NETUNO_IDLE_CHECKS`.
+        """
+        super().__init__(timeout, tick)
+        self.checks = checks
+        self.idle_checks = 0
+        self.stats = None
+
+    def is_ready(self, process: subprocess.Popen) -> bool:
+        try:
+            if self.stats is None or self.stats.pid != process.pid:
+                self.stats = psutil.Process(process.pid)
+                self.idle_checks = 0
+                # The first reading has no previous one to compare to, so it is always 0
+                self.stats.cpu_percent()
+                return False
+            cpu_percent = self.stats.cpu_percent()
+        except psutil.Error:
+            return False
+        if cpu_percent < NETUNO_IDLE_CPU_PERCENT:
+            self.idle_checks += 1
+        else:
+            self.idle_checks = 0
+        return self.idle_checks >= self.checks
+
+
+class ResponseProbe:
+    """
+    Measures how long Netuno 4 takes to respond to the keys that open and close Windows
+    Explorer, as the time until its window leaves or returns to the foreground. The title of
+    the foreground window is read with `PyGetWindow` (through `PyAutoGUI`), which only works
+    on Windows.
+    """
+
+    timeout: float
+    tick: float
+    title: str
+
+    def __init__(
+            self,
+            timeout: float = NETUNO_RESPONSE_TIMEOUT,
+            tick: float = NETUNO_RESPONSE_PROBE_INTERVAL,
+            title: str = NETUNO_WINDOW_TITLE) -> None:
+        """
+        Initializes the probe.
+
+        Args:
+            timeout (float, optional): Maximum time, in seconds, to wait for a response.
+                Defaults to `globals.constants.NETUNO_RESPONSE_TIMEOUT`.
+            tick (float, optional): Interval between checks, in seconds. Defaults to
+                `globals.constants.NETUNO_RESPONSE_PROBE_INTERVAL`.
+            title (str, optional): Text contained in the title of the window of Netuno 4,
+                and not in the one of Windows Explorer. Defaults to
+                `globals.constants.NETUNO_WINDOW_TITLE`.
+        """
+        self.timeout = timeout
+        self.tick = tick
+        self.title = title
+
+    def _is_showing_netuno(self) -> bool | None:
+        """
+        Checks whether the window of Netuno 4 is in the foreground.
+
+        Returns:
+            bool | None: Whether it is, or None if no window is (e.g. while one closes).
+        """
+        # PyAutoGUI requires a display as soon as it is imported, which headless runs lack
+        import pyautogui
+        if (window := pyautogui.getActiveWindow()) is None:
+            return None
+        return self.title in window.title
+
+    def _wait_for(self, showing_netuno: bool, response: str) -> float:
+        """
+        Waits until the window of Netuno 4 is (or is not) in the foreground.
+
+        Args:
+            showing_netuno (bool): Whether the window of Netuno 4 must be in the foreground.
+            response (str): Description of the expected response, for the error message.
+
+        Raises:
+            NetunoUnresponsiveError: If Netuno 4 does not respond before the timeout.
+
+        Returns:
+            float: Time waited, in seconds.
+        """
+        try:
+            return Sleeper.until_true(
+                lambda: self._is_showing_netuno() == showing_netuno, self.tick,
+                self.timeout)
+        except CustomTimeoutError as error:
+            raise NetunoUnresponsiveError(response, self.timeout) from error
+
+    def wait_for_explorer(self) -> float:
+        """
+        Waits until Windows Explorer is in the foreground, opened by the last key pressed.
+
+        Raises:
+            NetunoUnresponsiveError: If it is not before the timeout.
+
+        Returns:
+            float: Time waited, in seconds.
+        """
+        return self._wait_for(False, "showing Windows Explorer")
+
+    def wait_for_netuno(self) -> float:
+        """
+        Waits until the window of Netuno 4 is back in the foreground, after the last key
+        pressed closed Windows Explorer.
+
+        Raises:
+            NetunoUnresponsiveError: If it is not before the timeout.
+
+        Returns:
+            float: Time waited, in seconds.
+        """
+        return self._wait_for(True, "back from Windows Explorer")
@@ -0,0 +1,160 @@
+import logging
+import statistics
+import subprocess
+from collections import deque
+
+import psutil
+
+from globals.constants import (
+    RESTART_LATENCY_FACTOR, RESTART_LATENCY_WINDOW, RESTART_RESOURCE_FACTOR)
+
+logger = logging.getLogger("triton")
+
+
+class FixedRestartPolicy:
+    """Restarts Netuno 4 every `every` files, regardless of how it behaves."""
+
+    every: int
+
+    def __init__(self, every: int) -> None:
+        """
+        Initializes the policy.
+
+        Args:
+            every (int): Number of files processed between restarts.
+        """
+        self.every = every
+
+    def record_iteration(self, duration: float, process: subprocess.Popen | None) -> None:
+        """Ignores the measurements of an iteration, which do not affect this policy."""
+
+    def should_restart(self, iteration: int) -> bool:
+        """
+        Checks whether Netuno 4 should be restarted before the given iteration.
+
+        Args:
+            iteration (int): Number of files processed so far.
+
+        Returns:
+            bool: Whether the iteration is a multiple of `every`.
+        """
+        return iteration % self.every == 0
+
+    def reset(self) -> None:
+        """Ignores restarts, which do not affect this policy."""
+
+
+class AdaptiveRestartPolicy:
+    """
+    Restarts Netuno 4 only when it degrades, compared to how it behaved right after it was
+    (re)started. The first `window` iterations after each restart set the baseline of
+    iteration latency, memory (RSS) and open handles of the process. A restart is due when
+    the median latency of the last `window` iterations exceeds the baseline by
+    `RESTART_LATENCY_FACTOR`, or memory or handles exceed it by `RESTART_RESOURCE_FACTOR`.
+
+    Process stats are read with `psutil`. If they are not available, only the latency is
+    considered.
+    """
+
+    window: int
+    latencies: deque[float]
+    baseline_latency: float | None
+    baseline_resources: tuple[int, int] | None
+    resources: tuple[int, int] | None
+    _warmup: list[float]
+
+    def __init__(self, window: int = RESTART_LATENCY_WINDOW) -> None:
+        """
+        Initializes the policy.
+
+        Args:
+            window (int, optional): Number of iterations in the baseline and in the rolling
+                latency. Defaults to `globals.constants.RESTART_LATENCY_WINDOW`.
+        """
+        self.window = window
+        self.reset()
+
+    @staticmethod
+    def _read_resources(process: subprocess.Popen | None) -> tuple[int, int] | None:
+        """
+        Reads the memory (RSS, in bytes) and number of open handles (or file descriptors,
+        outside Windows) of a process.
+
+        Args:
+            process (subprocess.Popen | None): Process running Netuno 4, if any.
+
+        Returns:
+            tuple[int, int] | None: Memory and handles of the process, or None if they
+            could not be read.
+        """
+        if process is None:
+            return None
+        try:
+            stats = psutil.Process(process.pid)
+            handles = stats.num_handles() if psutil.WINDOWS else stats.num_fds()
+            return stats.memory_info().rss, handles
+        except (psutil.Error, TypeError, ValueError):
+            return None
+
+    def record_iteration(self, duration: float, process: subprocess.Popen | None) -> None:
+        """
+        Records the latency of an iteration and the current resources of the process.
+
+        Args:
+            duration (float): Duration of the iteration, in seconds.
+            process (subprocess.Popen | None): Process running Netuno 4, if any.
+        """
+        self.resources = self._read_resources(process)
+        if self.baseline_latency is not None:
+            self.latencies.append(duration)
+            return
+        self._warmup.append(duration)
+        if self.baseline_resources is None:
+            self.baseline_resources = self.resources
+        if len(self._warmup) == self.window:
+            self.baseline_latency = statistics.median(self._warmup)
+            logger.debug(f"Baseline iteration latency: {self.baseline_latency:.3f}s")
+
+    def _degraded_resource(self) -> str | None:
+        """
+        Checks whether the memory or handles of the process grew past the threshold.
+
+        Returns:
+            str | None: Description of the degraded resource, if any.
+        """
+        if self.resources is None or self.baseline_resources is None:
+            return None
+        for name, current, baseline in zip(
+                ("memory", "handles"), self.resources, self.baseline_resources):
+            if baseline and current > baseline * RESTART_RESOURCE_FACTOR:
+                return f"{name} grew from {baseline} to {current}"
+        return None
+
+    def should_restart(self, iteration: int) -> bool:
+        """
+        Checks whether Netuno 4 degraded enough to be restarted before the given iteration.
+
+        Args:
+            iteration (int): Number of files processed so far.
+
+        Returns:
+            bool: Whether latency, memory or handles grew past their thresholds.
+        """
+        reason = self._degraded_resource()
+        if reason is None and len(self.latencies) == self.window:
+            latency = statistics.median(self.latencies)
+            if latency > self.baseline_latency * RESTART_LATENCY_FACTOR:
+                reason = (
+                    f"iteration latency grew from {self.baseline_latency:.3f}s to "
+                    f"{latency:.3f}s")
+        if reason:
+            logger.info(f"Restarting Netuno 4 before iteration {iteration}, since {reason}")
+        return reason is not None
+
+    def reset(self) -> None:
+        """Discards the measurements, so the restarted process sets a new baseline."""
+        self.latencies = deque(maxlen=self.window)
+        self.baseline_latency = None
+        self.baseline_resources = None
+        self.resources = None
+        self._warmup = []
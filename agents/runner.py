@@ -0,0 +1,95 @@
+import logging
+from pathlib import Path
+
+from agents.parsers import FileNameParser, PrecipitationParser
+from agents.simulator import NetunoSimulator
+from agents.sweep import ParameterSweep
+from globals.types import ResultTuple, SweepResultTuple
+
+logger = logging.getLogger("triton")
+
+
+class HeadlessRunner:
+    """
+    Parses and simulates precipitation files with the headless engines. Instances can be
+    sent to other processes, so the same runner is used by sequential and parallel runs.
+    """
+
+    simulator: NetunoSimulator
+    vectorized: bool
+    sweep: ParameterSweep | None
+    max_columns: int
+
+    def __init__(
+            self,
+            simulator: NetunoSimulator,
+            vectorized: bool,
+            sweep: ParameterSweep | None = None,
+            max_columns: int = 1) -> None:
+        """
+        Initializes the runner.
+
+        Args:
+            simulator (NetunoSimulator): Simulator configured with the default parameters.
+            vectorized (bool): Whether files are simulated at once, with NumPy. Always the
+                case when there is a parameter sweep.
+            sweep (ParameterSweep | None, optional): Parameter sweep to be run, if any.
+                Defaults to None.
+            max_columns (int, optional): Maximum number of columns simulated at once during
+                a sweep. Defaults to 1.
+        """
+        self.simulator = simulator
+        self.vectorized = vectorized or sweep is not None
+        self.sweep = sweep
+        self.max_columns = max_columns
+
+    def _run_one_by_one(self, batch: list[Path]) -> list[ResultTuple]:
+        """
+        Simulates each file of a batch with the pure Python engine.
+
+        Args:
+            batch (list[Path]): Precipitation files to be simulated.
+
+        Returns:
+            list[ResultTuple]: Results of all files, in the same order.
+        """
+        content = []
+        for input_file in batch:
+            city, model, scenario = FileNameParser.get_metadata(input_file)
+            logger.info(
+                f"Simulating city of '{city}', model '{model}', scenario '{scenario}'")
+            precipitation = PrecipitationParser(input_file).to_list()
+            content.extend(self.simulator.to_list(precipitation, city, model, scenario))
+        return content
+
+    def _run_at_once(self, batch: list[Path]) -> list[ResultTuple | SweepResultTuple]:
+        """
+        Parses a batch of precipitation files and simulates them at once, for every point of
+        the parameter sweep, if any.
+
+        Args:
+            batch (list[Path]): Precipitation files to be simulated.
+
+        Returns:
+            list[ResultTuple | SweepResultTuple]: Results of all files, in the same order.
+        """
+        logger.info(f"Simulating a batch of {len(batch)} file(s) at once")
+        identifiers = [FileNameParser.get_metadata(file) for file in batch]
+        series = [PrecipitationParser(file).to_array() for file in batch]
+        if self.sweep:
+            return self.sweep.run(series, identifiers, self.max_columns)
+        return self.simulator.many_to_list(series, identifiers)
+
+    def run(self, batch: list[Path]) -> list[ResultTuple | SweepResultTuple]:
+        """
+        Simulates a batch of precipitation files with the configured engine.
+
+        Args:
+            batch (list[Path]): Precipitation files to be simulated.
+
+        Returns:
+            list[ResultTuple | SweepResultTuple]: Results of all files, in the same order.
+        """
+        if self.vectorized:
+            return self._run_at_once(batch)
+        return self._run_one_by_one(batch)
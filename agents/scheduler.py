@@ -0,0 +1,50 @@
+import logging
+from collections.abc import Iterable
+from itertools import groupby
+from pathlib import Path
+
+from agents.parsers import FileNameParser
+from globals.constants import INITIAL_DATES
+
+logger = logging.getLogger("triton")
+
+
+class SimulationScheduler:
+    """
+    Orders the input files of the 'netuno' engine to minimize the fields edited in the
+    Netuno 4 form between simulations, so the same order is produced by every run.
+    """
+
+    @staticmethod
+    def _sort_key(file: Path) -> tuple[str, str, str, str, str]:
+        """
+        Computes the position of a file in the schedule.
+
+        Args:
+            file (Path): Path to the input file.
+
+        Returns:
+            tuple[str, str, str, str, str]: Initial date and scenario, which set the form,
+            followed by city, model and file name, which only make the order stable.
+        """
+        city, model, scenario = FileNameParser.get_metadata(file)
+        return INITIAL_DATES.get(scenario, ""), scenario, city, model, file.name
+
+    @classmethod
+    def order(cls, files: Iterable[Path]) -> list[Path]:
+        """
+        Orders input files, grouping the ones that share the same initial date (such as
+        every file of a scenario), so the date only has to be typed once per group.
+
+        Args:
+            files (Iterable[Path]): Input files.
+
+        Returns:
+            list[Path]: Input files, in the order they should be simulated.
+        """
+        keyed_files = sorted(((cls._sort_key(file), file) for file in files))
+        date_changes = len(list(groupby(key[0] for key, _ in keyed_files)))
+        logger.debug(
+            f"Scheduled {len(keyed_files)} file(s), with {date_changes} distinct initial "
+            f"date(s)")
+        return [file for _, file in keyed_files]
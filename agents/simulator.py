@@ -0,0 +1,385 @@
+import logging
+from collections import defaultdict
+from collections.abc import Sequence
+
+import numpy as np
+
+from globals.constants import (
+    COEFFICIENT_OF_LOSS_MAX, COEFFICIENT_OF_LOSS_MIN, RAINFALL_SUBSTITUTION_PERCENT_MAX,
+    RAINFALL_SUBSTITUTION_PERCENT_MIN, SIMULATION_RESULT_LABELS, SIMULATION_RESULT_UNITS)
+from globals.errors import EmptyPrecipitationSeriesError
+from globals.types import ResultTuple, Variable
+from globals.utils import saturate
+
+logger = logging.getLogger("triton")
+
+
+class NetunoSimulator:
+    """
+    Reproduces the daily rainwater tank balance of Netuno 4 without its GUI, so simulations
+    can run headless, on any platform.
+
+    Every day, the rainwater collected from the catchment area (after the initial run-off
+    disposal) flows into the lower tank, whose excess overflows. When there is an upper
+    tank, it is refilled from the lower tank and the rainwater demand is drawn from it,
+    otherwise the demand is drawn directly from the lower tank.
+
+    Besides simulating one series at a time, many series can be simulated together with
+    NumPy, in which case the tanks of all series advance one day at a time as columns of a
+    single array. The parameters may also be arrays, with one value per column (see
+    `stack()`).
+    """
+
+    initial_run_off_disposal: float
+    catchment_area: float
+    total_demand: float
+    rainwater_demand: float
+    coefficient_of_loss: float
+    upper_tank_capacity: float
+    lower_tank_capacity: float
+
+    def __init__(
+            self,
+            initial_run_off_disposal: float,
+            catchment_area: float,
+            daily_water_demand: float,
+            number_of_residents: int,
+            rainwater_replacement_percentage: int,
+            coefficient_of_loss: float,
+            upper_tank_capacity: float,
+            lower_tank_capacity: float) -> None:
+        """
+        Initializes the simulator with the same parameters used to set up Netuno 4.
+
+        Args:
+            initial_run_off_disposal (float): Value for initial run off disposal, in mm.
+            catchment_area (float): Value for catchment area, in m².
+            daily_water_demand (float): Value for daily water demand, in liters per
+                resident.
+            number_of_residents (int): Value for number of residentes.
+            rainwater_replacement_percentage (int): Value for rainwater replacement
+                percentage.
+            coefficient_of_loss (float): Value for coefficient of loss.
+            upper_tank_capacity (float): Value for upper tank capacity, in liters.
+            lower_tank_capacity (float): Value for lower tank capacity, in liters.
+        """
+        replacement = saturate(
+            rainwater_replacement_percentage,
+            RAINFALL_SUBSTITUTION_PERCENT_MIN,
+            RAINFALL_SUBSTITUTION_PERCENT_MAX)
+        self.initial_run_off_disposal = initial_run_off_disposal
+        self.catchment_area = catchment_area
+        self.total_demand = daily_water_demand * number_of_residents
+        self.rainwater_demand = self.total_demand * replacement / 100
+        self.coefficient_of_loss = saturate(
+            coefficient_of_loss, COEFFICIENT_OF_LOSS_MIN, COEFFICIENT_OF_LOSS_MAX)
+        self.upper_tank_capacity = upper_tank_capacity
+        self.lower_tank_capacity = lower_tank_capacity
+
+    @classmethod
+    def stack(
+            cls, simulators: Sequence["NetunoSimulator"], repeat: int) -> "NetunoSimulator":
+        """
+        Combines simulators into a single one whose parameters are arrays, so they can all
+        be run by one call to `simulate_batch()`. The parameters of each simulator are
+        repeated for `repeat` consecutive columns.
+
+        Args:
+            simulators (Sequence[NetunoSimulator]): Simulators to be combined.
+            repeat (int): Number of consecutive columns that use each simulator.
+
+        Returns:
+            NetunoSimulator: Simulator with one value per column for every parameter.
+        """
+        stacked = cls.__new__(cls)
+        for attribute in cls.__annotations__:
+            setattr(stacked, attribute, np.repeat(
+                [getattr(simulator, attribute) for simulator in simulators], repeat))
+        return stacked
+
+    def _daily_inflow(self, precipitation: float) -> float:
+        """
+        Calculates the volume of rainwater that reaches the lower tank in a day. Netuno 4
+        discards the whole precipitation of days that do not exceed the initial run-off
+        disposal.
+
+        Args:
+            precipitation (float): Precipitation for the day, in mm.
+
+        Returns:
+            float: Volume of rainwater, in liters.
+        """
+        if precipitation <= self.initial_run_off_disposal:
+            return 0.0
+        return precipitation * self.catchment_area * self.coefficient_of_loss
+
+    def simulate(self, precipitation: Sequence[float]) -> dict[str, Variable]:
+        """
+        Runs the daily water balance for a precipitation series and summarizes it with the
+        same metrics exported by Netuno 4.
+
+        Args:
+            precipitation (Sequence[float]): Daily precipitation values, in mm.
+
+        Returns:
+            dict[str, Variable]: Dictionary mapping metric names to their corresponding
+            Variables, equivalent to `ResultParser.parse_results()`.
+        """
+        lower_tank = upper_tank = 0.0
+        consumption = overflow = 0.0
+        days_fully_met = days_partially_met = 0
+        for daily_precipitation in precipitation:
+            lower_tank += self._daily_inflow(daily_precipitation)
+            if lower_tank > self.lower_tank_capacity:
+                overflow += lower_tank - self.lower_tank_capacity
+                lower_tank = self.lower_tank_capacity
+
+            if self.upper_tank_capacity > 0:
+                transfer = min(lower_tank, self.upper_tank_capacity - upper_tank)
+                lower_tank -= transfer
+                upper_tank += transfer
+                daily_consumption = min(upper_tank, self.rainwater_demand)
+                upper_tank -= daily_consumption
+            else:
+                daily_consumption = min(lower_tank, self.rainwater_demand)
+                lower_tank -= daily_consumption
+
+            consumption += daily_consumption
+            if daily_consumption >= self.rainwater_demand:
+                days_fully_met += 1
+            elif daily_consumption > 0:
+                days_partially_met += 1
+        return self._to_variables(self._summarize(
+            len(precipitation), consumption, overflow, days_fully_met, days_partially_met))
+
+    def _daily_inflow_batch(self, precipitation: np.ndarray) -> np.ndarray:
+        """
+        Vectorized version of `_daily_inflow()`, for all days and series at once.
+
+        Args:
+            precipitation (np.ndarray): Precipitation values, in mm.
+
+        Returns:
+            np.ndarray: Volumes of rainwater, in liters, with the same shape as the input.
+        """
+        return np.where(
+            precipitation > self.initial_run_off_disposal,
+            precipitation * self.catchment_area * self.coefficient_of_loss,
+            0.0)
+
+    def simulate_batch(self, precipitation: np.ndarray) -> list[dict[str, Variable]]:
+        """
+        Runs the daily water balance for many precipitation series of the same length at
+        once, following the same steps as `simulate()`. The state is updated sequentially
+        in time, but each step is applied to all series together.
+
+        Args:
+            precipitation (np.ndarray): 2-D array of daily precipitation values, in mm,
+                with one row per day and one column per series. When the parameters of the
+                simulator are arrays, they must have one value per column.
+
+        Returns:
+            list[dict[str, Variable]]: List with the results of each series (column), in
+            the same format as `simulate()`.
+        """
+        days, series_count = precipitation.shape
+        inflow = self._daily_inflow_batch(precipitation)
+        draw_from_lower = np.less_equal(self.upper_tank_capacity, 0)
+        lower_tank = np.zeros(series_count)
+        upper_tank = np.zeros(series_count)
+        consumption = np.zeros(series_count)
+        overflow = np.zeros(series_count)
+        days_fully_met = np.zeros(series_count, dtype=int)
+        days_partially_met = np.zeros(series_count, dtype=int)
+        for daily_inflow in inflow:
+            lower_tank += daily_inflow
+            excess = np.maximum(lower_tank - self.lower_tank_capacity, 0)
+            overflow += excess
+            lower_tank -= excess
+
+            transfer = np.where(
+                draw_from_lower,
+                0,
+                np.minimum(lower_tank, self.upper_tank_capacity - upper_tank))
+            lower_tank -= transfer
+            upper_tank += transfer
+            daily_consumption = np.minimum(
+                np.where(draw_from_lower, lower_tank, upper_tank), self.rainwater_demand)
+            lower_tank -= np.where(draw_from_lower, daily_consumption, 0)
+            upper_tank -= np.where(draw_from_lower, 0, daily_consumption)
+
+            consumption += daily_consumption
+            fully_met = daily_consumption >= self.rainwater_demand
+            days_fully_met += fully_met
+            days_partially_met += ~fully_met & (daily_consumption > 0)
+
+        summary = self._summarize(
+            days, consumption, overflow, days_fully_met, days_partially_met)
+        return [
+            self._to_variables({
+                metric: float(values[column]) for metric, values in summary.items()})
+            for column in range(series_count)
+        ]
+
+    def simulate_many(self, series: Sequence[np.ndarray]) -> list[dict[str, Variable]]:
+        """
+        Runs `simulate_batch()` for precipitation series of any lengths, stacking series of
+        the same length into a single array.
+
+        Args:
+            series (Sequence[np.ndarray]): Daily precipitation values of each series, in mm.
+
+        Returns:
+            list[dict[str, Variable]]: List with the results of each series, in the same
+            order as the input.
+        """
+        groups = defaultdict(list)
+        for index, precipitation in enumerate(series):
+            groups[len(precipitation)].append(index)
+
+        results = [None] * len(series)
+        for length, indexes in groups.items():
+            logger.debug(f"Simulating {len(indexes)} series of {length} days at once")
+            batch = np.column_stack([series[index] for index in indexes])
+            for index, result in zip(indexes, self.simulate_batch(batch)):
+                results[index] = result
+        return results
+
+    def _summarize(
+            self,
+            days: int,
+            consumption: float | np.ndarray,
+            overflow: float | np.ndarray,
+            days_fully_met: int | np.ndarray,
+            days_partially_met: int | np.ndarray) -> dict[str, float | np.ndarray]:
+        """
+        Converts the totals accumulated during a simulation into the values of the metrics
+        exported by Netuno 4. Works both for a single series and for arrays of series.
+
+        Args:
+            days (int): Number of simulated days.
+            consumption (float | np.ndarray): Total rainwater consumption, in liters.
+            overflow (float | np.ndarray): Total rainwater overflow, in liters.
+            days_fully_met (int | np.ndarray): Number of days in which the demand was fully
+                met.
+            days_partially_met (int | np.ndarray): Number of days in which the demand was
+                partially met.
+
+        Raises:
+            EmptyPrecipitationSeriesError: If no day was simulated.
+
+        Returns:
+            dict[str, float | np.ndarray]: Dictionary mapping metric names to their values.
+        """
+        if days == 0:
+            raise EmptyPrecipitationSeriesError()
+        average_consumption = consumption / days
+        return {
+            "potential_savings": 100 * average_consumption / self.total_demand,
+            "average_rainwater_consumption": average_consumption,
+            "average_drinking_water_consumption": self.total_demand - average_consumption,
+            "average_rainwater_overflow": overflow / days,
+            "period_when_demand_is_fully_met": 100 * days_fully_met / days,
+            "period_when_demand_is_partially_met": 100 * days_partially_met / days,
+            "period_when_demand_is_not_met":
+                100 * (days - days_fully_met - days_partially_met) / days,
+        }
+
+    @staticmethod
+    def _to_variables(values: dict[str, float]) -> dict[str, Variable]:
+        """
+        Wraps the values of the metrics into Variables, with the labels and units used by
+        Netuno 4.
+
+        Args:
+            values (dict[str, float]): Dictionary mapping metric names to their values.
+
+        Returns:
+            dict[str, Variable]: Dictionary mapping metric names to their corresponding
+            Variables.
+        """
+        return {
+            metric: Variable(
+                label=SIMULATION_RESULT_LABELS[metric],
+                unit=SIMULATION_RESULT_UNITS[metric],
+                value=value)
+            for metric, value in values.items()
+        }
+
+    @staticmethod
+    def results_to_list(
+            results: dict[str, Variable],
+            city: str,
+            model: str,
+            scenario: str) -> list[ResultTuple]:
+        """
+        Converts simulation results into a list of tuples, each one containing a single
+        metric and the corresponding city, model and scenario.
+
+        Args:
+            results (dict[str, Variable]): Dictionary mapping metric names to their
+                corresponding Variables.
+            city (str): City corresponding to the results.
+            model (str): Model corresponding to the results.
+            scenario (str): Scenario corresponding to the results.
+
+        Returns:
+            list[ResultTuple]: List of tuples, each one with one metric and identified by
+            name of the city, model and scenario.
+        """
+        content = []
+        for metric, variable in results.items():
+            content.append((
+                city,
+                model,
+                scenario,
+                metric,
+                variable.label,
+                variable.value,
+                variable.unit))
+        return content
+
+    def to_list(
+            self,
+            precipitation: Sequence[float],
+            city: str,
+            model: str,
+            scenario: str) -> list[ResultTuple]:
+        """
+        Converts the results from `simulate()` into a list of tuples, each one containing a
+        single metric and the corresponding city, model and scenario.
+
+        Args:
+            precipitation (Sequence[float]): Daily precipitation values, in mm.
+            city (str): City corresponding to the results.
+            model (str): Model corresponding to the results.
+            scenario (str): Scenario corresponding to the results.
+
+        Returns:
+            list[ResultTuple]: List of tuples, each one with one metric and identified by
+            name of the city, model and scenario.
+        """
+        return self.results_to_list(self.simulate(precipitation), city, model, scenario)
+
+    def many_to_list(
+            self,
+            series: Sequence[np.ndarray],
+            identifiers: Sequence[tuple[str, str, str]]) -> list[ResultTuple]:
+        """
+        Converts the results from `simulate_many()` into a list of tuples, in the same
+        format as `to_list()`.
+
+        Args:
+            series (Sequence[np.ndarray]): Daily precipitation values of each series, in mm.
+            identifiers (Sequence[tuple[str, str, str]]): City, model and scenario of each
+                series, in the same order.
+
+        Returns:
+            list[ResultTuple]: List of tuples, each one with one metric and identified by
+            name of the city, model and scenario, grouped by series.
+        """
+        content = []
+        for results, (city, model, scenario) in zip(
+                self.simulate_many(series), identifiers, strict=True):
+            content.extend(self.results_to_list(results, city, model, scenario))
+        return content
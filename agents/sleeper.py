@@ -8,7 +8,7 @@ from globals.errors import CustomTimeoutError
 class Sleeper:
 
     @staticmethod
-    def until_true(function: Callable, tick: float = 0.01, timeout: float = 5) -> None:
+    def until_true(function: Callable, tick: float = 0.01, timeout: float = 5) -> float:
         """
         Sleeps until a function returns True, checking it at fixed intervals, with a
         timeout.
@@ -21,16 +21,20 @@ class Sleeper:
 
         Raises:
             CustomTimeoutError: If timeout is reached before the function returns True.
+
+        Returns:
+            float: Time waited, in seconds.
         """
         start_time = time.perf_counter()
         while not function():
             if (time.perf_counter() - start_time) >= timeout:
                 raise CustomTimeoutError(timeout)
             time.sleep(tick)
+        return time.perf_counter() - start_time
 
     @staticmethod
     def until_file_is_available(
-            file_path: Path, tick: float = 0.01, timeout: float = 0.5) -> None:
+            file_path: Path, tick: float = 0.01, timeout: float = 0.5) -> float:
         """
         Sleeps until the specified file no longer raises errors when opened, with a timeout.
 
@@ -40,6 +44,9 @@ class Sleeper:
                 to 0.01.
             timeout (float, optional): Timeout after which an exception is thrown, in
                 seconds. Defaults to 0.5.
+
+        Returns:
+            float: Time waited, in seconds.
         """
         start_time = time.perf_counter()
         while True:
@@ -51,4 +58,4 @@ class Sleeper:
                 time.sleep(tick)
             else:
                 file.close()
-                break
+                return time.perf_counter() - start_time
@@ -0,0 +1,129 @@
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+from agents.tracer import PhaseTracer
+from globals.constants import FAKE_NETUNO_SPOOL_PATH
+from globals.utils import get_export_path
+
+logger = logging.getLogger("triton")
+
+
+class SpoolAutomator:
+    """
+    Drop-in replacement for `NetunoAutomator` that drives `fake_netuno.py` instead of the
+    Netuno 4 GUI: every simulation is requested by writing a JSON file to a spool directory,
+    which the fake process consumes, writing the results file where Netuno 4 would export
+    it. Keystrokes are not simulated, but the wait for Windows Explorer is, so the rest of
+    the pipeline (waits, parsing, saving and restarts) runs as it would with Netuno 4.
+    """
+
+    wait: float
+    tracer: PhaseTracer
+    spool_dir: Path
+    parameters: dict[str, float]
+    counter: int
+
+    def __init__(
+            self,
+            extra_wait: float,
+            tracer: PhaseTracer | None = None,
+            spool_dir: Path = FAKE_NETUNO_SPOOL_PATH) -> None:
+        """
+        Initializes the automator.
+
+        Args:
+            extra_wait (float): Wait before each (simulated) file selection, in tenths of a
+                second.
+            tracer (PhaseTracer | None, optional): Tracer of the phases of each iteration.
+                Defaults to None, in which case a new one is used.
+            spool_dir (Path, optional): Directory watched by the fake process. Defaults to
+                `globals.constants.FAKE_NETUNO_SPOOL_PATH`.
+        """
+        self.wait = extra_wait / 10
+        self.tracer = tracer or PhaseTracer()
+        self.spool_dir = spool_dir
+        self.parameters = {}
+        self.counter = 0
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+
+    def set_delays(self, keystroke_pause: float, explorer_wait: float) -> None:
+        """
+        Sets the delays used while automating, as `NetunoAutomator.set_delays()`. Only the
+        wait for Windows Explorer applies, since no keys are pressed.
+
+        Args:
+            keystroke_pause (float): Pause after every keystroke, in seconds (ignored).
+            explorer_wait (float): Wait before each file selection, in seconds.
+        """
+        self.wait = explorer_wait
+
+    def pop_responses(self) -> list[tuple[str, float]]:
+        """
+        Collects the response times measured since the last call, as
+        `NetunoAutomator.pop_responses()`. None are measured, since no window responds.
+
+        Returns:
+            list[tuple[str, float]]: Always empty.
+        """
+        return []
+
+    def _request_simulation(self, precipitation_path: Path, date: str) -> Path:
+        """
+        Writes a simulation request to the spool directory, atomically.
+
+        Args:
+            precipitation_path (Path): Path to the input file containing precipitation data.
+            date (str): Reference date for the file.
+
+        Returns:
+            Path: Path to the export file containing the simulation results.
+        """
+        export_path = get_export_path(precipitation_path)
+        with self.tracer.span("file_selection"):
+            time.sleep(self.wait)
+        with self.tracer.span("simulate_export"):
+            self.counter += 1
+            request_path = Path(self.spool_dir, f"{time.time_ns()}-{self.counter:08d}.json")
+            temporary_path = request_path.with_suffix(".tmp")
+            with open(temporary_path, "w", encoding="utf-8") as request_file:
+                json.dump({
+                    "precipitation_path": str(precipitation_path.resolve()),
+                    "date": date,
+                    "parameters": self.parameters,
+                    "output_path": str(export_path.resolve()),
+                }, request_file)
+            os.replace(temporary_path, request_path)
+        logger.debug(f"Requested simulation of '{precipitation_path.name}'")
+        return export_path
+
+    def run_first_simulation(
+            self, precipitation_path: Path, date: str, **parameters: float) -> Path:
+        """
+        Sets the simulation parameters and requests a simulation with the provided file.
+
+        Args:
+            precipitation_path (Path): Path to the input file containing precipitation data.
+            date (str): Reference date for the file.
+            **parameters (float): Simulation parameters, as in `SIMULATION_PARAMETERS`.
+
+        Returns:
+            Path: Path to the export file containing the simulation results.
+        """
+        self.parameters = parameters
+        return self._request_simulation(precipitation_path, date)
+
+    def run_simulation(self, precipitation_path: Path, date: str) -> Path:
+        """
+        Requests a simulation with the provided file, with the parameters already set.
+
+        Args:
+            precipitation_path (Path): Path to the input file containing precipitation data.
+            date (str): Reference date for the file.
+
+        Returns:
+            Path: Path to the export file containing the simulation results.
+        """
+        return self._request_simulation(precipitation_path, date)
@@ -0,0 +1,156 @@
+import logging
+import math
+from collections import defaultdict
+from collections.abc import Sequence
+from itertools import product
+
+import numpy as np
+
+from agents.simulator import NetunoSimulator
+from globals.constants import OUTPUT_COLUMNS, SIMULATION_PARAMETERS
+from globals.errors import InvalidSweepSpecificationError
+from globals.types import SweepResultTuple
+
+logger = logging.getLogger("triton")
+
+
+class ParameterSweep:
+    """
+    Runs the headless simulation for the Cartesian product of values given to one or more
+    simulation parameters, keeping the remaining ones from `SIMULATION_PARAMETERS`.
+
+    The precipitation series are parsed once and reused by every point of the grid, and
+    points are simulated together as extra columns of the same NumPy array.
+    """
+
+    values: dict[str, list[float]]
+
+    def __init__(self, values: dict[str, list[float]]) -> None:
+        """
+        Initializes the sweep.
+
+        Args:
+            values (dict[str, list[float]]): Dictionary mapping the names of the swept
+                parameters to the values they should assume.
+        """
+        self.values = values
+
+    @staticmethod
+    def _parse_values(text: str) -> list[float]:
+        """
+        Parses the values of a parameter, either a comma-separated list or an inclusive
+        range in the format 'start:stop:step'.
+
+        Args:
+            text (str): Values to be parsed.
+
+        Raises:
+            ValueError: If the values are not numbers or the range does not increase.
+
+        Returns:
+            list[float]: Parsed values.
+        """
+        if ":" not in text:
+            return [float(value) for value in text.split(",")]
+        start, stop, step = (float(value) for value in text.split(":"))
+        if step <= 0 or stop < start:
+            raise ValueError(f"Range '{text}' does not increase")
+        count = math.floor((stop - start) / step + 1e-9) + 1
+        return [start + index * step for index in range(count)]
+
+    @classmethod
+    def from_specifications(cls, specifications: Sequence[str]) -> "ParameterSweep":
+        """
+        Creates a sweep from specifications in the format 'name=v1,v2,...' or
+        'name=start:stop:step' (inclusive), where 'name' is a key of
+        `SIMULATION_PARAMETERS`.
+
+        Args:
+            specifications (Sequence[str]): Specification of each swept parameter.
+
+        Raises:
+            InvalidSweepSpecificationError: If any specification is malformed or refers to
+                an unknown parameter.
+
+        Returns:
+            ParameterSweep: New sweep over the given values.
+        """
+        values = {}
+        for specification in specifications:
+            name, _, text = specification.partition("=")
+            name = name.strip()
+            if name not in SIMULATION_PARAMETERS:
+                raise InvalidSweepSpecificationError(specification)
+            try:
+                values[name] = cls._parse_values(text)
+            except ValueError as exception:
+                raise InvalidSweepSpecificationError(specification) from exception
+        return cls(values)
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        """Output columns, with one extra column per swept parameter."""
+        return OUTPUT_COLUMNS + tuple(self.values)
+
+    def grid(self) -> list[dict[str, float]]:
+        """
+        Lists every combination of the swept values.
+
+        Returns:
+            list[dict[str, float]]: Values of the swept parameters for each point of the
+            grid.
+        """
+        return [
+            dict(zip(self.values, combination))
+            for combination in product(*self.values.values())
+        ]
+
+    def run(
+            self,
+            series: Sequence[np.ndarray],
+            identifiers: Sequence[tuple[str, str, str]],
+            max_columns: int) -> list[SweepResultTuple]:
+        """
+        Simulates every series for every point of the grid. Series of the same length are
+        stacked once and tiled for as many grid points as fit in `max_columns` columns.
+
+        Args:
+            series (Sequence[np.ndarray]): Daily precipitation values of each series, in mm.
+            identifiers (Sequence[tuple[str, str, str]]): City, model and scenario of each
+                series, in the same order.
+            max_columns (int): Maximum number of columns simulated at once. At least one
+                grid point is always simulated at a time.
+
+        Returns:
+            list[SweepResultTuple]: Results in the same format as
+            `NetunoSimulator.to_list()`, followed by the values of the swept parameters,
+            grouped by series and then by grid point.
+        """
+        grid = self.grid()
+        simulators = [NetunoSimulator(**SIMULATION_PARAMETERS | point) for point in grid]
+        results = [[None] * len(grid) for _ in series]
+
+        groups = defaultdict(list)
+        for index, precipitation in enumerate(series):
+            groups[len(precipitation)].append(index)
+        for length, indexes in groups.items():
+            batch = np.column_stack([series[index] for index in indexes])
+            points_per_run = max(1, max_columns // len(indexes))
+            for first_point in range(0, len(grid), points_per_run):
+                chunk = range(first_point, min(first_point + points_per_run, len(grid)))
+                logger.debug(
+                    f"Simulating {len(indexes)} series of {length} days for "
+                    f"{len(chunk)} grid point(s) at once")
+                stacked = NetunoSimulator.stack(
+                    [simulators[point] for point in chunk], len(indexes))
+                chunk_results = stacked.simulate_batch(np.tile(batch, (1, len(chunk))))
+                for column, result in enumerate(chunk_results):
+                    point = chunk[column // len(indexes)]
+                    results[indexes[column % len(indexes)]][point] = result
+
+        content = []
+        for series_results, identifier in zip(results, identifiers, strict=True):
+            for point, result in zip(grid, series_results):
+                for row in NetunoSimulator.results_to_list(result, *identifier):
+                    content.append(row + tuple(point.values()))
+        return content
@@ -0,0 +1,150 @@
+import json
+import logging
+from collections import deque
+from pathlib import Path
+
+from globals.constants import (
+    TIMING_BACKOFF_FACTOR, TIMING_LATENCY_FACTOR, TIMING_LATENCY_WINDOW, TIMING_LIMITS,
+    TIMING_SHRINK_FACTOR)
+from globals.utils import saturate
+
+logger = logging.getLogger("triton")
+
+
+class AdaptiveTimer:
+    """
+    Controls the delays used while automating Netuno 4: the pause after every keystroke and
+    the wait before pasting paths into Windows Explorer.
+
+    When adaptive, each delay follows how long Netuno 4 takes to respond to the step it
+    covers, as measured by the automator: after every successful simulation, it is set to
+    the slowest of the last `TIMING_LATENCY_WINDOW` response times of the step, times a
+    margin. Every failure (a results file that is never written, Netuno 4 not responding or
+    results of other inputs than the ones entered, after a lost keystroke) doubles the
+    margin and backs off every delay, and every success relaxes the margin again, down to
+    `TIMING_LATENCY_FACTOR`. Delays stay within the limits of `TIMING_LIMITS`, but initial
+    delays below those limits (e.g. given by the user) are respected as the lower limit
+    instead. Learned delays can be saved to a profile file, which is reused by the next run.
+    """
+
+    delays: dict[str, float]
+    floors: dict[str, float]
+    adaptive: bool
+    latencies: dict[str, deque[float]]
+    margin: float
+
+    def __init__(self, delays: dict[str, float], adaptive: bool) -> None:
+        """
+        Initializes the timer.
+
+        Args:
+            delays (dict[str, float]): Initial delay of each step in `TIMING_LIMITS`, in
+                seconds.
+            adaptive (bool): Whether delays change according to the outcome of simulations.
+        """
+        self.delays = dict(delays)
+        self.floors = {
+            step: min(delay, TIMING_LIMITS[step][0]) for step, delay in delays.items()}
+        self.adaptive = adaptive
+        self.latencies = {step: deque(maxlen=TIMING_LATENCY_WINDOW) for step in delays}
+        self.margin = TIMING_LATENCY_FACTOR
+
+    @classmethod
+    def from_profile(
+            cls, profile_path: Path, default_delays: dict[str, float]) -> "AdaptiveTimer":
+        """
+        Creates an adaptive timer with the delays saved to a profile file, or the default
+        ones if the file does not exist or cannot be read.
+
+        Args:
+            profile_path (Path): Path to the profile file.
+            default_delays (dict[str, float]): Delays used for steps missing from the
+                profile, in seconds.
+
+        Returns:
+            AdaptiveTimer: New adaptive timer.
+        """
+        try:
+            with open(profile_path, encoding="utf-8") as profile_file:
+                profile = json.load(profile_file)
+        except FileNotFoundError:
+            return cls(default_delays, adaptive=True)
+        except (OSError, ValueError) as exception:
+            logger.warning(
+                f"Ignoring unreadable timing profile '{profile_path}'. "
+                f"Details: {exception}")
+            return cls(default_delays, adaptive=True)
+        timer = cls(default_delays, adaptive=True)
+        timer.delays |= {
+            step: float(delay)
+            for step, delay in profile.get("delays", {}).items() if step in default_delays}
+        timer.margin = max(TIMING_LATENCY_FACTOR, float(profile.get("margin", 0)))
+        logger.info(f"Loaded timing profile from '{profile_path}': {timer.describe()}")
+        return timer
+
+    def save_profile(self, profile_path: Path) -> None:
+        """
+        Saves the current delays and margin to a profile file.
+
+        Args:
+            profile_path (Path): Path to the profile file.
+        """
+        with open(profile_path, "w", encoding="utf-8") as profile_file:
+            json.dump(
+                {"delays": self.delays, "margin": self.margin},
+                profile_file,
+                indent=4)
+
+    def measure(self, step: str, latency: float) -> None:
+        """
+        Records how long Netuno 4 took to respond to a step.
+
+        Args:
+            step (str): Step whose delay covers the response, in `TIMING_LIMITS`.
+            latency (float): Response time, in seconds.
+        """
+        if step in self.latencies:
+            self.latencies[step].append(latency)
+
+    def record_success(self) -> None:
+        """
+        Relaxes the margin after a successful simulation, then sets the delay of every
+        measured step to its slowest recent response time, times the margin, if adaptive.
+        """
+        if not self.adaptive:
+            return
+        self.margin = max(TIMING_LATENCY_FACTOR, self.margin * TIMING_SHRINK_FACTOR)
+        for step, latencies in self.latencies.items():
+            if latencies:
+                self.delays[step] = saturate(
+                    max(latencies) * self.margin, self.floors[step], TIMING_LIMITS[step][1])
+
+    def record_failure(self) -> None:
+        """
+        Widens the margin and backs off every delay after a failed simulation, if adaptive.
+        """
+        if not self.adaptive:
+            return
+        self.margin *= TIMING_BACKOFF_FACTOR
+        self._scale(TIMING_BACKOFF_FACTOR)
+        logger.info(f"Backing off delays after a failure: {self.describe()}")
+
+    def _scale(self, factor: float) -> None:
+        """
+        Multiplies every delay by a factor, within the limits of each step, if adaptive.
+        Delays already above the upper limit (e.g. given by the user) never increase, and
+        initial delays below the lower limit are kept as the lower limit.
+
+        Args:
+            factor (float): Factor applied to the delays.
+        """
+        if not self.adaptive:
+            return
+        for step, delay in self.delays.items():
+            upper_limit = TIMING_LIMITS[step][1]
+            self.delays[step] = saturate(
+                delay * factor, self.floors[step], max(upper_limit, delay))
+
+    def describe(self) -> str:
+        """Describes the current delays, for logging."""
+        return ", ".join(f"{step}={delay:.3f}s" for step, delay in self.delays.items())
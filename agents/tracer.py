@@ -0,0 +1,129 @@
+import json
+import logging
+import math
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TextIO
+
+logger = logging.getLogger("triton")
+
+
+class PhaseTracer:
+    """
+    Measures how long each phase of every iteration takes (e.g. selecting files, waiting for
+    results, parsing them), keeping the durations in memory for an end-of-run report and,
+    optionally, writing every span to a JSONL trace file as soon as it ends.
+    """
+
+    durations: defaultdict[str, list[float]]
+    iteration: int
+    start_time: float
+    trace_file: TextIO | None
+    lock: threading.Lock
+
+    def __init__(self, trace_path: Path | None = None) -> None:
+        """
+        Initializes the tracer.
+
+        Args:
+            trace_path (Path | None, optional): Path to the JSONL trace file, which is
+                overwritten. Defaults to None, in which case no file is written.
+        """
+        self.durations = defaultdict(list)
+        self.iteration = 0
+        self.start_time = time.perf_counter()
+        self.trace_file = None
+        self.lock = threading.Lock()
+        if trace_path:
+            self.trace_file = open(trace_path, "w", encoding="utf-8", buffering=1)
+
+    def record(
+            self,
+            phase: str,
+            duration: float,
+            start: float | None = None,
+            iteration: int | None = None) -> None:
+        """
+        Records a span of a phase that was measured elsewhere. Spans may be recorded from
+        more than one thread, in which case threads other than the one that advances
+        `iteration` must give the iteration of their spans.
+
+        Args:
+            phase (str): Name of the phase.
+            duration (float): Duration of the span, in seconds.
+            start (float | None, optional): Value of `time.perf_counter()` when the span
+                started. Defaults to None, in which case it is assumed to end now.
+            iteration (int | None, optional): Iteration of the span. Defaults to None, in
+                which case the current iteration is used.
+        """
+        if start is None:
+            start = time.perf_counter() - duration
+        with self.lock:
+            self.durations[phase].append(duration)
+            if self.trace_file is None:
+                return
+            self.trace_file.write(json.dumps({
+                "iteration": self.iteration if iteration is None else iteration,
+                "phase": phase,
+                "start": round(start - self.start_time, 6),
+                "duration": round(duration, 6)
+            }) + "\n")
+
+    @contextmanager
+    def span(self, phase: str, iteration: int | None = None) -> Iterator[None]:
+        """
+        Measures the span of a phase, as a context manager. Spans interrupted by exceptions
+        are recorded as well.
+
+        Args:
+            phase (str): Name of the phase.
+            iteration (int | None, optional): Iteration of the span. Defaults to None, in
+                which case the current iteration is used.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start, start, iteration)
+
+    @staticmethod
+    def _percentile(sorted_values: list[float], percent: float) -> float:
+        """
+        Computes a percentile with the nearest-rank method.
+
+        Args:
+            sorted_values (list[float]): Values in ascending order, at least one.
+            percent (float): Percentile to be computed, between 0 and 100.
+
+        Returns:
+            float: Smallest value greater than or equal to `percent`% of the values.
+        """
+        rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+        return sorted_values[rank - 1]
+
+    def report(self) -> list[str]:
+        """
+        Summarizes the durations of every phase, in the order they were first recorded.
+
+        Returns:
+            list[str]: Lines of a table with count, total, p50, p95 and max duration (in
+            seconds) of each phase.
+        """
+        lines = [f"{'phase':<16}{'count':>7}{'total':>10}{'p50':>9}{'p95':>9}{'max':>9}"]
+        for phase, durations in self.durations.items():
+            values = sorted(durations)
+            lines.append(
+                f"{phase:<16}{len(values):>7}{sum(values):>10.3f}"
+                f"{self._percentile(values, 50):>9.3f}{self._percentile(values, 95):>9.3f}"
+                f"{values[-1]:>9.3f}")
+        return lines
+
+    def close(self) -> None:
+        """Closes the trace file, if any."""
+        if self.trace_file:
+            self.trace_file.close()
+            self.trace_file = None
@@ -1,9 +1,15 @@
+import re
 from pathlib import Path
 
+from agents.discovery import InputDiscovery
+from agents.sweep import ParameterSweep
+from globals.constants import NETUNO_ENGINES
 from globals.errors import (
-    InvalidNetunoExecutableError, InvalidPartialSaveAttributeError,
-    InvalidRestartAttributeError, InvalidSourceDirectoryError, InvalidWaitAttributeError,
-    MissingInputDataError)
+    IncompatibleEngineError, IncompatibleFormatError, InvalidBatchSizeError,
+    InvalidCacheSizeError, InvalidFlushThresholdError, InvalidNetunoExecutableError,
+    InvalidPartialSaveAttributeError, InvalidRestartAttributeError, InvalidResumeFileError,
+    InvalidSourceDirectoryError, InvalidStartupTimeoutError, InvalidWaitAttributeError,
+    InvalidWorkersError, MissingInputDataError)
 
 
 class CommandLineArgsValidator:
@@ -16,6 +22,43 @@ class CommandLineArgsValidator:
     save_every: int
     wait: float
     restart_every: int
+    engine: str
+    batch_size: int
+    sweep: list[str] | None
+    workers: int
+    resume: Path | None
+    cache: Path | None
+    cache_size: int
+    startup_probe: str
+    startup_timeout: float
+    flush_rows: int | None
+    flush_interval: float | None
+    output_format: str
+    index: Path | None
+    input_dirs: list[Path] | None
+    recursive: bool
+    include: list[str] | None
+    exclude: list[str] | None
+    city: re.Pattern | None
+    model: re.Pattern | None
+    scenario: re.Pattern | None
+
+    def discover_inputs(self) -> InputDiscovery:
+        """
+        Creates the discovery of input files in every precipitation directory, according
+        to the given recursion and filters.
+
+        Returns:
+            InputDiscovery: Discovery of the input files.
+        """
+        return InputDiscovery(
+            [self.precipitation_dir_path, *(self.input_dirs or [])],
+            self.recursive,
+            self.include or [],
+            self.exclude or [],
+            self.city,
+            self.model,
+            self.scenario)
 
     def _validate_netuno_path(self) -> None:
         """
@@ -29,18 +72,18 @@ class CommandLineArgsValidator:
 
     def _validate_precipitation_path(self) -> None:
         """
-        Validates the path to a directory containing CSV files with precipitation data,
-        checking if it actually is a directory and contains at least 1 CSV file.
+        Validates the paths to the directories containing CSV files with precipitation data,
+        checking if they actually are directories and contain at least 1 CSV file (that
+        passes the given filters), stopping at the first one found.
 
         Raises:
-            InvalidSourceDirectoryError: If the given path is not a directory.
-            MissingInputDataError: If the directory contains no CSV files.
-        """
-        if not self.precipitation_dir_path.is_dir():
-            raise InvalidSourceDirectoryError(self.precipitation_dir_path)
-        if not any(
-                file for file in self.precipitation_dir_path.iterdir()
-                if ".csv" == file.suffix.casefold()):
+            InvalidSourceDirectoryError: If any given path is not a directory.
+            MissingInputDataError: If the directories contain no matching CSV files.
+        """
+        for directory in [self.precipitation_dir_path, *(self.input_dirs or [])]:
+            if not directory.is_dir():
+                raise InvalidSourceDirectoryError(directory)
+        if next(iter(self.discover_inputs()), None) is None:
             raise MissingInputDataError(self.precipitation_dir_path)
 
     def _validate_save_every_n(self) -> None:
@@ -73,10 +116,122 @@ class CommandLineArgsValidator:
         if self.restart_every <= 0:
             raise InvalidRestartAttributeError(self.restart_every)
 
+    def _validate_startup_timeout(self) -> None:
+        """
+        Validates the maximum time to wait for Netuno to be ready, which should be greater
+        than 0.
+
+        Raises:
+            InvalidStartupTimeoutError: If the given value is less than or equal to 0.
+        """
+        if self.startup_timeout <= 0:
+            raise InvalidStartupTimeoutError(self.startup_timeout)
+
+    def _validate_batch_size(self) -> None:
+        """
+        Validates the value of the batch size attribute, which should be greater than 0.
+
+        Raises:
+            InvalidBatchSizeError: If the given value is less than or equal to 0.
+        """
+        if self.batch_size <= 0:
+            raise InvalidBatchSizeError(self.batch_size)
+
+    def _validate_sweep(self) -> None:
+        """
+        Validates the parameter sweep specifications, if any, which are only supported by
+        the headless engines.
+
+        Raises:
+            IncompatibleEngineError: If the engine is not headless.
+            InvalidSweepSpecificationError: If any specification is malformed.
+        """
+        if not self.sweep:
+            return
+        if self.engine in NETUNO_ENGINES:
+            raise IncompatibleEngineError("--sweep", self.engine)
+        ParameterSweep.from_specifications(self.sweep)
+
+    def _validate_workers(self) -> None:
+        """
+        Validates the number of worker processes, which should be greater than 0. More than
+        one worker is only supported by the headless engines.
+
+        Raises:
+            InvalidWorkersError: If the given value is less than or equal to 0.
+            IncompatibleEngineError: If there is more than one worker and the engine is not
+                headless.
+        """
+        if self.workers <= 0:
+            raise InvalidWorkersError(self.workers)
+        if self.workers > 1 and self.engine in NETUNO_ENGINES:
+            raise IncompatibleEngineError("--workers", self.engine)
+
+    def _validate_resume_path(self) -> None:
+        """
+        Validates the path to the output file of the run to be resumed, if any, checking if
+        it actually is a file.
+
+        Raises:
+            InvalidResumeFileError: If the given path is not a file.
+        """
+        if self.resume and not self.resume.is_file():
+            raise InvalidResumeFileError(self.resume)
+
+    def _validate_cache(self) -> None:
+        """
+        Validates the maximum size of the result cache, which should be greater than 0. The
+        cache is only supported by the 'netuno' (and 'fake') engine.
+
+        Raises:
+            InvalidCacheSizeError: If the given size is less than or equal to 0.
+            IncompatibleEngineError: If the cache is enabled and the engine is headless.
+        """
+        if self.cache_size <= 0:
+            raise InvalidCacheSizeError(self.cache_size)
+        if self.cache and self.engine not in NETUNO_ENGINES:
+            raise IncompatibleEngineError("--cache", self.engine)
+
+    def _validate_flush_thresholds(self) -> None:
+        """
+        Validates the number of rows and the interval after which results are saved, if
+        given, both of which should be greater than 0.
+
+        Raises:
+            InvalidFlushThresholdError: If any given value is less than or equal to 0.
+        """
+        if self.flush_rows is not None and self.flush_rows <= 0:
+            raise InvalidFlushThresholdError("--flush-rows", self.flush_rows)
+        if self.flush_interval is not None and self.flush_interval <= 0:
+            raise InvalidFlushThresholdError("--flush-interval", self.flush_interval)
+
+    def _validate_output_format(self) -> None:
+        """
+        Validates the format of the output file. Parquet files can only be read once the
+        run ends, so runs writing them cannot be resumed.
+
+        Raises:
+            IncompatibleFormatError: If a run is resumed and the format is 'parquet'.
+        """
+        if self.resume and self.output_format == "parquet":
+            raise IncompatibleFormatError("--resume", self.output_format)
+
     def validate_arguments(self) -> None:
-        """Executes all validation methods from the class."""
-        self._validate_netuno_path()
+        """
+        Executes all validation methods from the class. The Netuno executable is only
+        validated when the simulations are run through it (or through its stand-in).
+        """
+        if self.engine in NETUNO_ENGINES:
+            self._validate_netuno_path()
         self._validate_precipitation_path()
         self._validate_save_every_n()
         self._validate_wait()
         self._validate_restart_every_n()
+        self._validate_startup_timeout()
+        self._validate_batch_size()
+        self._validate_sweep()
+        self._validate_workers()
+        self._validate_resume_path()
+        self._validate_cache()
+        self._validate_flush_thresholds()
+        self._validate_output_format()
@@ -0,0 +1,255 @@
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+from watchdog.events import (
+    EVENT_TYPE_CLOSED, EVENT_TYPE_CREATED, EVENT_TYPE_MODIFIED, EVENT_TYPE_MOVED,
+    FileSystemEvent, FileSystemEventHandler)
+from watchdog.observers import Observer
+
+from agents.sleeper import Sleeper
+from globals.constants import (
+    RESULTS_FILE_RECHECK_INTERVAL, RESULTS_FILE_STABLE_TIME, RESULTS_FILE_TIMEOUT)
+from globals.errors import CustomTimeoutError
+
+logger = logging.getLogger("triton")
+
+WAKING_EVENTS = {
+    EVENT_TYPE_CLOSED, EVENT_TYPE_CREATED, EVENT_TYPE_MODIFIED, EVENT_TYPE_MOVED}
+
+
+class _ResultEventHandler(FileSystemEventHandler):
+    """Records the files closed in the watched directory and wakes up waiting threads."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.changed = threading.Event()
+        self.closed: set[str] = set()
+        self.lock = threading.Lock()
+
+    def on_any_event(self, event: FileSystemEvent) -> None:
+        if event.event_type not in WAKING_EVENTS:
+            return
+        path = event.dest_path if event.event_type == EVENT_TYPE_MOVED else event.src_path
+        if event.event_type in (EVENT_TYPE_CLOSED, EVENT_TYPE_MOVED):
+            with self.lock:
+                self.closed.add(str(Path(path).resolve()))
+        self.changed.set()
+
+
+class ResultWatcher:
+    """
+    Waits for the results files exported by Netuno 4 to be written, reacting to file system
+    events in their directory (through `watchdog`) instead of polling it.
+
+    Where the backend reports files being closed (inotify, on Linux), a results file is
+    only considered written after it is closed. Elsewhere, it is considered written once it
+    can be opened and its size did not change for `RESULTS_FILE_STABLE_TIME` seconds, across
+    two checks. Files outside the watched directory, or every file when the directory
+    cannot be watched, are polled with `Sleeper` instead. A file left over from before the
+    simulation (see `expect()`) is never considered written until it is written again.
+    """
+
+    directory: Path
+    handler: _ResultEventHandler
+    observer: Observer | None
+    reports_close: bool
+    sizes: dict[str, tuple[int, float]]
+    stale: dict[str, tuple[int, int]]
+
+    def __init__(self, directory: Path) -> None:
+        """
+        Initializes the watcher, which only starts watching after `start()`.
+
+        Args:
+            directory (Path): Directory where the results files are exported.
+        """
+        self.directory = directory.resolve()
+        self.handler = _ResultEventHandler()
+        self.observer = None
+        self.reports_close = sys.platform.startswith("linux")
+        self.sizes = {}
+        self.stale = {}
+
+    def start(self) -> None:
+        """Starts watching the directory, falling back to polling if it is not possible."""
+        observer = Observer()
+        try:
+            observer.schedule(self.handler, str(self.directory), recursive=False)
+            observer.start()
+        except OSError as exception:
+            logger.warning(
+                f"Unable to watch directory '{self.directory}', polling it instead. "
+                f"Details: {exception}")
+            return
+        self.observer = observer
+
+    def stop(self) -> None:
+        """Stops watching the directory, if it was being watched."""
+        if self.observer:
+            self.observer.stop()
+            self.observer.join()
+            self.observer = None
+
+    @staticmethod
+    def _can_open(file_path: Path) -> bool:
+        """
+        Checks whether a file exists and can be opened.
+
+        Args:
+            file_path (Path): Path to the file to be checked.
+
+        Returns:
+            bool: Whether the file could be opened.
+        """
+        try:
+            with open(file_path):
+                return True
+        except OSError:
+            return False
+
+    def expect(self, file_path: Path) -> None:
+        """
+        Forgets what was seen of a results file (its close events and size) before the
+        simulation that writes it is triggered, and records the inode and modification time
+        of any file already at its path, so an earlier write of a file with the same name
+        (e.g. before Netuno 4 was restarted) is not taken for the new one.
+
+        Args:
+            file_path (Path): Path to the results file.
+        """
+        key = str(file_path.resolve())
+        with self.handler.lock:
+            self.handler.closed.discard(key)
+        self.sizes.pop(key, None)
+        try:
+            stat = file_path.stat()
+        except OSError:
+            self.stale.pop(key, None)
+        else:
+            self.stale[key] = (stat.st_ino, stat.st_mtime_ns)
+
+    def _is_stale(self, file_path: Path, stat: os.stat_result) -> bool:
+        """
+        Checks whether a file is the same one found when it was expected, i.e. it was left
+        over from before and was not written again since then.
+
+        Args:
+            file_path (Path): Path to the file to be checked.
+            stat (os.stat_result): Current status of the file.
+
+        Returns:
+            bool: Whether the file has the same inode and modification time as then.
+        """
+        return (stat.st_ino, stat.st_mtime_ns) == self.stale.get(str(file_path))
+
+    def _is_stable(self, file_path: Path) -> bool:
+        """
+        Checks whether a file can be opened and its size did not change since it was first
+        seen with that size, at least `RESULTS_FILE_STABLE_TIME` seconds ago. A file with
+        the same inode and modification time as when it was expected is left over from
+        before, so it is never stable.
+
+        Args:
+            file_path (Path): Path to the file to be checked.
+
+        Returns:
+            bool: Whether the file seems to be completely written.
+        """
+        key = str(file_path)
+        try:
+            stat = file_path.stat()
+        except OSError:
+            self.sizes.pop(key, None)
+            return False
+        if self._is_stale(file_path, stat):
+            return False
+        size = stat.st_size
+        now = time.perf_counter()
+        seen_size, seen_time = self.sizes.setdefault(key, (size, now))
+        if size != seen_size:
+            self.sizes[key] = (size, now)
+            return False
+        return now - seen_time >= RESULTS_FILE_STABLE_TIME and self._can_open(file_path)
+
+    def _is_written(self, file_path: Path) -> bool:
+        """
+        Checks whether a watched results file was written, consuming its close event.
+
+        Args:
+            file_path (Path): Path to the results file.
+
+        Returns:
+            bool: Whether the file was written.
+        """
+        if not self.reports_close:
+            return self._is_stable(file_path)
+        with self.handler.lock:
+            if str(file_path) not in self.handler.closed:
+                return False
+            self.handler.closed.discard(str(file_path))
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return False
+        return not self._is_stale(file_path, stat) and self._can_open(file_path)
+
+    def wait_for(self, file_path: Path, timeout: float = RESULTS_FILE_TIMEOUT) -> float:
+        """
+        Sleeps until a results file is written, waking up on file system events, with a
+        timeout. If no events arrive for `RESULTS_FILE_RECHECK_INTERVAL` seconds (e.g. an
+        event was missed), a file whose size is stable is considered written.
+
+        Args:
+            file_path (Path): Path to the results file.
+            timeout (float, optional): Timeout after which an exception is thrown, in
+                seconds. Defaults to `globals.constants.RESULTS_FILE_TIMEOUT`.
+
+        Raises:
+            CustomTimeoutError: If timeout is reached before the file is written.
+
+        Returns:
+            float: Time waited, in seconds.
+        """
+        file_path = file_path.resolve()
+        try:
+            if self.observer is None or file_path.parent != self.directory:
+                return Sleeper.until_true(
+                    lambda: self._is_stable(file_path), timeout=timeout)
+            return self._wait_for_events(file_path, timeout)
+        finally:
+            self.sizes.pop(str(file_path), None)
+            self.stale.pop(str(file_path), None)
+
+    def _wait_for_events(self, file_path: Path, timeout: float) -> float:
+        """
+        Sleeps until a watched results file is written, as `wait_for()`.
+
+        Args:
+            file_path (Path): Resolved path to the results file.
+            timeout (float): Timeout after which an exception is thrown, in seconds.
+
+        Raises:
+            CustomTimeoutError: If timeout is reached before the file is written.
+
+        Returns:
+            float: Time waited, in seconds.
+        """
+        recheck_interval = RESULTS_FILE_RECHECK_INTERVAL
+        if not self.reports_close:
+            recheck_interval = RESULTS_FILE_STABLE_TIME
+        start_time = time.perf_counter()
+        while True:
+            self.handler.changed.clear()
+            if self._is_written(file_path):
+                break
+            remaining = timeout - (time.perf_counter() - start_time)
+            if remaining <= 0:
+                raise CustomTimeoutError(timeout)
+            interval = min(remaining, recheck_interval)
+            if not self.handler.changed.wait(interval) and self._is_stable(file_path):
+                break
+        return time.perf_counter() - start_time
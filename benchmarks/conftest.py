@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import pytest
+
+from agents.parsers import PrecipitationParser
+from fake_netuno import render_results
+from globals.constants import SIMULATION_OUTPUT_ATTRIBUTES, SIMULATION_PARAMETERS
+
+PATH_TO_PRECIPITATION_DIR = Path(__file__).parent.parent / "example"
+
+
+def pytest_ignore_collect(collection_path: Path, config: pytest.Config) -> bool | None:
+    """
+    Leaves benchmarks out of regular test runs, which would take much longer with them.
+    They are only collected with `--benchmark-only`, which requires `pytest-benchmark`.
+    """
+    if not config.pluginmanager.hasplugin("benchmark"):
+        return True
+    if not config.getoption("benchmark_only"):
+        return True
+    return None
+
+
+@pytest.fixture(scope="session")
+def precipitation_files() -> list[Path]:
+    """Precipitation files of the example directory, with 12419 days each."""
+    return sorted(PATH_TO_PRECIPITATION_DIR.iterdir())
+
+
+@pytest.fixture(scope="session")
+def exports(precipitation_files: list[Path]) -> dict[Path, str]:
+    """Contents of the results file exported by Netuno 4 for each precipitation file."""
+    return {
+        file: render_results(
+            file, PrecipitationParser(file).to_list(), "01/01/1980", SIMULATION_PARAMETERS)
+        for file in precipitation_files
+    }
+
+
+@pytest.fixture(scope="session")
+def export_path(
+        tmp_path_factory: pytest.TempPathFactory,
+        precipitation_files: list[Path],
+        exports: dict[Path, str]) -> Path:
+    """Path to a real-size results file, as exported by Netuno 4."""
+    path = tmp_path_factory.mktemp("exports") / "export.out.csv"
+    path.write_text(
+        exports[precipitation_files[0]], encoding=SIMULATION_OUTPUT_ATTRIBUTES["encoding"])
+    return path
@@ -0,0 +1,15 @@
+from pathlib import Path
+
+from agents.declutter import Declutter
+
+FILE_COUNT = 10_000
+
+
+def test_declutter_clear_results_files(benchmark, tmp_path: Path):
+    def setup():
+        for index in range(FILE_COUNT):
+            (tmp_path / f"{index}.out.csv").touch()
+
+    declutter = Declutter(tmp_path)
+    assert benchmark.pedantic(declutter.clear_results_files, setup=setup, rounds=5)
+    assert not any(tmp_path.iterdir())
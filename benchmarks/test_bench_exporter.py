@@ -0,0 +1,34 @@
+from pathlib import Path
+
+import pytest
+
+from agents.exporter import CSVExporter
+from agents.simulator import NetunoSimulator
+from globals.constants import SIMULATION_PARAMETERS
+
+FILE_COUNT = 1_000
+
+
+@pytest.mark.parametrize("save_every", (1, 10, 100, FILE_COUNT))
+def test_csv_exporter_save_results(benchmark, tmp_path: Path, save_every: int):
+    results = NetunoSimulator(**SIMULATION_PARAMETERS).to_list(
+        [5.0, 0.0, 12.5] * 100, "Florianópolis", "ACCESS-CM2", "Histórico")
+    rounds = iter(range(10))
+
+    def setup():
+        exporter = CSVExporter(tmp_path / str(next(rounds)))
+        exporter.output_path.parent.mkdir()
+        return (exporter,), {}
+
+    def export(exporter: CSVExporter):
+        for counter in range(1, FILE_COUNT + 1):
+            exporter.add_results(results)
+            if counter % save_every == 0:
+                exporter.save_results()
+        exporter.save_results()
+        exporter.close()
+        return exporter.output_path
+
+    output_path = benchmark.pedantic(export, setup=setup, rounds=10)
+    with open(output_path, encoding="utf-8") as output_file:
+        assert sum(1 for _ in output_file) == 1 + 7 * FILE_COUNT
@@ -0,0 +1,27 @@
+from pathlib import Path
+
+from agents.parsers import FileNameParser, ResultParser
+from globals.constants import INITIAL_DATES
+
+NAME_COUNT = 100_000
+CITIES = ("Belo Horizonte", "Florianópolis", "Rio de Janeiro", "São Paulo", "Vitória")
+MODELS = ("ACCESS-CM2", "GFDL-CM4", "INM-CM4_8", "MRI-ESM2")
+
+
+def test_result_parser_to_list(benchmark, export_path: Path):
+    results = benchmark(
+        lambda: ResultParser(export_path).to_list(
+            "Florianópolis", "ACCESS-CM2", "Histórico"))
+    assert len(results) == 7
+
+
+def test_file_name_parser_get_metadata(benchmark):
+    scenarios = tuple(INITIAL_DATES)
+    names = [
+        Path(
+            f"(Netuno){CITIES[index % len(CITIES)]}_{MODELS[index % len(MODELS)]}_"
+            f"{scenarios[index % len(scenarios)]}.csv")
+        for index in range(NAME_COUNT)]
+    metadata = benchmark.pedantic(
+        lambda: [FileNameParser.get_metadata(name) for name in names], rounds=5)
+    assert len(metadata) == NAME_COUNT
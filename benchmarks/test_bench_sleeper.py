@@ -0,0 +1,22 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from agents.sleeper import Sleeper
+
+CONDITION_DELAY = 0.005
+
+
+@pytest.mark.parametrize("tick", (0.001, 0.01))
+def test_sleeper_until_true_wake_up(benchmark, tick: float):
+    """Time from the call until the return, for a condition that holds after 5 ms."""
+    def wait():
+        deadline = time.perf_counter() + CONDITION_DELAY
+        return Sleeper.until_true(lambda: time.perf_counter() >= deadline, tick)
+
+    assert benchmark.pedantic(wait, rounds=50) >= CONDITION_DELAY
+
+
+def test_sleeper_until_file_is_available(benchmark, export_path: Path):
+    assert benchmark(Sleeper.until_file_is_available, export_path) < 0.5
@@ -0,0 +1,101 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from agents.exporter import CSVExporter
+from agents.manager import ProcessManager
+from agents.tracer import PhaseTracer
+from agents.validators import CommandLineArgsValidator
+from globals.constants import NETUNO_RESULTS_PATH, SIMULATION_OUTPUT_ATTRIBUTES
+from triton import main
+
+COPIES = 10
+
+
+class StubAutomator:
+    """Writes the results of each simulation at once, as if Netuno 4 took no time."""
+
+    def __init__(self, exports: dict[str, str], tracer: PhaseTracer) -> None:
+        self.exports = exports
+        self.tracer = tracer
+
+    def set_delays(self, keystroke_pause: float, explorer_wait: float) -> None:
+        pass
+
+    def run_first_simulation(self, precipitation_path: Path, date: str, **parameters):
+        return self.run_simulation(precipitation_path, date)
+
+    def run_simulation(self, precipitation_path: Path, date: str) -> Path:
+        export_path = Path(
+            NETUNO_RESULTS_PATH, precipitation_path.stem).with_suffix(".out.csv")
+        export_path.write_text(
+            self.exports[precipitation_path.name],
+            encoding=SIMULATION_OUTPUT_ATTRIBUTES["encoding"])
+        return export_path
+
+
+@pytest.fixture
+def args(tmp_path: Path, precipitation_files: list[Path]) -> CommandLineArgsValidator:
+    input_dir = tmp_path / "precipitation"
+    input_dir.mkdir()
+    for copy in range(COPIES):
+        for file in precipitation_files:
+            shutil.copy(file, input_dir / file.name.replace("(Netuno)", f"(Netuno{copy})"))
+    args = CommandLineArgsValidator()
+    args.netuno_exe_path = tmp_path / "netuno.exe"
+    args.precipitation_dir_path = input_dir
+    args.quiet = 2
+    args.verbose = False
+    args.wait = 0
+    args.clean = True
+    args.save_every = 10
+    args.restart_every = 1_000
+    args.restart_policy = "fixed"
+    args.engine = "netuno"
+    args.resume = None
+    args.cache = None
+    args.cache_size = 100
+    args.adaptive_timing = None
+    args.trace = None
+    args.archive = None
+    args.keystroke_plans = False
+    args.flush_rows = None
+    args.flush_interval = None
+    args.output_format = "csv"
+    args.layout = "long"
+    args.index = None
+    args.input_dirs = None
+    args.recursive = False
+    args.include = None
+    args.exclude = None
+    args.city = None
+    args.model = None
+    args.scenario = None
+    return args
+
+
+def test_main_with_stub_automator(
+        benchmark,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+        args: CommandLineArgsValidator,
+        exports: dict[Path, str]):
+    monkeypatch.chdir(tmp_path)
+    exports_by_name = {
+        file.name.replace("(Netuno)", f"(Netuno{copy})"): contents
+        for file, contents in exports.items() for copy in range(COPIES)}
+    monkeypatch.setattr(
+        "triton.create_automator",
+        lambda args, tracer: StubAutomator(exports_by_name, tracer))
+    output_path = tmp_path / "bench-consolidated.csv"
+    monkeypatch.setattr(
+        CSVExporter, "_get_base_file_name", lambda self: str(output_path))
+
+    def setup():
+        output_path.unlink(missing_ok=True)
+        return (args, ProcessManager(0)), {}
+
+    benchmark.pedantic(main, setup=setup, rounds=5)
+    with open(output_path, encoding="utf-8") as output_file:
+        assert sum(1 for _ in output_file) == 1 + 7 * COPIES * len(exports)
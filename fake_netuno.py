@@ -0,0 +1,216 @@
+import json
+import logging
+import os
+import time
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+
+from agents.parsers import PrecipitationParser
+from agents.simulator import NetunoSimulator
+from globals.constants import (
+    FAKE_NETUNO_POLL_INTERVAL, FAKE_NETUNO_SPOOL_PATH, SIMULATION_OUTPUT_ATTRIBUTES,
+    SIMULATION_RESULT_LABELS, SIMULATION_RESULT_UNITS)
+
+logger = logging.getLogger("fake_netuno")
+
+PRECIPITATION_CHUNK_SIZE = 10_000
+
+
+def format_value(metric: str, value: float) -> str:
+    """
+    Formats a result the way Netuno 4 exports it: percentages with a dot and two decimal
+    places, other values with a comma and four.
+
+    Args:
+        metric (str): Name of the metric, as in `SIMULATION_RESULT_LABELS`.
+        value (float): Value of the metric.
+
+    Returns:
+        str: Formatted value.
+    """
+    if SIMULATION_RESULT_UNITS[metric] == "%":
+        return f"{value:.2f}"
+    return f"{value:.4f}".replace(".", ",")
+
+
+def render_results(
+        precipitation_path: Path,
+        precipitation: list[float],
+        date: str,
+        parameters: dict[str, float]) -> str:
+    """
+    Simulates a precipitation series and renders the contents of a results file in the
+    format exported by Netuno 4: the precipitation data, the parameters and, after the
+    start of results label, one line per metric.
+
+    Args:
+        precipitation_path (Path): Path to the precipitation file.
+        precipitation (list[float]): Daily precipitation values, in mm.
+        date (str): Initial date of the simulation.
+        parameters (dict[str, float]): Simulation parameters, as in
+            `SIMULATION_PARAMETERS`.
+
+    Returns:
+        str: Contents of the results file.
+    """
+    delimiter = SIMULATION_OUTPUT_ATTRIBUTES["delimiter"]
+    full_chunks, remainder = divmod(len(precipitation), PRECIPITATION_CHUNK_SIZE)
+    lines = [
+        f"Arquivo dados de precipitação{delimiter}{precipitation_path}",
+        "Dados de precipitação",
+        delimiter.join(map(str, (PRECIPITATION_CHUNK_SIZE, full_chunks, remainder))),
+    ]
+    for start in range(0, len(precipitation), PRECIPITATION_CHUNK_SIZE):
+        chunk = precipitation[start:start + PRECIPITATION_CHUNK_SIZE]
+        lines.append(delimiter.join(f"{value:g}" for value in chunk) + delimiter)
+    lines.extend(f"{label}{delimiter}{value}" for label, value in (
+        ("Descarte precipitação", parameters["initial_run_off_disposal"]),
+        ("Data inicial", date),
+        ("Área de captação (m²)", parameters["catchment_area"]),
+        ("Número de moradores", parameters["number_of_residents"]),
+        ("Demanda de água per capita", parameters["daily_water_demand"]),
+        ("Percentual de água potável a ser substituída por pluvial",
+         parameters["rainwater_replacement_percentage"] / 100),
+        ("Coeficiente de escoamento superficial", parameters["coefficient_of_loss"]),
+        ("Reservatório superior (litros)", parameters["upper_tank_capacity"]),
+        ("Reservatório inferior (litros)", parameters["lower_tank_capacity"]),
+    ))
+    lines.extend(("", "", SIMULATION_OUTPUT_ATTRIBUTES["start_of_results_label"]))
+    results = NetunoSimulator(**parameters).simulate(precipitation)
+    lines.extend(
+        f"{SIMULATION_RESULT_LABELS[metric]}{delimiter}"
+        f"{format_value(metric, variable.value)}"
+        for metric, variable in results.items())
+    return "\n".join(lines) + "\n"
+
+
+class FakeNetuno:
+    """
+    Stand-in for Netuno 4, which consumes the simulation requests written by
+    `SpoolAutomator` to a spool directory, in the order they were written, and writes the
+    results file of each one after a configurable latency, atomically. To reproduce how
+    Netuno 4 degrades over time, the latency can grow with every simulation and memory can
+    be leaked, until the process is restarted.
+    """
+
+    spool_dir: Path
+    latency: float
+    slowdown: float
+    leak_size: int
+    simulations: int
+    leaked: list[bytes]
+
+    def __init__(
+            self,
+            spool_dir: Path,
+            latency: float = 0,
+            slowdown: float = 0,
+            leak_kb: int = 0) -> None:
+        """
+        Initializes the stand-in.
+
+        Args:
+            spool_dir (Path): Directory where the requests are written.
+            latency (float, optional): Time, in seconds, taken by the first simulation.
+                Defaults to 0.
+            slowdown (float, optional): Fraction of `latency` added to every following
+                simulation. Defaults to 0.
+            leak_kb (int, optional): Memory leaked by every simulation, in KiB. Defaults
+                to 0.
+        """
+        self.spool_dir = spool_dir
+        self.latency = latency
+        self.slowdown = slowdown
+        self.leak_size = leak_kb * 1024
+        self.simulations = 0
+        self.leaked = []
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+
+    def process(self, request_path: Path) -> Path:
+        """
+        Processes a simulation request, writing its results file and deleting it.
+
+        Args:
+            request_path (Path): Path to the request.
+
+        Returns:
+            Path: Path to the results file.
+        """
+        request = json.loads(request_path.read_text(encoding="utf-8"))
+        precipitation_path = Path(request["precipitation_path"])
+        output_path = Path(request["output_path"])
+        contents = render_results(
+            precipitation_path,
+            PrecipitationParser(precipitation_path).to_list(),
+            request["date"],
+            request["parameters"])
+        time.sleep(self.latency * (1 + self.slowdown * self.simulations))
+        self.simulations += 1
+        if self.leak_size:
+            self.leaked.append(b"\x01" * self.leak_size)
+
+        temporary_path = output_path.with_name(f".{output_path.name}.tmp")
+        temporary_path.write_text(
+            contents, encoding=SIMULATION_OUTPUT_ATTRIBUTES["encoding"])
+        os.replace(temporary_path, output_path)
+        request_path.unlink()
+        logger.debug(f"Wrote '{output_path.name}' ({self.simulations} simulation(s))")
+        return output_path
+
+    def serve(self, poll_interval: float = FAKE_NETUNO_POLL_INTERVAL) -> None:
+        """
+        Processes requests as they are written, until the process is terminated. Requests
+        that cannot be processed are logged and discarded.
+
+        Args:
+            poll_interval (float, optional): Time, in seconds, between checks for new
+                requests. Defaults to `globals.constants.FAKE_NETUNO_POLL_INTERVAL`.
+        """
+        logger.info(f"Waiting for requests in '{self.spool_dir.resolve()}'")
+        while True:
+            requests = sorted(self.spool_dir.glob("*.json"))
+            for request_path in requests:
+                try:
+                    self.process(request_path)
+                except (OSError, ValueError, KeyError, TypeError) as exception:
+                    logger.error(f"Discarding request '{request_path.name}': {exception}")
+                    request_path.unlink(missing_ok=True)
+            if not requests:
+                time.sleep(poll_interval)
+
+
+def parse_arguments() -> Namespace:
+    parser = ArgumentParser(
+        description="Stand-in for Netuno 4, which writes results files for the simulations "
+        "requested by triton.py with the 'fake' engine. Defaults can also be set through "
+        "the environment variables FAKE_NETUNO_LATENCY, FAKE_NETUNO_SLOWDOWN and "
+        "FAKE_NETUNO_LEAK_KB, since triton.py starts it without arguments")
+    parser.add_argument(
+        "--spool", type=Path, default=FAKE_NETUNO_SPOOL_PATH, metavar="path/to/spool",
+        help="directory where requests are written. Defaults to "
+        f"'{FAKE_NETUNO_SPOOL_PATH}'")
+    parser.add_argument(
+        "--latency", type=float, default=float(os.getenv("FAKE_NETUNO_LATENCY", 0.5)),
+        metavar="S", help="time, in seconds, taken by each simulation. Defaults to 0.5")
+    parser.add_argument(
+        "--slowdown", type=float, default=float(os.getenv("FAKE_NETUNO_SLOWDOWN", 0)),
+        metavar="F",
+        help="fraction of the latency added to every following simulation, until the "
+        "process is restarted. Defaults to 0")
+    parser.add_argument(
+        "--leak-kb", type=int, default=int(os.getenv("FAKE_NETUNO_LEAK_KB", 0)),
+        metavar="KB", help="memory leaked by every simulation, in KiB. Defaults to 0")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s  %(levelname)-8.8s: [fake] %(message)s",
+        datefmt="%Y-%m-%dT%H:%M:%S%z")
+    try:
+        FakeNetuno(
+            arguments.spool, arguments.latency, arguments.slowdown, arguments.leak_kb
+            ).serve()
+    except KeyboardInterrupt:
+        pass
@@ -7,9 +7,44 @@ RAINFALL_SUBSTITUTION_PERCENT_MIN = 10
 RAINFALL_SUBSTITUTION_PERCENT_MAX = 100
 
 NETUNO_STARTUP_WAIT_TIME = 1.0
-PATH_TO_LOWER_TANK_RADIO_BUTTON = r"static\netuno_lower_tank_known_volume.png"
+NETUNO_STARTUP_TIMEOUT = 30.0
+NETUNO_STARTUP_PROBE_INTERVAL = 0.05
+NETUNO_EXIT_TIMEOUT = 5.0
+NETUNO_WINDOW_TITLE = "Netuno"
+NETUNO_RESPONSE_TIMEOUT = 10.0
+NETUNO_RESPONSE_PROBE_INTERVAL = 0.005
+NETUNO_IDLE_CPU_PERCENT = 2.0
+NETUNO_IDLE_CHECKS = 4
+RESTART_LATENCY_WINDOW = 5
+RESTART_LATENCY_FACTOR = 1.5
+RESTART_RESOURCE_FACTOR = 2.0
+KEYSTROKE_PAUSE = 0.08
+PLAN_KEY_INTERVAL = 0.01
+TIMING_PROFILE_PATH = Path().parent / "timing-profile.json"
+INPUT_INDEX_PATH = Path().parent / "precipitation-index.sqlite"
+TIMING_LIMITS = {
+    "keystroke_pause": (0.01, 0.5),
+    "explorer_wait": (0.02, 2.0)
+}
+TIMING_LATENCY_WINDOW = 20
+TIMING_LATENCY_FACTOR = 1.5
+TIMING_SHRINK_FACTOR = 0.95
+TIMING_BACKOFF_FACTOR = 2.0
+RESULTS_FILE_TIMEOUT = 30.0
+RESULTS_FILE_RECHECK_INTERVAL = 0.5
+RESULTS_FILE_STABLE_TIME = 0.1
+PIPELINE_DEPTH = 2
+RESULTS_FILES_KEPT = 20
+PATH_TO_LOWER_TANK_RADIO_BUTTON = Path("static", "netuno_lower_tank_known_volume.png")
+LOCATOR_CONFIDENCE = 0.9
+LOCATOR_SEARCH_MARGIN = 20
 
 NETUNO_RESULTS_PATH = Path().parent / "results"
+FAKE_NETUNO_SPOOL_PATH = Path().parent / "fake-netuno-spool"
+FAKE_NETUNO_POLL_INTERVAL = 0.01
+NETUNO_ENGINES = ("netuno", "fake")
+RESULT_CACHE_PATH = Path().parent / "results-cache.sqlite"
+RESULT_CACHE_MAX_ENTRIES = 100_000
 
 OUTPUT_COLUMNS = (
     "city",
@@ -37,8 +72,45 @@ SIMULATION_PARAMETERS = {
     "lower_tank_capacity": 150,
 }
 
+# Settings echoed by Netuno 4 in the results file, whose values are exported as typed
+SIMULATION_SETTING_LABELS = {
+    "precipitation_path": "Arquivo dados de precipitação",
+    "date": "Data inicial",
+    "initial_run_off_disposal": "Descarte precipitação",
+    "catchment_area": "Área de captação (m²)",
+    "rainwater_replacement_percentage":
+        "Percentual de água potável a ser substituída por pluvial",
+    "coefficient_of_loss": "Coeficiente de escoamento superficial",
+    "lower_tank_capacity": "Reservatório inferior (litros)",
+}
+SIMULATION_DATE_FORMATS = ("%d/%m/%Y", "%Y-%m-%d")
+
 SIMULATION_OUTPUT_ATTRIBUTES = {
     "encoding": "WINDOWS-1252",
     "delimiter": ";",
     "start_of_results_label": "RESULTADO DA SIMULAÇÃO"
 }
+
+SIMULATION_RESULT_LABELS = {
+    "potential_savings": "Potencial de economia (%)",
+    "average_rainwater_consumption": "Volume consumido médio de água pluvial (litros/dia)",
+    "average_drinking_water_consumption":
+        "Volume consumido médio de água potável (litros/dia)",
+    "average_rainwater_overflow": "Volume médio de água pluvial extravasado (litros/dia)",
+    "period_when_demand_is_fully_met":
+        "Dias em que a demanda de água pluvial é atendida completamente",
+    "period_when_demand_is_partially_met":
+        "Dias em que a demanda de água pluvial é atendida parcialmente (%)",
+    "period_when_demand_is_not_met":
+        "Dias em que a demanda de água pluvial não é atendida (%)",
+}
+
+SIMULATION_RESULT_UNITS = {
+    "potential_savings": "%",
+    "average_rainwater_consumption": "liters/day",
+    "average_drinking_water_consumption": "liters/day",
+    "average_rainwater_overflow": "liters/day",
+    "period_when_demand_is_fully_met": "days",
+    "period_when_demand_is_partially_met": "%",
+    "period_when_demand_is_not_met": "%",
+}
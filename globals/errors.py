@@ -15,7 +15,9 @@ class InvalidSourceDirectoryError(Exception):
 
 class MissingInputDataError(Exception):
     def __init__(self, source_directory: Path, *args):
-        message = f"Provided path '{source_directory.resolve()}' has no CSV files"
+        message = (
+            f"Provided path '{source_directory.resolve()}' has no CSV files matching the "
+            f"given filters")
         super().__init__(message, *args)
 
 
@@ -41,3 +43,115 @@ class InvalidRestartAttributeError(Exception):
     def __init__(self, restart_every: int, *args):
         message = f"Provided value {restart_every} is not greater than 0"
         super().__init__(message, *args)
+
+
+class InvalidBatchSizeError(Exception):
+    def __init__(self, batch_size: int, *args):
+        message = f"Provided value {batch_size} is not greater than 0"
+        super().__init__(message, *args)
+
+
+class InvalidSweepSpecificationError(Exception):
+    def __init__(self, specification: str, *args):
+        message = (
+            f"Provided sweep '{specification}' is not in the format 'name=v1,v2,...' or "
+            f"'name=start:stop:step', with a known simulation parameter and increasing "
+            f"range")
+        super().__init__(message, *args)
+
+
+class IncompatibleEngineError(Exception):
+    def __init__(self, option: str, engine: str, *args):
+        message = f"Option '{option}' is not supported by the '{engine}' engine"
+        super().__init__(message, *args)
+
+
+class InvalidWorkersError(Exception):
+    def __init__(self, workers: int, *args):
+        message = f"Provided value {workers} is not greater than 0"
+        super().__init__(message, *args)
+
+
+class InvalidResumeFileError(Exception):
+    def __init__(self, output_path: Path, *args):
+        message = f"No results file to resume at '{output_path.resolve()}'"
+        super().__init__(message, *args)
+
+
+class InvalidCacheSizeError(Exception):
+    def __init__(self, cache_size: int, *args):
+        message = f"Provided value {cache_size} is not greater than 0"
+        super().__init__(message, *args)
+
+
+class InvalidFlushThresholdError(Exception):
+    def __init__(self, option: str, value: float, *args):
+        message = f"Provided value {value} for option '{option}' is not greater than 0"
+        super().__init__(message, *args)
+
+
+class IncompatibleFormatError(Exception):
+    def __init__(self, option: str, output_format: str, *args):
+        message = f"Option '{option}' is not supported by the '{output_format}' format"
+        super().__init__(message, *args)
+
+
+class UnknownResultLabelError(Exception):
+    def __init__(self, label: str, *args):
+        message = f"Unknown label '{label}' in the results exported by Netuno 4"
+        super().__init__(message, *args)
+
+
+class IncompleteResultsError(Exception):
+    def __init__(self, results_file: Path, missing_metrics: list[str], *args):
+        message = (
+            f"Results file '{results_file.resolve()}' has no value for metric(s) "
+            f"{', '.join(missing_metrics)}")
+        super().__init__(message, *args)
+
+
+class InvalidPrecipitationDataError(Exception):
+    def __init__(self, invalid_files: list[Path], *args):
+        message = (
+            f"{len(invalid_files)} precipitation file(s) failed validation: "
+            f"{', '.join(file.name for file in invalid_files)}")
+        super().__init__(message, *args)
+
+
+class InvalidStartupTimeoutError(Exception):
+    def __init__(self, timeout: float, *args):
+        message = f"Provided value {timeout} is not greater than 0"
+        super().__init__(message, *args)
+
+
+class NetunoStartupTimeoutError(Exception):
+    def __init__(self, readiness: str, timeout: float, *args):
+        message = f"Netuno 4 was not {readiness} after {timeout} seconds"
+        super().__init__(message, *args)
+
+
+class NetunoExitedError(Exception):
+    def __init__(self, pid: int, return_code: int, *args):
+        message = (
+            f"Netuno process #{pid} exited with code {return_code} before it was ready")
+        super().__init__(message, *args)
+
+
+class NetunoUnresponsiveError(Exception):
+    def __init__(self, response: str, timeout: float, *args):
+        message = f"Netuno 4 was not {response} after {timeout} seconds"
+        super().__init__(message, *args)
+
+
+class MismatchedSettingError(Exception):
+    def __init__(self, results_file: Path, setting: str, expected: str, found: str, *args):
+        message = (
+            f"Results file '{results_file.resolve()}' has '{found}' as '{setting}', "
+            f"instead of '{expected}'")
+        super().__init__(message, *args)
+
+
+class EmptyPrecipitationSeriesError(Exception):
+    def __init__(self, *args):
+        message = "Precipitation series has no daily values to simulate"
+        super().__init__(message, *args)
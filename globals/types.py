@@ -1,6 +1,9 @@
 from dataclasses import dataclass
+from pathlib import Path
 
 type ResultTuple = tuple[str, str, str, str, str, float, str]
+type SweepResultTuple = tuple[str, str, str, str, str, float, str, *tuple[float, ...]]
+type WideResultTuple = tuple[str, str, str, *tuple[float | None, ...]]
 
 
 @dataclass
@@ -8,3 +11,24 @@ class Variable:
     label: str
     unit: str
     value: float
+
+
+@dataclass
+class IndexEntry:
+    path: Path
+    size: int
+    mtime_ns: int
+    digest: str
+    city: str
+    model: str
+    scenario: str
+    rows: int
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class PlanStep:
+    kind: str
+    keys: tuple[str, ...] = ()
+    slot: str | None = None
+    phase: str | None = None
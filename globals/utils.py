@@ -0,0 +1,67 @@
+import logging
+from pathlib import Path
+
+from globals.constants import NETUNO_RESULTS_PATH
+
+
+def saturate(value: float, lower_limit: float, upper_limit: float) -> float:
+    """
+    Saturates a given value between lower and upper limits, inclusive.
+
+    Args:
+        value (float): Value to be saturated.
+        lower_limit (float): Lower boundary.
+        upper_limit (float): Upper boundary.
+
+    Returns:
+        float: Value after saturation is applied.
+    """
+    return min(upper_limit, max(lower_limit, value))
+
+
+def get_export_path(precipitation_path: Path) -> Path:
+    """
+    Defines the path where Netuno 4 exports the results of a precipitation file.
+
+    Args:
+        precipitation_path (Path): Path to the precipitation file.
+
+    Returns:
+        Path: Path to the export file.
+    """
+    return Path(
+        NETUNO_RESULTS_PATH,
+        precipitation_path.stem.split(".", 1)[0]
+        ).with_suffix(".out.csv")
+
+
+def setup_logger(
+        logger: logging.Logger, quiet_count: int = 0, verbose: bool = False) -> None:
+    """
+    Configures a logger for the application, defining output format and log level according
+    to quiet or verbose arguments.
+
+    Args:
+        logger (logging.Logger): Logger channel to be configured.
+        quiet_count (int): Number of times the 'quiet' flag was provided. Defaults to 0.
+        verbose (bool): Whether the 'verbose' flag was provided. Defaults to False.
+    """
+    if verbose:
+        log_level = logging.DEBUG
+    elif quiet_count == 1:
+        log_level = logging.WARNING
+    elif quiet_count >= 2:
+        log_level = logging.ERROR
+    else:
+        log_level = logging.INFO
+
+    logger.propagate = True
+    logger.setLevel(log_level)
+
+    formatter = logging.Formatter(
+        fmt="%(asctime)s  %(levelname)-8.8s: %(message)s",
+        datefmt="%Y-%m-%dT%H:%M:%S%z")
+    handler = logging.StreamHandler()
+    handler.setLevel(log_level)
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
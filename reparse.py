@@ -0,0 +1,189 @@
+import logging
+import time
+from argparse import ArgumentParser, Namespace
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from agents.dispatcher import ParallelDispatcher
+from agents.exporter import CSVExporter
+from agents.parsers import FileNameParser, ResultParser
+from globals.constants import NETUNO_RESULTS_PATH, OUTPUT_COLUMNS
+from globals.errors import (
+    InvalidFlushThresholdError, InvalidSourceDirectoryError, InvalidWorkersError)
+from globals.types import ResultTuple
+from globals.utils import setup_logger
+
+logger = logging.getLogger("triton")
+
+
+def find_results_files(results_dir: Path) -> Iterator[Path]:
+    """
+    Lists the results files exported by Netuno 4 in a directory, sorted by name. The
+    directory is listed at once, to be sorted, but files are checked one at a time.
+
+    Args:
+        results_dir (Path): Directory with the results files.
+
+    Yields:
+        Iterator[Path]: Files whose names end with '.out.csv', sorted by name.
+    """
+    for file in sorted(results_dir.iterdir()):
+        if file.name.casefold().endswith(".out.csv") and file.is_file():
+            yield file
+
+
+def parse_results_file(results_file: Path) -> list[ResultTuple]:
+    """
+    Parses a results file exported by Netuno 4, identified by the city, model and scenario
+    in its name.
+
+    Args:
+        results_file (Path): Path to the results file.
+
+    Returns:
+        list[ResultTuple]: Results in the format of `ResultParser.to_list()`.
+    """
+    city, model, scenario = FileNameParser.get_metadata(results_file)
+    return ResultParser(results_file).to_list(city, model, scenario)
+
+
+def parse_in_process(
+        results_files: Iterable[Path]) -> Iterator[tuple[Path, list[ResultTuple] | None]]:
+    """
+    Parses results files one at a time, in this process, skipping those that cannot be
+    parsed in the same way as `ParallelDispatcher.imap()`.
+
+    Args:
+        results_files (Iterable[Path]): Paths to the results files.
+
+    Yields:
+        Iterator[tuple[Path, list[ResultTuple] | None]]: Each file with its results, or
+        with None if it could not be parsed.
+    """
+    for results_file in results_files:
+        try:
+            content = parse_results_file(results_file)
+        except Exception as exception:
+            logger.error(
+                f"Task '{results_file}' failed and was skipped. Details: {exception}")
+            content = None
+        yield results_file, content
+
+
+def validate_arguments(args: Namespace) -> None:
+    """
+    Validates the command line arguments.
+
+    Args:
+        args (Namespace): Parsed command line arguments.
+
+    Raises:
+        InvalidSourceDirectoryError: If the results directory is not a directory.
+        InvalidWorkersError: If the number of workers is less than or equal to 0.
+        InvalidFlushThresholdError: If the number of rows per save is less than or equal
+            to 0.
+    """
+    if not args.results_dir.is_dir():
+        raise InvalidSourceDirectoryError(args.results_dir)
+    if args.workers <= 0:
+        raise InvalidWorkersError(args.workers)
+    if args.flush_rows <= 0:
+        raise InvalidFlushThresholdError("--flush-rows", args.flush_rows)
+
+
+def main(args: Namespace) -> None:
+    global_start_time = time.perf_counter()
+    exporter_class = CSVExporter
+    if args.output_format == "parquet":
+        # PyArrow takes a noticeable time to import, which CSV runs do not need
+        from agents.parquet import ParquetExporter
+        exporter_class = ParquetExporter
+    exporter = exporter_class(
+        args.output_dir, OUTPUT_COLUMNS, args.flush_rows, layout=args.layout)
+
+    logger.info(
+        f"Parsing results files from '{args.results_dir.resolve()}' over {args.workers} "
+        f"process(es)")
+    results_files = find_results_files(args.results_dir)
+    if args.workers > 1:
+        results = ParallelDispatcher(args.workers).imap(parse_results_file, results_files)
+    else:
+        results = parse_in_process(results_files)
+    counter = failed = 0
+    for results_file, content in results:
+        counter += 1
+        if content is None:
+            failed += 1
+            continue
+        exporter.add_results(content, [results_file])
+    if exporter.content:
+        exporter.save_results()
+    exporter.close()
+    logger.info(f"Successfully saved results at '{exporter.output_path.resolve()}'")
+    if failed:
+        logger.warning(f"Could not parse {failed} file(s), see errors above")
+
+    total_time = time.perf_counter() - global_start_time
+    logger.info(
+        f"Completed all operations. "
+        f"Total time: {total_time:.2f}s. "
+        f"Average time per file ({counter} entries): {total_time/max(counter, 1):.4f}s")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Rebuild the consolidated output from the results files exported by "
+        "Netuno 4, without running any simulation")
+    parser.add_argument(
+        "results_dir", metavar="path/to/results", type=Path, nargs="?",
+        default=NETUNO_RESULTS_PATH,
+        help=f"directory with the '.out.csv' files exported by Netuno 4 (e.g. extracted "
+        f"from the tarball written by triton.py with --archive). Defaults to "
+        f"'{NETUNO_RESULTS_PATH}'")
+    parser.add_argument(
+        "-o", "--output-dir", type=Path, default=Path(__file__).parent,
+        metavar="path/to/output",
+        help="directory where the consolidated output file is saved, with a timestamped "
+        "name. Defaults to the directory of this script")
+    parser.add_argument(
+        "-q", "--quiet", action="count", default=0,
+        help="turn on quiet mode (cumulative), which hides log entries of levels lower "
+        "than WARNING, then ERROR. Ignored if --verbose is present")
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", default=False, help=(
+            "turn on verbose mode, to display all log messages of level DEBUG and above. "
+            "Overrides --quiet"))
+    parser.add_argument(
+        "-j", "--workers", type=int, default=1, metavar="N",
+        help="number of processes that parse results files in parallel. Results are saved "
+        "in the same order as the files are sorted by name, and files that cannot be "
+        "parsed are skipped. Parsing a file takes well under a millisecond, so a pool of "
+        "processes only pays off for very large directories. Must be a positive integer. "
+        "Defaults to 1, which parses the files in this process.")
+    parser.add_argument(
+        "--flush-rows", type=int, default=10_000, metavar="R",
+        help="save results to disk as soon as at least R rows are pending, so they are "
+        "streamed to the output file. Must be a positive integer. Defaults to 10000.")
+    parser.add_argument(
+        "--format", choices=("csv", "parquet"), default="csv", dest="output_format",
+        help="format of the consolidated output file. Defaults to 'csv'.")
+    parser.add_argument(
+        "--layout", choices=("long", "wide"), default="long",
+        help="layout of the consolidated output file, as in triton.py. Defaults to "
+        "'long'.")
+
+    arguments = parser.parse_args()
+    setup_logger(logger, arguments.quiet, arguments.verbose)
+    try:
+        validate_arguments(arguments)
+    except (
+            InvalidSourceDirectoryError,
+            InvalidWorkersError,
+            InvalidFlushThresholdError) as exception:
+        logger.exception(f"Command line arguments validation failed. Details:\n{exception}")
+        raise SystemExit
+
+    try:
+        main(arguments)
+    except Exception as exception:
+        logger.exception(f"An error occurred during the operation. Details:\n{exception}")
@@ -1,10 +1,12 @@
 import unittest
 from pathlib import Path
-from unittest.mock import call, patch
+from unittest.mock import MagicMock, call, patch
 
+import pyautogui
 import pyperclip
 
 from agents.automators import Mover, NetunoAutomator, saturate
+from agents.tracer import PhaseTracer
 from globals.constants import NETUNO_RESULTS_PATH, SIMULATION_PARAMETERS
 
 MOCK_PATHS = {
@@ -43,47 +45,47 @@ class TestMover(unittest.TestCase):
     def test_startup_to_file_selection(self):
         with patch(MOCK_PATHS["press"]) as press_mock:
             Mover.from_startup_to_file_selection()
-            press_mock.assert_called_once_with(["down", "down", "up"])
+            press_mock.assert_called_once_with(("down", "down", "up"))
 
     def test_file_selection_to_date(self):
         with patch(MOCK_PATHS["press"]) as press_mock:
             Mover.from_file_selection_to_date()
-            press_mock.assert_called_once_with("down", 2)
+            press_mock.assert_called_once_with(("down", "down"))
 
     def test_date_to_run_off(self):
         with patch(MOCK_PATHS["press"]) as press_mock:
             Mover.from_date_to_initial_run_off_field()
-            press_mock.assert_called_once_with("down")
+            press_mock.assert_called_once_with(("down",))
 
     def test_run_off_to_catchment(self):
         with patch(MOCK_PATHS["press"]) as press_mock:
             Mover.from_initial_run_off_to_catchment_area_field()
-            press_mock.assert_called_once_with("tab")
+            press_mock.assert_called_once_with(("tab",))
 
     def test_catchment_to_demand(self):
         with patch(MOCK_PATHS["press"]) as press_mock:
             Mover.from_catchment_area_to_water_demand_field()
-            press_mock.assert_called_once_with("tab")
+            press_mock.assert_called_once_with(("tab",))
 
     def test_demand_to_residents(self):
         with patch(MOCK_PATHS["press"]) as press_mock:
             Mover.from_water_demand_to_residents_field()
-            press_mock.assert_called_once_with("tab", 2)
+            press_mock.assert_called_once_with(("tab", "tab"))
 
     def test_residents_to_replacement(self):
         with patch(MOCK_PATHS["press"]) as press_mock:
             Mover.from_residents_to_rainwater_replacement()
-            press_mock.assert_called_once_with("tab", 2)
+            press_mock.assert_called_once_with(("tab", "tab"))
 
     def test_replacement_to_loss(self):
         with patch(MOCK_PATHS["press"]) as press_mock:
             Mover.from_rainwater_replacement_to_coefficient_of_loss()
-            press_mock.assert_called_once_with("tab")
+            press_mock.assert_called_once_with(("tab",))
 
     def test_loss_to_upper_tank(self):
         with patch(MOCK_PATHS["press"]) as press_mock:
             Mover.from_coefficient_of_loss_to_upper_tank_button()
-            press_mock.assert_called_once_with("tab", 2)
+            press_mock.assert_called_once_with(("tab", "tab"))
 
     def test_to_lower_tank_button(self):
         EXPECTED_CALL_ARGS = (12, 31)
@@ -98,22 +100,22 @@ class TestMover(unittest.TestCase):
     def test_tank_to_simulate(self):
         with patch(MOCK_PATHS["press"]) as press_mock:
             Mover.from_lower_tank_field_to_simulate_button()
-            press_mock.assert_called_once_with("tab")
+            press_mock.assert_called_once_with(("tab",))
 
     def test_simulate_to_export(self):
         with patch(MOCK_PATHS["press"]) as press_mock:
             Mover.from_simulate_to_export_button()
-            press_mock.assert_called_once_with("tab")
+            press_mock.assert_called_once_with(("tab",))
 
     def test_date_to_simulate(self):
         with patch(MOCK_PATHS["press"]) as press_mock:
             Mover.from_date_to_simulate_button()
-            press_mock.assert_called_once_with("tab", 15)
+            press_mock.assert_called_once_with(("tab",) * 15)
 
     def test_export_to_file_selection(self):
         with patch(MOCK_PATHS["press"]) as press_mock:
             Mover.from_export_to_file_selection()
-            press_mock.assert_has_calls([call("tab", 5), call("up", 3)])
+            press_mock.assert_called_once_with(("tab",) * 5 + ("up",) * 3)
 
 
 class TestNetunoAutomator(unittest.TestCase):
@@ -136,6 +138,42 @@ class TestNetunoAutomator(unittest.TestCase):
             press_mock.assert_has_calls([call("v"), call("enter")])
         self.assertEqual(Path(pyperclip.paste()), path.resolve())
 
+    def test_select_file_with_probe(self):
+        probe = MagicMock()
+        probe.wait_for_explorer.return_value = 0.3
+        probe.wait_for_netuno.return_value = 0.05
+        automator = NetunoAutomator(0, probe=probe)
+        with (
+                patch(MOCK_PATHS["press"]) as press_mock,
+                patch(MOCK_PATHS["key_down"]),
+                patch(MOCK_PATHS["key_up"]),
+                patch(MOCK_PATHS["sleep"]) as sleep_mock):
+            automator._select_file_in_explorer(Path())
+            sleep_mock.assert_not_called()
+            press_mock.assert_has_calls([call("v"), call("enter", _pause=False)])
+        self.assertListEqual(
+            automator.pop_responses(), [("explorer_wait", 0.3), ("keystroke_pause", 0.05)])
+        self.assertListEqual(automator.pop_responses(), [])
+
+    def test_set_delays(self):
+        automator = NetunoAutomator(0)
+        original_pause = pyautogui.PAUSE
+        automator.set_delays(keystroke_pause=0.02, explorer_wait=0.3)
+        self.assertEqual(pyautogui.PAUSE, 0.02)
+        self.assertEqual(automator.wait, 0.3)
+        pyautogui.PAUSE = original_pause
+
+    def test_phases_are_traced(self):
+        automator = NetunoAutomator(0, PhaseTracer())
+        with (
+                patch(MOCK_PATHS["press"]),
+                patch(MOCK_PATHS["write"]),
+                patch(MOCK_PATHS["mover"])):
+            automator._type_date("01/01/1980")
+            automator._simulate_and_start_export()
+        self.assertListEqual(
+            list(automator.tracer.durations), ["date_typing", "simulate_export"])
+
     def test_type_float_value(self):
         with patch(MOCK_PATHS["write"]) as write_mock:
             self.automator._type_float_value(1000.789)
@@ -179,13 +217,41 @@ class TestNetunoAutomator(unittest.TestCase):
                 patch(MOCK_PATHS["key_up"])):
             self.automator._setup_precipitation_file(path, REFERENCE_DATE)
             press_mock.assert_has_calls([
-                call(["down", "down", "up"]),
+                call(("down", "down", "up")),
                 call("v"),
                 call("enter"),
-                call("down", 2)])
+                call(("down", "down"))])
             write_mock.assert_called_once_with(REFERENCE_DATE)
         self.assertEqual(Path(pyperclip.paste()), path.resolve())
 
+    def test_setup_precipitation_file_keeps_date(self):
+        automator = NetunoAutomator(0)
+        with (
+                patch(MOCK_PATHS["mover"]),
+                patch(MOCK_PATHS["select_file"]),
+                patch(MOCK_PATHS["write"]) as write_mock):
+            automator._setup_precipitation_file(Path(), "01/01/2015")
+            automator._setup_precipitation_file(Path(), "01/01/2015")
+            automator._setup_precipitation_file(Path(), "01/01/1980")
+            write_mock.assert_has_calls([call("01/01/2015"), call("01/01/1980")])
+            self.assertEqual(write_mock.call_count, 2)
+        self.assertEqual(automator.current_date, "01/01/1980")
+
+    def test_run_first_simulation_types_date_again(self):
+        automator = NetunoAutomator(0)
+        with (
+                patch(MOCK_PATHS["mover"]),
+                patch(MOCK_PATHS["select_file"]),
+                patch(MOCK_PATHS["set_simulation"]),
+                patch(MOCK_PATHS["simulate_export"]),
+                patch(MOCK_PATHS["write"]) as write_mock):
+            automator.run_first_simulation(
+                Path("test.csv"), "01/01/2015", **SIMULATION_PARAMETERS)
+            automator.run_simulation(Path("test.csv"), "01/01/2015")
+            automator.run_first_simulation(
+                Path("test.csv"), "01/01/2015", **SIMULATION_PARAMETERS)
+            self.assertEqual(write_mock.call_count, 2)
+
     def test_set_simulation_parameters(self):
         with (
                 patch(MOCK_PATHS["mover"]) as mover_mock,
@@ -0,0 +1,82 @@
+import unittest
+from pathlib import Path
+
+from agents.cache import ResultCache
+from agents.parsers import ResultParser
+from globals.constants import SIMULATION_PARAMETERS
+from tests.test_parsers import PATH_TO_PRECIPITATION_DIR, PATH_TO_SIMULATION_RESULT
+
+
+class TestResultCache(unittest.TestCase):
+
+    CACHE_PATH = Path(__file__).parent / "samples" / "test-cache.sqlite"
+    INPUT_PATH = next(PATH_TO_PRECIPITATION_DIR.glob("*.csv"))
+    DATE = "01/01/1980"
+
+    @classmethod
+    def setUpClass(cls):
+        cls.RESULTS = ResultParser(PATH_TO_SIMULATION_RESULT).parse_results()
+
+    def setUp(self):
+        self.cache = ResultCache(self.CACHE_PATH, "v1", 2)
+
+    def test_netuno_version(self):
+        version = ResultCache.netuno_version(self.INPUT_PATH)
+        self.assertTrue(version.startswith("netuno-"))
+        self.assertEqual(version, ResultCache.netuno_version(self.INPUT_PATH))
+        self.assertNotEqual(version, ResultCache.netuno_version(PATH_TO_SIMULATION_RESULT))
+
+    def test_key_for(self):
+        key = ResultCache.key_for(self.INPUT_PATH, SIMULATION_PARAMETERS, self.DATE)
+        self.assertEqual(
+            key,
+            ResultCache.key_for(
+                self.INPUT_PATH, dict(reversed(SIMULATION_PARAMETERS.items())), self.DATE))
+        self.assertNotEqual(
+            key, ResultCache.key_for(self.INPUT_PATH, SIMULATION_PARAMETERS, "01/01/2015"))
+        self.assertNotEqual(
+            key,
+            ResultCache.key_for(
+                self.INPUT_PATH, SIMULATION_PARAMETERS | {"catchment_area": 1}, self.DATE))
+
+    def test_get_missing(self):
+        self.assertIsNone(self.cache.get("missing"))
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_put_and_get(self):
+        self.cache.put("key", self.RESULTS)
+
+        self.assertDictEqual(self.cache.get("key"), self.RESULTS)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_persistence(self):
+        self.cache.put("key", self.RESULTS)
+        self.cache.close()
+
+        self.cache = ResultCache(self.CACHE_PATH, "v1", 2)
+        self.assertDictEqual(self.cache.get("key"), self.RESULTS)
+
+    def test_version_change(self):
+        self.cache.put("key", self.RESULTS)
+        self.cache.close()
+
+        self.cache = ResultCache(self.CACHE_PATH, "v2", 2)
+        self.assertIsNone(self.cache.get("key"))
+
+    def test_evicts_least_recently_used(self):
+        self.cache.put("first", self.RESULTS)
+        self.cache.put("second", self.RESULTS)
+        self.cache.get("first")
+        self.cache.put("third", self.RESULTS)
+
+        self.assertIsNotNone(self.cache.get("first"))
+        self.assertIsNone(self.cache.get("second"))
+        self.assertIsNotNone(self.cache.get("third"))
+
+    def tearDown(self):
+        self.cache.close()
+        self.CACHE_PATH.unlink(missing_ok=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 import logging
 import shutil
+import tarfile
 import unittest
 from pathlib import Path
 
@@ -44,6 +45,52 @@ class TestDeclutter(unittest.TestCase):
             self.assertTrue(declutter.clear_results_files())
             self.assertIn(EXPECTED_LOG_MESSAGE, log_context.output[0])
 
+    def test_clear_results_files_by_name(self):
+        declutter = Declutter(self.sample_path)
+        consumed_file = self.sample_path / "consumed.out.csv"
+        pending_file = self.sample_path / "pending.out.csv"
+        consumed_file.touch()
+        pending_file.touch()
+
+        self.assertTrue(declutter.clear_results_files([consumed_file.name]))
+        self.assertFalse(consumed_file.exists())
+        self.assertTrue(pending_file.exists())
+        pending_file.unlink()
+
+    def test_release_keeps_recent_files(self):
+        declutter = Declutter(self.sample_path, keep=2)
+        files = [self.sample_path / f"{index}.out.csv" for index in range(5)]
+        for file in files:
+            file.touch()
+
+        declutter.start()
+        declutter.release(file.name for file in files[:2])
+        declutter.release([files[2].name])
+        declutter.release([])
+        declutter.stop()
+        self.assertListEqual(
+            [file.exists() for file in files], [False, True, True, True, True])
+        self.assertListEqual(list(declutter.recent), [files[1].name, files[2].name])
+        declutter.clear_results_files()
+
+    def test_release_archives_files(self):
+        archive_path = Path(__file__).parent / "samples" / "test-results.tar.gz"
+        declutter = Declutter(self.sample_path, archive_path=archive_path)
+        files = [self.sample_path / f"{index}.out.csv" for index in range(3)]
+        for index, file in enumerate(files):
+            file.write_text(f"results {index}", encoding="utf-8")
+
+        declutter.start()
+        declutter.release(file.name for file in files[:2])
+        with self.assertLogs(logger, level=logging.INFO):
+            declutter.stop()
+        with tarfile.open(archive_path) as archive:
+            self.assertCountEqual(archive.getnames(), [files[0].name, files[1].name])
+            self.assertEqual(archive.extractfile(files[1].name).read(), b"results 1")
+        self.assertListEqual([file.exists() for file in files], [False, False, True])
+        archive_path.unlink()
+        files[2].unlink()
+
     def test_remove_results_dir_success(self):
         NETUNO_RESULTS_PATH.mkdir(exist_ok=True)
         EXPECTED_LOG_MESSAGE = (
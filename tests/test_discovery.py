@@ -0,0 +1,82 @@
+import re
+import shutil
+import unittest
+from pathlib import Path
+
+from agents.discovery import InputDiscovery
+
+TREE = (
+    "top_Model_SSP245.csv",
+    "notes.txt",
+    "Florianópolis/ACCESS-CM2/Histórico/Florianópolis_ACCESS-CM2_Histórico.csv",
+    "Florianópolis/ACCESS-CM2/SSP245/Florianópolis_ACCESS-CM2_SSP245.csv",
+    "São Paulo/GFDL-CM4/SSP585/São Paulo_GFDL-CM4_SSP585.csv",
+    "São Paulo/GFDL-CM4/SSP585/readme.md",
+)
+
+
+class TestInputDiscovery(unittest.TestCase):
+
+    ROOT = Path(__file__).parent / "samples" / "discovery"
+    OTHER_ROOT = Path(__file__).parent / "samples" / "discovery-other"
+
+    def setUp(self):
+        for relative_path in TREE:
+            file = Path(self.ROOT, relative_path)
+            file.parent.mkdir(parents=True, exist_ok=True)
+            file.touch()
+        self.OTHER_ROOT.mkdir(exist_ok=True)
+        Path(self.OTHER_ROOT, "Vitória_INM-CM4_8_SSP245.csv").touch()
+
+    def _names(self, discovery: InputDiscovery) -> list[str]:
+        return [file.name for file in discovery]
+
+    def test_top_level_only(self):
+        self.assertListEqual(
+            self._names(InputDiscovery([self.ROOT])), ["top_Model_SSP245.csv"])
+
+    def test_recursive(self):
+        self.assertCountEqual(
+            self._names(InputDiscovery([self.ROOT], recursive=True)),
+            [Path(relative_path).name for relative_path in TREE
+             if relative_path.endswith(".csv")])
+
+    def test_multiple_roots(self):
+        names = self._names(InputDiscovery([self.ROOT, self.OTHER_ROOT, self.ROOT]))
+        self.assertListEqual(
+            names, ["top_Model_SSP245.csv", "Vitória_INM-CM4_8_SSP245.csv"])
+
+    def test_globs(self):
+        discovery = InputDiscovery(
+            [self.ROOT], recursive=True, include=["*_SSP*.csv"], exclude=["top_*"])
+        self.assertCountEqual(self._names(discovery), [
+            "Florianópolis_ACCESS-CM2_SSP245.csv", "São Paulo_GFDL-CM4_SSP585.csv"])
+
+    def test_glob_on_directories(self):
+        discovery = InputDiscovery([self.ROOT], recursive=True, include=["Histórico/*"])
+        self.assertListEqual(
+            self._names(discovery), ["Florianópolis_ACCESS-CM2_Histórico.csv"])
+
+    def test_metadata_patterns(self):
+        discovery = InputDiscovery(
+            [self.ROOT, self.OTHER_ROOT], recursive=True,
+            model=re.compile(r"^(ACCESS|INM)"), scenario=re.compile("SSP245"))
+        self.assertCountEqual(self._names(discovery), [
+            "Florianópolis_ACCESS-CM2_SSP245.csv", "Vitória_INM-CM4_8_SSP245.csv"])
+
+    def test_is_lazy(self):
+        discovery = iter(InputDiscovery([self.ROOT], recursive=True))
+        first_file = next(discovery)
+        shutil.rmtree(self.ROOT / "São Paulo")
+
+        self.assertTrue(first_file.name.endswith(".csv"))
+        self.assertNotIn(
+            "São Paulo_GFDL-CM4_SSP585.csv", [file.name for file in discovery])
+
+    def tearDown(self):
+        shutil.rmtree(self.ROOT)
+        shutil.rmtree(self.OTHER_ROOT)
+
+
+if __name__ == '__main__':
+    unittest.main()
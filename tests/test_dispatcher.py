@@ -0,0 +1,64 @@
+import logging
+import os
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import MagicMock
+
+from agents.dispatcher import ParallelDispatcher, logger
+
+
+def square(value: int) -> int:
+    return value * value
+
+
+def fail_on_three(value: int) -> int:
+    if value == 3:
+        raise ValueError("Unexpected value")
+    return value * value
+
+
+def crash_on_three(value: int) -> int:
+    if value == 3:
+        os._exit(1)
+    return value * value
+
+
+class TestParallelDispatcher(unittest.TestCase):
+
+    def test_imap_preserves_order(self):
+        dispatcher = ParallelDispatcher(2)
+        results = list(dispatcher.imap(square, range(10)))
+        self.assertListEqual(results, [(value, value * value) for value in range(10)])
+
+    def test_imap_empty(self):
+        dispatcher = ParallelDispatcher(2)
+        self.assertListEqual(list(dispatcher.imap(square, [])), [])
+
+    def test_imap_skips_failed_task(self):
+        dispatcher = ParallelDispatcher(2)
+        with self.assertLogs(logger, level=logging.ERROR) as log_context:
+            results = list(dispatcher.imap(fail_on_three, range(6)))
+            self.assertIn("Task '3' failed and was skipped", log_context.output[0])
+        self.assertListEqual(
+            results, [(0, 0), (1, 1), (2, 4), (3, None), (4, 16), (5, 25)])
+
+    def test_imap_survives_crashed_worker(self):
+        dispatcher = ParallelDispatcher(2)
+        with self.assertLogs(logger, level=logging.WARNING) as log_context:
+            results = list(dispatcher.imap(crash_on_three, range(6)))
+            self.assertIn(
+                "Task '3' broke the process pool again and was skipped",
+                log_context.output[-1])
+        self.assertListEqual(
+            results, [(0, 0), (1, 1), (2, 4), (3, None), (4, 16), (5, 25)])
+
+    def test_submit_to_broken_pool(self):
+        executor = MagicMock()
+        executor.submit.side_effect = BrokenProcessPool("Broken")
+        future = ParallelDispatcher._submit(executor, square, 2)
+        with self.assertRaises(BrokenProcessPool):
+            future.result()
+
+
+if __name__ == "__main__":
+    unittest.main()
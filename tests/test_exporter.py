@@ -1,4 +1,7 @@
+import json
 import logging
+import subprocess
+import sys
 import unittest
 from datetime import datetime
 from pathlib import Path
@@ -7,6 +10,8 @@ from zoneinfo import ZoneInfo
 import time_machine
 
 from agents.exporter import CSVExporter, logger
+from agents.manifest import RunManifest
+from globals.constants import OUTPUT_COLUMNS, SIMULATION_RESULT_UNITS
 
 ZONE_INFO = ZoneInfo("America/Sao_Paulo")
 
@@ -20,6 +25,7 @@ class TestCSVExporter(unittest.TestCase):
         exporter = CSVExporter(path)
         self.assertListEqual(exporter.content, [])
         self.assertEqual(exporter.output_path, EXPECTED_PATH)
+        self.assertTupleEqual(exporter.columns, OUTPUT_COLUMNS)
 
     @time_machine.travel(datetime(1998, 5, 30, 13, 1, tzinfo=ZONE_INFO))
     def test_get_base_file_name(self):
@@ -55,8 +61,229 @@ class TestCSVExporter(unittest.TestCase):
 
         self.assertListEqual(exporter.content, [])
         self.assertTrue(exporter.output_path.is_file())
+        exporter.close()
         exporter.output_path.unlink()
 
+    def test_save_results_with_extra_columns(self):
+        COLUMNS = OUTPUT_COLUMNS + ("catchment_area",)
+        exporter = CSVExporter(Path(__file__).parent, COLUMNS)
+        exporter.output_path = Path(__file__).parent / "samples" / "test.csv"
+        exporter.add_results(
+            [("city", "model", "scenario", "metric", "label", 3.14, "unit", 50)])
+        exporter.save_results()
+
+        with open(exporter.output_path, encoding="utf-8") as output_file:
+            self.assertListEqual(output_file.read().splitlines(), [
+                ",".join(COLUMNS), "city,model,scenario,metric,label,3.14,unit,50"])
+        exporter.close()
+        exporter.output_path.unlink()
+
+    def test_resume(self):
+        path = Path(__file__).parent / "samples" / "test.csv"
+        exporter = CSVExporter.resume(path)
+        self.assertEqual(exporter.output_path, path)
+        self.assertListEqual(exporter.content, [])
+
+    def test_save_results_appends_without_header(self):
+        exporter = CSVExporter(Path(__file__).parent)
+        exporter.output_path = Path(__file__).parent / "samples" / "test.csv"
+        exporter.add_results(
+            [("city", "model", "scenario", "metric", "label", 3.14, "unit")])
+        exporter.save_results()
+        exporter.add_results(
+            [("city2", "model", "scenario", "metric", "label", 1.16, "unit")])
+        exporter.save_results()
+
+        with open(exporter.output_path, encoding="utf-8") as output_file:
+            self.assertListEqual(output_file.read().splitlines(), [
+                ",".join(OUTPUT_COLUMNS),
+                "city,model,scenario,metric,label,3.14,unit",
+                "city2,model,scenario,metric,label,1.16,unit"])
+        exporter.close()
+        exporter.output_path.unlink()
+
+
+class TestCSVExporterStreaming(unittest.TestCase):
+
+    OUTPUT_PATH = Path(__file__).parent / "samples" / "test.csv"
+    RESULT = ("city", "model", "scenario", "metric", "label", 3.14, "unit")
+
+    def test_single_handle(self):
+        exporter = CSVExporter.resume(self.OUTPUT_PATH)
+        exporter.add_results([self.RESULT])
+        exporter.save_results()
+        output_file = exporter.output_file
+        exporter.add_results([self.RESULT])
+        exporter.save_results()
+
+        self.assertIs(exporter.output_file, output_file)
+        exporter.close()
+        self.assertIsNone(exporter.output_file)
+
+    def test_flush_rows(self):
+        exporter = CSVExporter.resume(self.OUTPUT_PATH, flush_rows=3)
+        exporter.add_results([self.RESULT] * 2)
+        self.assertFalse(self.OUTPUT_PATH.is_file())
+        exporter.add_results([self.RESULT] * 2)
+
+        self.assertListEqual(exporter.content, [])
+        with open(self.OUTPUT_PATH, encoding="utf-8") as output_file:
+            self.assertEqual(len(output_file.read().splitlines()), 5)
+        exporter.close()
+
+    def test_flush_interval(self):
+        exporter = CSVExporter.resume(self.OUTPUT_PATH, flush_interval=60)
+        exporter.add_results([self.RESULT])
+        self.assertFalse(self.OUTPUT_PATH.is_file())
+        exporter.last_save_time -= 60
+        exporter.add_results([self.RESULT])
+
+        self.assertListEqual(exporter.content, [])
+        self.assertTrue(self.OUTPUT_PATH.is_file())
+        exporter.close()
+
+    def test_trims_partial_row(self):
+        self.OUTPUT_PATH.write_text(
+            ",".join(OUTPUT_COLUMNS)
+            + "\ncity,model,scenario,metric,label,1.0,unit\ncity,mo",
+            encoding="utf-8")
+        exporter = CSVExporter.resume(self.OUTPUT_PATH)
+        exporter.add_results([self.RESULT])
+        with self.assertLogs(logger, level=logging.WARNING) as log_context:
+            exporter.save_results()
+            self.assertIn("Discarding a partially written row", log_context.output[0])
+        exporter.close()
+
+        with open(self.OUTPUT_PATH, encoding="utf-8") as output_file:
+            self.assertListEqual(output_file.read().splitlines(), [
+                ",".join(OUTPUT_COLUMNS),
+                "city,model,scenario,metric,label,1.0,unit",
+                "city,model,scenario,metric,label,3.14,unit"])
+
+    def test_pandas_and_pyarrow_not_imported(self):
+        output = subprocess.run(
+            [sys.executable, "-c",
+             "import sys, agents.exporter; "
+             "print('pandas' in sys.modules or 'pyarrow' in sys.modules)"],
+            cwd=Path(__file__).parent.parent, capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.strip(), "False")
+
+    def tearDown(self):
+        self.OUTPUT_PATH.unlink(missing_ok=True)
+
+
+class TestCSVExporterWideLayout(unittest.TestCase):
+
+    OUTPUT_PATH = Path(__file__).parent / "samples" / "test.csv"
+    METRICS = tuple(SIMULATION_RESULT_UNITS)
+
+    def _results(self, city: str, *extra: float) -> list[tuple]:
+        return [
+            (city, "model", "scenario", metric, f"label {index}", float(index), unit)
+            + extra
+            for index, (metric, unit) in enumerate(SIMULATION_RESULT_UNITS.items())]
+
+    def test_columns(self):
+        exporter = CSVExporter(
+            Path(__file__).parent, OUTPUT_COLUMNS + ("catchment_area",), layout="wide")
+        self.assertTupleEqual(
+            exporter.columns,
+            ("city", "model", "scenario", "catchment_area") + self.METRICS)
+
+    def test_add_results(self):
+        exporter = CSVExporter(Path(__file__).parent, layout="wide")
+        exporter.add_results(self._results("city") + self._results("city2"))
+
+        self.assertListEqual(exporter.content, [
+            ("city", "model", "scenario", 0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0),
+            ("city2", "model", "scenario", 0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0)])
+        self.assertDictEqual(
+            exporter.metadata["potential_savings"], {"label": "label 0", "unit": "%"})
+
+    def test_add_results_with_extra_columns(self):
+        COLUMNS = OUTPUT_COLUMNS + ("catchment_area",)
+        exporter = CSVExporter(Path(__file__).parent, COLUMNS, layout="wide")
+        exporter.add_results(self._results("city", 50.0) + self._results("city", 100.0))
+
+        self.assertListEqual(
+            [row[:4] for row in exporter.content],
+            [("city", "model", "scenario", 50.0), ("city", "model", "scenario", 100.0)])
+
+    def test_add_results_same_identifier(self):
+        exporter = CSVExporter(Path(__file__).parent, layout="wide")
+        exporter.add_results(self._results("city") + self._results("city"))
+
+        self.assertListEqual(exporter.content, [
+            ("city", "model", "scenario", 0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0)] * 2)
+
+    def test_save_results_writes_metadata(self):
+        exporter = CSVExporter.resume(self.OUTPUT_PATH, layout="wide")
+        exporter.add_results(self._results("city"))
+        exporter.save_results()
+        exporter.close()
+
+        with open(self.OUTPUT_PATH, encoding="utf-8") as output_file:
+            self.assertListEqual(output_file.read().splitlines(), [
+                ",".join(OUTPUT_COLUMNS[:3] + self.METRICS),
+                "city,model,scenario,0.0,1.0,2.0,3.0,4.0,5.0,6.0"])
+        with open(exporter.metadata_path, encoding="utf-8") as metadata_file:
+            metadata = json.load(metadata_file)
+        self.assertListEqual(list(metadata), list(self.METRICS))
+        self.assertDictEqual(
+            metadata["average_rainwater_consumption"],
+            {"label": "label 1", "unit": "liters/day"})
+
+    def tearDown(self):
+        self.OUTPUT_PATH.unlink(missing_ok=True)
+        self.OUTPUT_PATH.with_suffix(".metadata.json").unlink(missing_ok=True)
+
+
+class TestCSVExporterWithManifest(unittest.TestCase):
+
+    OUTPUT_PATH = Path(__file__).parent / "samples" / "test.csv"
+    MANIFEST_PATH = Path(__file__).parent / "samples" / "test.manifest.sqlite"
+    INPUT_PATH = Path(__file__).parent / "samples" / "test-input.csv"
+    RESULT = ("city", "model", "scenario", "metric", "label", 3.14, "unit")
+
+    def setUp(self):
+        self.INPUT_PATH.write_text("1.0\n", encoding="utf-8")
+        self.manifest = RunManifest(self.MANIFEST_PATH)
+
+    def test_save_results_marks_sources(self):
+        exporter = CSVExporter.resume(self.OUTPUT_PATH)
+        exporter.use_manifest(self.manifest)
+        exporter.add_results([self.RESULT], [self.INPUT_PATH])
+        exporter.save_results()
+
+        self.assertListEqual(exporter.sources, [])
+        self.assertTrue(self.manifest.is_completed(self.INPUT_PATH))
+        self.assertEqual(self.manifest.output_size, self.OUTPUT_PATH.stat().st_size)
+
+    def test_use_manifest_discards_unrecorded_rows(self):
+        exporter = CSVExporter.resume(self.OUTPUT_PATH)
+        exporter.use_manifest(self.manifest)
+        exporter.add_results([self.RESULT], [self.INPUT_PATH])
+        exporter.save_results()
+        recorded_size = self.OUTPUT_PATH.stat().st_size
+        with open(self.OUTPUT_PATH, "a", encoding="utf-8") as output_file:
+            output_file.write("city2,model,scen")
+
+        with self.assertLogs(logger, level=logging.WARNING) as log_context:
+            CSVExporter.resume(self.OUTPUT_PATH).use_manifest(self.manifest)
+            self.assertIn("Discarding results", log_context.output[0])
+        self.assertEqual(self.OUTPUT_PATH.stat().st_size, recorded_size)
+
+    def test_use_manifest_without_record(self):
+        self.OUTPUT_PATH.write_text("city,model\n", encoding="utf-8")
+
+        CSVExporter.resume(self.OUTPUT_PATH).use_manifest(self.manifest)
+        self.assertEqual(self.OUTPUT_PATH.read_text(encoding="utf-8"), "city,model\n")
+
+    def tearDown(self):
+        self.manifest.close()
+        for path in (self.OUTPUT_PATH, self.MANIFEST_PATH, self.INPUT_PATH):
+            path.unlink(missing_ok=True)
+
 
 if __name__ == '__main__':
     unittest.main()
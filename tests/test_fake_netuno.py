@@ -0,0 +1,90 @@
+import json
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from agents.parsers import PrecipitationParser, ResultParser
+from agents.simulator import NetunoSimulator
+from fake_netuno import FakeNetuno, format_value, render_results
+from globals.constants import SIMULATION_OUTPUT_ATTRIBUTES, SIMULATION_PARAMETERS
+from tests.test_parsers import PATH_TO_PRECIPITATION_DIR
+
+PRECIPITATION_FILE = Path(
+    PATH_TO_PRECIPITATION_DIR, "(Netuno)Florianópolis_ACCESS-CM2_Histórico.csv")
+
+
+class TestRenderResults(unittest.TestCase):
+
+    def test_format_value(self):
+        self.assertEqual(format_value("potential_savings", 9.2), "9.20")
+        self.assertEqual(format_value("average_rainwater_consumption", 55.4734), "55,4734")
+
+    def test_results_are_parseable(self):
+        precipitation = PrecipitationParser(PRECIPITATION_FILE).to_list()
+        output_path = Path(__file__).parent / "samples" / "test-fake.out.csv"
+        output_path.write_text(
+            render_results(
+                PRECIPITATION_FILE, precipitation, "1980-12-01", SIMULATION_PARAMETERS),
+            encoding=SIMULATION_OUTPUT_ATTRIBUTES["encoding"])
+        try:
+            results = ResultParser(output_path).parse_results()
+        finally:
+            output_path.unlink()
+
+        expected = NetunoSimulator(**SIMULATION_PARAMETERS).simulate(precipitation)
+        self.assertListEqual(list(results), list(expected))
+        for metric, variable in expected.items():
+            self.assertAlmostEqual(results[metric].value, variable.value, places=2)
+
+    def test_precipitation_is_echoed_in_chunks(self):
+        contents = render_results(
+            PRECIPITATION_FILE, [1.5] * 12_419, "1980-12-01", SIMULATION_PARAMETERS)
+        lines = contents.splitlines()
+        self.assertEqual(lines[2], "10000;1;2419")
+        self.assertEqual(len(lines[3].split(";")), 10_001)
+        self.assertEqual(len(lines[4].split(";")), 2_420)
+
+
+class TestFakeNetuno(unittest.TestCase):
+
+    def setUp(self):
+        self.SPOOL_DIR = Path(__file__).parent / "samples" / "test-spool"
+        self.OUTPUT_PATH = self.SPOOL_DIR / "result.out.csv"
+        self.fake = FakeNetuno(self.SPOOL_DIR, latency=2, slowdown=0.5, leak_kb=4)
+
+    def _write_request(self, name: str) -> Path:
+        request_path = self.SPOOL_DIR / name
+        request_path.write_text(json.dumps({
+            "precipitation_path": str(PRECIPITATION_FILE),
+            "date": "1980-12-01",
+            "parameters": SIMULATION_PARAMETERS,
+            "output_path": str(self.OUTPUT_PATH),
+        }), encoding="utf-8")
+        return request_path
+
+    def test_process_request(self):
+        request_path = self._write_request("1.json")
+        with patch("time.sleep") as sleep_mock:
+            self.assertEqual(self.fake.process(request_path), self.OUTPUT_PATH)
+        sleep_mock.assert_called_once_with(2)
+        self.assertFalse(request_path.exists())
+        self.assertEqual(len(ResultParser(self.OUTPUT_PATH).parse_results()), 7)
+        self.assertListEqual(sorted(self.SPOOL_DIR.iterdir()), [self.OUTPUT_PATH])
+
+    def test_slowdown_and_leak(self):
+        with patch("time.sleep") as sleep_mock:
+            for index in range(3):
+                self.fake.process(self._write_request(f"{index}.json"))
+        self.assertListEqual(
+            [call.args[0] for call in sleep_mock.call_args_list], [2, 3, 4])
+        self.assertEqual(len(self.fake.leaked), 3)
+        self.assertEqual(len(self.fake.leaked[0]), 4 * 1024)
+
+    def tearDown(self):
+        for file in self.SPOOL_DIR.iterdir():
+            file.unlink()
+        self.SPOOL_DIR.rmdir()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import shutil
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from agents.indexer import InputIndex, inspect_file
+
+PATH_TO_PRECIPITATION_DIR = Path(Path(__file__).parent.parent, "example")
+SAMPLE_FILE = Path(
+    PATH_TO_PRECIPITATION_DIR, "(Netuno)Florianópolis_ACCESS-CM2_Histórico.csv")
+
+
+class TestInspectFile(unittest.TestCase):
+
+    INPUT_DIR = Path(__file__).parent / "samples" / "indexer"
+
+    def setUp(self):
+        self.INPUT_DIR.mkdir(exist_ok=True)
+
+    def test_inspect_valid_file(self):
+        entry = inspect_file(SAMPLE_FILE)
+
+        self.assertIsNone(entry.error)
+        self.assertEqual(
+            (entry.city, entry.model, entry.scenario),
+            ("Florianópolis", "ACCESS-CM2", "Histórico"))
+        self.assertEqual(entry.rows, 12419)
+        self.assertEqual(entry.size, SAMPLE_FILE.stat().st_size)
+        self.assertEqual(len(entry.digest), 64)
+
+    def test_inspect_invalid_files(self):
+        SAMPLES = {
+            "City_Model_SSP126.csv": ("1.0\n", "unknown scenario 'SSP126'"),
+            "CityModel.csv": ("1.0\n", "name is not in the format"),
+            "City_Model_SSP245.csv": ("1.0\nabc\n2.0\n", "non-numeric row"),
+            "City_Model_SSP585.csv": ("1.0\n-2.0\nnan\n", "2 negative or non-finite"),
+            "City_Other_SSP585.csv": ("\n", "no precipitation values"),
+        }
+        for file_name, (contents, error) in SAMPLES.items():
+            with self.subTest(file_name=file_name):
+                file = Path(self.INPUT_DIR, file_name)
+                file.write_text(contents, encoding="utf-8")
+
+                self.assertIn(error, inspect_file(file).error)
+
+    def tearDown(self):
+        shutil.rmtree(self.INPUT_DIR)
+
+
+class TestInputIndex(unittest.TestCase):
+
+    INPUT_DIR = Path(__file__).parent / "samples" / "indexer"
+    INDEX_PATH = Path(__file__).parent / "samples" / "index.sqlite"
+
+    def setUp(self):
+        shutil.copytree(PATH_TO_PRECIPITATION_DIR, self.INPUT_DIR)
+        self.files = sorted(self.INPUT_DIR.iterdir())
+        self.index = InputIndex(self.INDEX_PATH)
+
+    def test_build(self):
+        entries = self.index.build(self.files, 2)
+
+        self.assertListEqual([entry.path.name for entry in entries],
+                             [file.name for file in self.files])
+        self.assertTrue(all(entry.error is None for entry in entries))
+        self.assertEqual(
+            self.index.connection.execute("SELECT COUNT(*) FROM files").fetchone()[0],
+            len(self.files))
+
+    def test_build_reuses_unchanged_files(self):
+        self.index.build(self.files, 2)
+        with patch("agents.indexer.ParallelDispatcher") as mock_dispatcher:
+            entries = self.index.build(self.files, 2)
+
+        mock_dispatcher.assert_not_called()
+        self.assertEqual(len(entries), len(self.files))
+
+    def test_build_reindexes_changed_files(self):
+        self.index.build(self.files, 2)
+        changed = next(
+            index for index, file in enumerate(self.files) if "Florianópolis" in file.name)
+        with open(self.files[changed], "a", encoding="utf-8") as changed_file:
+            changed_file.write("1.0\n")
+        entries = self.index.build(self.files, 2)
+
+        self.assertIn(
+            "12420 rows, while most files of scenario 'Histórico' have 12419",
+            entries.pop(changed).error)
+        self.assertTrue(all(entry.error is None for entry in entries))
+
+    def test_build_drops_missing_files(self):
+        self.index.build(self.files, 2)
+        self.index.build(self.files[1:], 2)
+
+        self.assertEqual(
+            self.index.connection.execute("SELECT COUNT(*) FROM files").fetchone()[0],
+            len(self.files) - 1)
+
+    def tearDown(self):
+        self.index.close()
+        self.INDEX_PATH.unlink(missing_ok=True)
+        shutil.rmtree(self.INPUT_DIR)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pyautogui
+from PIL import Image
+
+from agents.locator import TemplateLocator
+from globals.constants import PATH_TO_LOWER_TANK_RADIO_BUTTON
+
+MOCK_PATHS = {
+    "locate": "pyautogui.locate",
+    "locate_center": "pyautogui.locateCenterOnScreen",
+    "screenshot": "pyautogui.screenshot",
+    "center": "pyautogui.center",
+    "windows": "pyautogui.getWindowsWithTitle",
+}
+
+
+def window(left: int, top: int, width: int = 800, height: int = 600) -> MagicMock:
+    return MagicMock(visible=True, left=left, top=top, width=width, height=height)
+
+
+class TestTemplateLocator(unittest.TestCase):
+
+    def setUp(self):
+        self.locator = TemplateLocator(PATH_TO_LOWER_TANK_RADIO_BUTTON, margin=10)
+        self.height, self.width = self.locator._get_template().shape
+
+    def test_template_is_loaded_once(self):
+        locator = TemplateLocator(PATH_TO_LOWER_TANK_RADIO_BUTTON)
+        with patch("PIL.Image.open", wraps=Image.open) as open_mock:
+            first, second = locator._get_template(), locator._get_template()
+        open_mock.assert_called_once()
+        self.assertIs(first, second)
+        self.assertEqual(first.ndim, 2)
+
+    def test_first_search_is_full_screen(self):
+        with (
+                patch(MOCK_PATHS["windows"], create=True, return_value=[window(100, 50)]),
+                patch(MOCK_PATHS["locate"]) as locate_mock,
+                patch(MOCK_PATHS["locate_center"], return_value=(300, 200)) as center_mock):
+            self.assertEqual(self.locator.locate(), (300, 200))
+        locate_mock.assert_not_called()
+        center_mock.assert_called_once()
+        self.assertEqual(center_mock.call_args.args[0].ndim, 2)
+        self.assertEqual((self.locator.hits, self.locator.misses), (0, 1))
+        self.assertEqual(self.locator.last_hit, (300, 200))
+        self.assertEqual(self.locator.window_geometry, (100, 50, 800, 600))
+
+    def test_region_hit_follows_the_window(self):
+        with (
+                patch(
+                    MOCK_PATHS["windows"], create=True,
+                    side_effect=[[window(100, 50)], [window(130, 60)]]),
+                patch(MOCK_PATHS["screenshot"]) as screenshot_mock,
+                patch(MOCK_PATHS["locate"], return_value=(10, 10, self.width, self.height)),
+                patch(MOCK_PATHS["locate_center"], return_value=(300, 200)) as center_mock):
+            self.locator.locate()
+            position = self.locator.locate()
+        center_mock.assert_called_once()
+        left = 330 - self.width // 2 - 10
+        top = 210 - self.height // 2 - 10
+        screenshot_mock.assert_called_once_with(
+            region=(left, top, self.width + 20, self.height + 20))
+        self.assertEqual(
+            position, (left + 10 + self.width // 2, top + 10 + self.height // 2))
+        self.assertEqual((self.locator.hits, self.locator.misses), (1, 1))
+
+    def test_region_miss_falls_back_to_full_screen(self):
+        with (
+                patch(MOCK_PATHS["windows"], create=True, return_value=[window(100, 50)]),
+                patch(MOCK_PATHS["screenshot"]),
+                patch(MOCK_PATHS["locate"], side_effect=pyautogui.ImageNotFoundException),
+                patch(MOCK_PATHS["locate_center"], side_effect=[(300, 200), (500, 400)])):
+            self.locator.locate()
+            self.assertEqual(self.locator.locate(), (500, 400))
+        self.assertEqual((self.locator.hits, self.locator.misses), (0, 2))
+        self.assertEqual(self.locator.last_hit, (500, 400))
+
+    def test_resized_window_skips_region_search(self):
+        with (
+                patch(
+                    MOCK_PATHS["windows"], create=True,
+                    side_effect=[[window(100, 50)], [window(100, 50, 1024, 768)]]),
+                patch(MOCK_PATHS["locate"]) as locate_mock,
+                patch(MOCK_PATHS["locate_center"], return_value=(300, 200)) as center_mock):
+            self.locator.locate()
+            self.locator.locate()
+        locate_mock.assert_not_called()
+        self.assertEqual(center_mock.call_count, 2)
+
+    def test_without_window_uses_screen_position(self):
+        with (
+                patch(
+                    MOCK_PATHS["windows"], create=True,
+                    side_effect=pyautogui.PyAutoGUIException),
+                patch(MOCK_PATHS["screenshot"]),
+                patch(MOCK_PATHS["locate"], return_value=(10, 10, self.width, self.height)),
+                patch(MOCK_PATHS["locate_center"], return_value=(300, 200)) as center_mock):
+            self.locator.locate()
+            self.locator.locate()
+        center_mock.assert_called_once()
+        self.assertIsNone(self.locator.window_geometry)
+        self.assertEqual(self.locator.hits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
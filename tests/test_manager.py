@@ -1,9 +1,14 @@
 import logging
+import subprocess
+import sys
 import unittest
 from pathlib import Path
 from unittest.mock import MagicMock, call, patch
 
 from agents.manager import ProcessManager, logger
+from agents.readiness import IdleProbe
+from globals.constants import NETUNO_EXIT_TIMEOUT
+from globals.errors import NetunoStartupTimeoutError
 
 MOCK_STRINGS = {
     "popen": "subprocess.Popen",
@@ -36,6 +41,43 @@ class TestProcessManager(unittest.TestCase):
             sleep_mock.assert_called_once_with(5)
         self.assertEqual(result, new_process)
 
+    def test_run_python_script(self):
+        manager = ProcessManager(0)
+        path = Path(__file__).parent.parent / "fake_netuno.py"
+        with patch(MOCK_STRINGS["popen"]) as popen_mock, patch(MOCK_STRINGS["sleep"]):
+            manager.run_netuno(path)
+            popen_mock.assert_called_once_with(args=(sys.executable, path))
+
+    def test_run_netuno_with_probe(self):
+        probe = MagicMock()
+        probe.wait_until_ready.return_value = 0.25
+        manager = ProcessManager(probe=probe)
+        with (
+                patch(MOCK_STRINGS["popen"]) as popen_mock,
+                patch(MOCK_STRINGS["sleep"]) as sleep_mock,
+                self.assertLogs(logger, level=logging.DEBUG) as log_context):
+            manager.run_netuno(Path(__file__).parent / "netuno.exe")
+        probe.wait_until_ready.assert_called_once_with(popen_mock.return_value)
+        sleep_mock.assert_not_called()
+        self.assertIn("ready after 0.250s", log_context.output[0])
+
+    def test_run_netuno_probe_timeout_terminates_process(self):
+        manager = ProcessManager(probe=IdleProbe(timeout=0.05, tick=0.01))
+        with (
+                patch(MOCK_STRINGS["popen"]) as popen_mock,
+                patch.object(IdleProbe, "is_ready", return_value=False)):
+            popen_mock.return_value.poll.return_value = None
+            with self.assertRaises(NetunoStartupTimeoutError):
+                manager.run_netuno(Path(__file__).parent / "netuno.exe")
+        popen_mock.return_value.terminate.assert_called_once()
+
+    def test_terminate(self):
+        manager = ProcessManager(0)
+        manager.terminate()
+        manager.current_process = MagicMock()
+        manager.terminate()
+        manager.current_process.terminate.assert_called_once()
+
     def test_restart_netuno(self):
         path = Path(__file__).parent / "netuno.exe"
         manager = ProcessManager(5)
@@ -68,6 +110,23 @@ class TestProcessManager(unittest.TestCase):
             self.assertIn(EXPECTED_LOG_MESSAGES[2], log_context.output[2])
 
         self.assertEqual(manager.current_process, second_process)
+        first_process.wait.assert_called_once_with(timeout=NETUNO_EXIT_TIMEOUT)
+        first_process.kill.assert_not_called()
+
+    def test_restart_netuno_kills_stuck_process(self):
+        manager = ProcessManager(0)
+        stuck_process = MagicMock()
+        stuck_process.args = ("netuno.exe",)
+        stuck_process.wait.side_effect = [
+            subprocess.TimeoutExpired("netuno.exe", NETUNO_EXIT_TIMEOUT), 0]
+        manager.current_process = stuck_process
+        with (
+                patch(MOCK_STRINGS["popen"]),
+                patch(MOCK_STRINGS["sleep"]),
+                self.assertLogs(logger, level=logging.WARNING) as log_context):
+            manager.restart_netuno()
+        stuck_process.kill.assert_called_once()
+        self.assertIn("killing it", log_context.output[0])
 
 
 if __name__ == "__main__":
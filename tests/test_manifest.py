@@ -0,0 +1,61 @@
+import os
+import unittest
+from pathlib import Path
+
+from agents.manifest import RunManifest
+
+
+class TestRunManifest(unittest.TestCase):
+
+    BASE_PATH = Path(__file__).parent / "samples"
+    MANIFEST_PATH = BASE_PATH / "test.manifest.sqlite"
+    INPUT_PATH = BASE_PATH / "test-input.csv"
+
+    def setUp(self):
+        self.INPUT_PATH.write_text("1.0\n2.0\n", encoding="utf-8")
+        self.manifest = RunManifest(self.MANIFEST_PATH)
+
+    def test_path_for(self):
+        self.assertEqual(
+            RunManifest.path_for(Path("results", "2020-11-05T23-45-consolidated.csv")),
+            Path("results", "2020-11-05T23-45-consolidated.manifest.sqlite"))
+
+    def test_empty_manifest(self):
+        self.assertIsNone(self.manifest.output_size)
+        self.assertFalse(self.manifest.is_completed(self.INPUT_PATH))
+
+    def test_mark_completed(self):
+        self.manifest.mark_completed([self.INPUT_PATH], 123)
+
+        self.assertTrue(self.manifest.is_completed(self.INPUT_PATH))
+        self.assertEqual(self.manifest.output_size, 123)
+
+    def test_persistence(self):
+        self.manifest.mark_completed([self.INPUT_PATH], 123)
+        self.manifest.close()
+
+        self.manifest = RunManifest(self.MANIFEST_PATH)
+        self.assertTrue(self.manifest.is_completed(self.INPUT_PATH))
+        self.assertEqual(self.manifest.output_size, 123)
+
+    def test_modified_file_not_completed(self):
+        self.manifest.mark_completed([self.INPUT_PATH], 123)
+        self.INPUT_PATH.write_text("1.0\n2.0\n3.0\n", encoding="utf-8")
+
+        self.assertFalse(self.manifest.is_completed(self.INPUT_PATH))
+
+    def test_touched_file_not_completed(self):
+        self.manifest.mark_completed([self.INPUT_PATH], 123)
+        status = self.INPUT_PATH.stat()
+        os.utime(self.INPUT_PATH, ns=(status.st_atime_ns, status.st_mtime_ns + 10**9))
+
+        self.assertFalse(self.manifest.is_completed(self.INPUT_PATH))
+
+    def tearDown(self):
+        self.manifest.close()
+        self.MANIFEST_PATH.unlink(missing_ok=True)
+        self.INPUT_PATH.unlink(missing_ok=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
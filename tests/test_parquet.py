@@ -0,0 +1,64 @@
+import unittest
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import time_machine
+
+from agents.parquet import ParquetExporter
+from globals.constants import OUTPUT_COLUMNS
+
+ZONE_INFO = ZoneInfo("America/Sao_Paulo")
+
+
+class TestParquetExporter(unittest.TestCase):
+
+    OUTPUT_PATH = Path(__file__).parent / "samples" / "test.parquet"
+    RESULT = ("city", "model", "scenario", "metric", "label", 3.14, "unit")
+
+    @time_machine.travel(datetime(1998, 5, 30, 13, 1, tzinfo=ZONE_INFO))
+    def test_get_base_file_name(self):
+        exporter = ParquetExporter(Path(__file__).parent)
+        self.assertEqual(
+            exporter._get_base_file_name(), "1998-05-30T13-01-consolidated.parquet")
+
+    def test_schema(self):
+        COLUMNS = OUTPUT_COLUMNS + ("catchment_area",)
+        exporter = ParquetExporter(Path(__file__).parent, COLUMNS)
+        self.assertListEqual(exporter.schema.names, list(exporter.columns))
+        self.assertEqual(exporter.schema.field("city").type,
+                         pa.dictionary(pa.int32(), pa.string()))
+        self.assertEqual(exporter.schema.field("value").type, pa.float64())
+        self.assertEqual(exporter.schema.field("catchment_area").type, pa.float64())
+
+    def test_schema_wide_layout(self):
+        exporter = ParquetExporter(Path(__file__).parent, layout="wide")
+        self.assertEqual(exporter.schema.field("scenario").type,
+                         pa.dictionary(pa.int32(), pa.string()))
+        self.assertEqual(exporter.schema.field("potential_savings").type, pa.float64())
+
+    def test_save_results_row_groups(self):
+        exporter = ParquetExporter(Path(__file__).parent, flush_rows=2)
+        exporter.output_path = self.OUTPUT_PATH
+        exporter.add_results([self.RESULT] * 2)
+        output_file = exporter.output_file
+        exporter.add_results([self.RESULT[:5] + (1.16, "unit")])
+        exporter.save_results()
+        self.assertIs(exporter.output_file, output_file)
+        exporter.close()
+
+        results_file = pq.ParquetFile(self.OUTPUT_PATH)
+        self.assertEqual(results_file.num_row_groups, 2)
+        table = results_file.read()
+        self.assertListEqual(table.column("value").to_pylist(), [3.14, 3.14, 1.16])
+        self.assertListEqual(table.column("city").to_pylist(), ["city"] * 3)
+        self.assertTrue(pa.types.is_dictionary(table.schema.field("city").type))
+
+    def tearDown(self):
+        self.OUTPUT_PATH.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,15 @@
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
-from agents.parsers import FileNameParser, ResultParser
+from agents.parsers import FileNameParser, PrecipitationParser, ResultParser
+from globals.constants import SIMULATION_OUTPUT_ATTRIBUTES, SIMULATION_PARAMETERS
+from globals.errors import (
+    IncompleteResultsError, MismatchedSettingError, UnknownResultLabelError)
 from globals.types import Variable
 
 PATH_TO_SIMULATION_RESULT = Path(Path(__file__).parent, "samples", "simulation_result.csv")
+PATH_TO_PRECIPITATION_DIR = Path(Path(__file__).parent.parent, "example")
 PARSED_SAMPLE = [
     {
         "label": "Potencial de economia (%)",
@@ -110,8 +115,46 @@ class TestFileNameParser(unittest.TestCase):
         self.assertTupleEqual(result, ("Curitiba", "AC-CE-SS-CM2", "Histórico"))
 
 
+class TestPrecipitationParser(unittest.TestCase):
+
+    def test_to_list(self):
+        path = Path(
+            PATH_TO_PRECIPITATION_DIR, "(Netuno)Florianópolis_ACCESS-CM2_Histórico.csv")
+        result = PrecipitationParser(path).to_list()
+
+        self.assertEqual(len(result), 12419)
+        self.assertListEqual(result[:4], [30.052086, 12.267576, 3.444243, 0])
+
+    def test_to_array(self):
+        path = Path(
+            PATH_TO_PRECIPITATION_DIR, "(Netuno)Florianópolis_ACCESS-CM2_Histórico.csv")
+        parser = PrecipitationParser(path)
+        result = parser.to_array()
+
+        self.assertEqual(result.shape, (12419,))
+        self.assertListEqual(result.tolist(), parser.to_list())
+
+    def test_to_array_from_content(self):
+        path = Path(
+            PATH_TO_PRECIPITATION_DIR, "(Netuno)Florianópolis_ACCESS-CM2_Histórico.csv")
+        parser = PrecipitationParser(path)
+        result = parser.to_array(path.read_bytes())
+
+        self.assertListEqual(result.tolist(), parser.to_array().tolist())
+
+    def test_to_list_ignores_blank_rows(self):
+        path = Path(__file__).parent / "samples" / "blank_rows.csv"
+        path.write_text("1.5\n\n2\n\n")
+        result = PrecipitationParser(path).to_list()
+        path.unlink()
+
+        self.assertListEqual(result, [1.5, 2])
+
+
 class TestResultsParser(unittest.TestCase):
 
+    MODIFIED_RESULT = Path(Path(__file__).parent, "samples", "modified_result.csv")
+
     @classmethod
     def setUpClass(cls):
         cls.parser = ResultParser(PATH_TO_SIMULATION_RESULT)
@@ -139,6 +182,63 @@ class TestResultsParser(unittest.TestCase):
 
         self.assertDictEqual(actual_results, SAMPLE_RESULTS)
 
+    def test_read_results_section_small_chunks(self):
+        with patch("agents.parsers.TAIL_CHUNK_SIZE", 7):
+            actual_results = self.parser._get_results()
+
+        self.assertListEqual(actual_results, PARSED_SAMPLE)
+
+    def test_parse_results_reordered(self):
+        lines = self._read_sample()
+        self._write_sample(lines[:-7] + lines[:-8:-1])
+
+        self.assertDictEqual(
+            ResultParser(self.MODIFIED_RESULT).parse_results(), SAMPLE_RESULTS)
+
+    def test_parse_results_unknown_label(self):
+        lines = self._read_sample()
+        self._write_sample(lines[:-1] + ["Nova métrica (%);1,00"])
+
+        with self.assertRaises(UnknownResultLabelError):
+            ResultParser(self.MODIFIED_RESULT).parse_results()
+
+    def test_parse_results_missing_metric(self):
+        self._write_sample(self._read_sample()[:-1])
+
+        with self.assertRaises(IncompleteResultsError) as context:
+            ResultParser(self.MODIFIED_RESULT).parse_results()
+        self.assertIn("period_when_demand_is_not_met", str(context.exception))
+
+    def test_parse_results_without_results_section(self):
+        self._write_sample(self._read_sample()[:-9])
+
+        with self.assertRaises(IncompleteResultsError):
+            ResultParser(self.MODIFIED_RESULT).parse_results()
+
+    def test_check_settings_from_sample(self):
+        self.parser.check_settings(
+            Path("(Netuno)Florianópolis_ACCESS-CM2_Histórico.csv"), "01/12/1980",
+            SIMULATION_PARAMETERS)
+
+    def test_check_settings_mismatched(self):
+        MISMATCHES = [
+            ("precipitation_path", "(Netuno)Vitória_ACCESS-CM2_Histórico.csv",
+             "01/12/1980", SIMULATION_PARAMETERS),
+            ("date", "(Netuno)Florianópolis_ACCESS-CM2_Histórico.csv", "01/12/1988",
+             SIMULATION_PARAMETERS),
+            ("catchment_area", "(Netuno)Florianópolis_ACCESS-CM2_Histórico.csv",
+             "01/12/1980", SIMULATION_PARAMETERS | {"catchment_area": 5}),
+            ("rainwater_replacement_percentage",
+             "(Netuno)Florianópolis_ACCESS-CM2_Histórico.csv", "01/12/1980",
+             SIMULATION_PARAMETERS | {"rainwater_replacement_percentage": 4}),
+        ]
+        for setting, file_name, date, parameters in MISMATCHES:
+            with (
+                    self.subTest(setting=setting),
+                    self.assertRaises(MismatchedSettingError) as context):
+                self.parser.check_settings(Path(file_name), date, parameters)
+            self.assertIn(f"as '{setting}'", str(context.exception))
+
     def test_results_to_list(self):
         actual_results = self.parser.to_list("Florianópolis", "ACCESS-CM2", "Histórico")
         EXPECTED_RESULT = [
@@ -164,6 +264,19 @@ class TestResultsParser(unittest.TestCase):
 
         self.assertListEqual(actual_results, EXPECTED_RESULT)
 
+    def _read_sample(self) -> list[str]:
+        with open(PATH_TO_SIMULATION_RESULT,
+                  encoding=SIMULATION_OUTPUT_ATTRIBUTES["encoding"]) as sample_file:
+            return sample_file.read().rstrip().splitlines()
+
+    def _write_sample(self, lines: list[str]) -> None:
+        with open(self.MODIFIED_RESULT, "w",
+                  encoding=SIMULATION_OUTPUT_ATTRIBUTES["encoding"]) as modified_file:
+            modified_file.write("\n".join(lines) + "\n")
+
+    def tearDown(self):
+        self.MODIFIED_RESULT.unlink(missing_ok=True)
+
 
 if __name__ == '__main__':
     unittest.main()
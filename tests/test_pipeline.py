@@ -0,0 +1,85 @@
+import threading
+import time
+import unittest
+from contextlib import closing
+
+from agents.pipeline import Pipeline
+
+
+def square(value: int) -> int:
+    return value * value
+
+
+def fail_on_three(value: int) -> int:
+    if value == 3:
+        raise ValueError("Unexpected value")
+    return value * value
+
+
+class TestPipeline(unittest.TestCase):
+
+    def test_imap_preserves_order(self):
+        results = list(Pipeline().imap(square, range(10)))
+        self.assertListEqual(results, [(value, value * value) for value in range(10)])
+
+    def test_imap_empty(self):
+        self.assertListEqual(list(Pipeline().imap(square, [])), [])
+
+    def test_imap_runs_in_background(self):
+        threads = set()
+
+        def record_thread(value: int) -> int:
+            threads.add(threading.current_thread())
+            return value
+
+        list(Pipeline().imap(record_thread, range(3)))
+        self.assertEqual(len(threads), 1)
+        self.assertNotIn(threading.current_thread(), threads)
+
+    def test_imap_overlaps_stage_and_consumer(self):
+        def slow_square(value: int) -> int:
+            time.sleep(0.05)
+            return value * value
+
+        start = time.perf_counter()
+        for _ in Pipeline().imap(slow_square, range(6)):
+            time.sleep(0.05)
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    def test_imap_is_bounded(self):
+        taken = []
+
+        def tasks():
+            for value in range(100):
+                taken.append(value)
+                yield value
+
+        pipeline = Pipeline(depth=2)
+        with closing(pipeline.imap(square, tasks())) as results:
+            next(results)
+            self.assertLessEqual(len(taken), 3)
+
+    def test_imap_raises_error_in_order(self):
+        results = []
+        with self.assertRaisesRegex(ValueError, "Unexpected value"):
+            for task, result in Pipeline().imap(fail_on_three, range(6)):
+                results.append(task)
+        self.assertListEqual(results, [0, 1, 2])
+
+    def test_imap_stops_stage_when_closed(self):
+        done = []
+        threads = set()
+
+        def record(value: int) -> int:
+            threads.add(threading.current_thread())
+            done.append(value)
+            return value
+
+        with closing(Pipeline(depth=2).imap(record, range(100))) as results:
+            next(results)
+        self.assertLessEqual(len(done), 2)
+        self.assertFalse(any(thread.is_alive() for thread in threads))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+import unittest
+from pathlib import Path
+from unittest.mock import call, patch
+
+import pyautogui
+
+from agents.automators import NetunoAutomator
+from agents.plans import KeystrokePlan, PlannedAutomator, keys, value_keys
+from agents.tracer import PhaseTracer
+from globals.constants import NETUNO_RESULTS_PATH, PLAN_KEY_INTERVAL, SIMULATION_PARAMETERS
+from globals.types import PlanStep
+
+MOCK_PATHS = {
+    "press": "pyautogui.press",
+    "write": "pyautogui.write",
+    "key_down": "pyautogui.keyDown",
+    "key_up": "pyautogui.keyUp",
+    "left_click": "pyautogui.leftClick",
+    "lower_tank": "agents.automators.Mover.to_lower_tank_radio_button",
+    "sleep": "time.sleep",
+}
+
+
+def record_keys(automator: NetunoAutomator, run, *args, **kwargs) -> list[str]:
+    """Runs an automator with PyAutoGUI mocked, returning every key pressed, in order."""
+    pressed = []
+
+    def press(keys, presses=1, **_):
+        pressed.extend(([keys] if isinstance(keys, str) else list(keys)) * presses)
+
+    def write(message, **_):
+        pressed.extend(message)
+
+    with (
+            patch(MOCK_PATHS["press"], side_effect=press),
+            patch(MOCK_PATHS["write"], side_effect=write),
+            patch(MOCK_PATHS["key_down"], side_effect=lambda key: pressed.append(key)),
+            patch(MOCK_PATHS["key_up"]),
+            patch(MOCK_PATHS["left_click"], side_effect=lambda: pressed.append("click")),
+            patch(MOCK_PATHS["lower_tank"]),
+            patch(MOCK_PATHS["sleep"])):
+        getattr(automator, run)(*args, **kwargs)
+    return pressed
+
+
+class TestKeystrokePlan(unittest.TestCase):
+
+    def test_value_keys(self):
+        self.assertTupleEqual(value_keys(1000.75), ("1", "0", "0", "0", ",", "7", "5"))
+
+    def test_consecutive_keys_are_merged(self):
+        plan = KeystrokePlan((
+            keys(("tab",)),
+            keys(("up", "up")),
+            PlanStep("pause"),
+            keys(("space",)),
+            keys(("tab",), phase="simulate_export"),
+            keys(()),
+        ))
+        self.assertTupleEqual(plan.steps, (
+            PlanStep("keys", ("tab", "up", "up")),
+            PlanStep("pause"),
+            PlanStep("keys", ("space",)),
+            PlanStep("keys", ("tab",), phase="simulate_export"),
+        ))
+        self.assertEqual(plan.keystrokes, 5)
+
+    def test_simulation_plan(self):
+        plan = KeystrokePlan.simulation()
+        self.assertListEqual(
+            [step.kind for step in plan],
+            ["keys", "paste", "keys", "date", "keys", "keys", "pause", "keys", "paste"])
+        self.assertListEqual(
+            [step.slot for step in plan if step.slot],
+            ["precipitation_path", "date", "export_path"])
+        self.assertEqual(plan.keystrokes, 8 + 3 + 2 + 15 + 3)
+
+    def test_first_simulation_saturates_parameters(self):
+        parameters = SIMULATION_PARAMETERS | {
+            "rainwater_replacement_percentage": 150, "coefficient_of_loss": 2.5}
+        plan = KeystrokePlan.first_simulation(**parameters)
+        self.assertTupleEqual(
+            plan.steps, KeystrokePlan.first_simulation(
+                **parameters | {
+                    "rainwater_replacement_percentage": 100, "coefficient_of_loss": 1.0}
+                ).steps)
+
+    def test_estimate_duration(self):
+        plan = KeystrokePlan.simulation()
+        self.assertAlmostEqual(
+            plan.estimate_duration(key_interval=0.01, keystroke_pause=0.1, explorer_wait=1),
+            0.31 + 0.1 + 0.1 + 2 * 1.4)
+
+
+class TestPlannedAutomator(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.precipitation_path = Path("example", "Rio de Janeiro_ACCESS-CM2_SSP245.csv")
+        cls.export_path = Path(
+            NETUNO_RESULTS_PATH, "Rio de Janeiro_ACCESS-CM2_SSP245.out.csv")
+
+    def test_first_simulation_sends_the_same_keys(self):
+        expected = record_keys(
+            NetunoAutomator(0), "run_first_simulation", self.precipitation_path,
+            "01/01/2015", **SIMULATION_PARAMETERS)
+        self.assertListEqual(
+            record_keys(
+                PlannedAutomator(0), "run_first_simulation", self.precipitation_path,
+                "01/01/2015", **SIMULATION_PARAMETERS),
+            expected)
+
+    def test_simulation_sends_the_same_keys(self):
+        netuno_automator = NetunoAutomator(0)
+        planned_automator = PlannedAutomator(0)
+        for date in ("01/01/2015", "01/01/2015", "01/01/1980"):
+            self.assertListEqual(
+                record_keys(
+                    planned_automator, "run_simulation", self.precipitation_path, date),
+                record_keys(
+                    netuno_automator, "run_simulation", self.precipitation_path, date))
+
+    def test_keys_are_batched(self):
+        automator = PlannedAutomator(0)
+        with (
+                patch(MOCK_PATHS["press"]),
+                patch(MOCK_PATHS["write"]) as write_mock,
+                patch(MOCK_PATHS["key_down"]),
+                patch(MOCK_PATHS["key_up"]),
+                patch(MOCK_PATHS["sleep"])):
+            export_path = automator.run_simulation(self.precipitation_path, "01/01/2015")
+        self.assertEqual(export_path, self.export_path)
+        self.assertEqual(write_mock.call_count, 6)
+        self.assertEqual(
+            write_mock.call_args_list[0],
+            call(
+                ["tab"] * 5 + ["up"] * 3 + ["down", "down", "up"],
+                interval=PLAN_KEY_INTERVAL, _pause=False))
+
+    def test_first_plans_are_cached(self):
+        automator = PlannedAutomator(0)
+        with patch("agents.plans.PlannedAutomator.replay") as replay_mock:
+            automator.run_first_simulation(
+                self.precipitation_path, "01/01/2015", **SIMULATION_PARAMETERS)
+            automator.run_first_simulation(
+                self.precipitation_path, "01/01/2015", **SIMULATION_PARAMETERS)
+        self.assertEqual(len(automator.first_plans), 1)
+        self.assertIs(replay_mock.call_args_list[0].args[0], replay_mock.call_args.args[0])
+
+    def test_set_delays(self):
+        automator = PlannedAutomator(0)
+        original_pause = pyautogui.PAUSE
+        automator.set_delays(keystroke_pause=0.005, explorer_wait=0.3)
+        self.assertEqual(automator.key_interval, 0.005)
+        automator.set_delays(keystroke_pause=0.08, explorer_wait=0.3)
+        self.assertEqual(automator.key_interval, PLAN_KEY_INTERVAL)
+        self.assertEqual(automator.wait, 0.3)
+        pyautogui.PAUSE = original_pause
+
+    def test_phases_are_traced(self):
+        automator = PlannedAutomator(0, PhaseTracer())
+        record_keys(automator, "run_simulation", self.precipitation_path, "01/01/2015")
+        self.assertDictEqual(
+            {
+                phase: len(durations)
+                for phase, durations in automator.tracer.durations.items()},
+            {"file_selection": 2, "date_typing": 1, "simulate_export": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import subprocess
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+from agents.readiness import (
+    FixedWaitProbe, IdleProbe, PollingProbe, ResponseProbe, WindowProbe)
+from globals.errors import (
+    CustomTimeoutError, NetunoExitedError, NetunoStartupTimeoutError,
+    NetunoUnresponsiveError)
+
+
+class TestFixedWaitProbe(unittest.TestCase):
+
+    def test_wait_until_ready(self):
+        with patch("time.sleep") as sleep_mock:
+            self.assertEqual(FixedWaitProbe(2).wait_until_ready(MagicMock()), 2)
+        sleep_mock.assert_called_once_with(2)
+
+
+class TestPollingProbe(unittest.TestCase):
+
+    def setUp(self):
+        self.process = MagicMock()
+        self.process.pid = 1234
+        self.process.poll.return_value = None
+
+    def test_returns_once_ready(self):
+        probe = PollingProbe(timeout=1, tick=0.001)
+        with patch.object(PollingProbe, "is_ready", side_effect=[False, False, True]):
+            self.assertLess(probe.wait_until_ready(self.process), 1)
+
+    def test_timeout(self):
+        probe = PollingProbe(timeout=0.02, tick=0.001)
+        with (
+                patch.object(PollingProbe, "is_ready", return_value=False),
+                self.assertRaises(NetunoStartupTimeoutError) as context):
+            probe.wait_until_ready(self.process)
+        self.assertIn("not ready after 0.02 seconds", str(context.exception))
+        self.assertIsInstance(context.exception.__cause__, CustomTimeoutError)
+
+    def test_process_exited(self):
+        self.process.poll.return_value = 3
+        with self.assertRaises(NetunoExitedError) as context:
+            PollingProbe(timeout=1, tick=0.001).wait_until_ready(self.process)
+        self.assertIn("#1234 exited with code 3", str(context.exception))
+
+
+def window_pid(window: MagicMock) -> int:
+    return window.pid
+
+
+class TestWindowProbe(unittest.TestCase):
+
+    def test_is_ready(self):
+        hidden = MagicMock(visible=False, pid=1234)
+        shown = MagicMock(visible=True, pid=1234)
+        pyautogui_mock = MagicMock()
+        pyautogui_mock.getWindowsWithTitle.side_effect = [[], [hidden], [hidden, shown]]
+        probe = WindowProbe(title="Netuno 4")
+        with (
+                patch.dict(sys.modules, {"pyautogui": pyautogui_mock}),
+                patch.object(WindowProbe, "_get_window_pid", staticmethod(window_pid))):
+            self.assertListEqual(
+                [probe.is_ready(MagicMock(pid=1234)) for _ in range(3)],
+                [False, False, True])
+        pyautogui_mock.getWindowsWithTitle.assert_called_with("Netuno 4")
+
+    def test_ignores_windows_of_other_processes(self):
+        closing = MagicMock(visible=True, pid=1234)
+        starting = MagicMock(visible=True, pid=5678)
+        pyautogui_mock = MagicMock()
+        pyautogui_mock.getWindowsWithTitle.side_effect = [[closing], [closing, starting]]
+        probe = WindowProbe(title="Netuno 4")
+        with (
+                patch.dict(sys.modules, {"pyautogui": pyautogui_mock}),
+                patch.object(WindowProbe, "_get_window_pid", staticmethod(window_pid))):
+            self.assertListEqual(
+                [probe.is_ready(MagicMock(pid=5678)) for _ in range(2)], [False, True])
+
+
+class TestIdleProbe(unittest.TestCase):
+
+    def test_is_ready_after_consecutive_idle_checks(self):
+        process = MagicMock()
+        process.pid = 1234
+        with patch("psutil.Process") as process_mock:
+            process_mock.return_value.pid = 1234
+            process_mock.return_value.cpu_percent.side_effect = [0, 80, 1, 0, 50, 0, 0]
+            probe = IdleProbe(checks=2)
+            readings = [probe.is_ready(process) for _ in range(7)]
+        self.assertListEqual(readings, [False, False, False, True, False, False, True])
+
+    def test_idle_process(self):
+        process = subprocess.Popen(
+            args=(sys.executable, "-c", "import time; time.sleep(10)"))
+        try:
+            waited = IdleProbe(timeout=5, tick=0.02, checks=3).wait_until_ready(process)
+        finally:
+            process.terminate()
+            process.wait()
+        self.assertLess(waited, 5)
+
+
+class TestResponseProbe(unittest.TestCase):
+
+    def setUp(self):
+        self.netuno = MagicMock(title="Netuno 4")
+        self.explorer = MagicMock(title="Abrir")
+        self.pyautogui_mock = MagicMock()
+
+    def test_wait_for_explorer(self):
+        self.pyautogui_mock.getActiveWindow.side_effect = [
+            self.netuno, None, self.explorer]
+        with patch.dict(sys.modules, {"pyautogui": self.pyautogui_mock}):
+            waited = ResponseProbe(timeout=1, tick=0.001).wait_for_explorer()
+        self.assertLess(waited, 1)
+        self.assertEqual(self.pyautogui_mock.getActiveWindow.call_count, 3)
+
+    def test_wait_for_netuno(self):
+        self.pyautogui_mock.getActiveWindow.side_effect = [self.explorer, self.netuno]
+        with patch.dict(sys.modules, {"pyautogui": self.pyautogui_mock}):
+            waited = ResponseProbe(timeout=1, tick=0.001).wait_for_netuno()
+        self.assertLess(waited, 1)
+        self.assertEqual(self.pyautogui_mock.getActiveWindow.call_count, 2)
+
+    def test_unresponsive(self):
+        self.pyautogui_mock.getActiveWindow.return_value = self.netuno
+        with (
+                patch.dict(sys.modules, {"pyautogui": self.pyautogui_mock}),
+                self.assertRaises(NetunoUnresponsiveError) as context):
+            ResponseProbe(timeout=0.02, tick=0.001).wait_for_explorer()
+        self.assertIn("not showing Windows Explorer after 0.02", str(context.exception))
+        self.assertIsInstance(context.exception.__cause__, CustomTimeoutError)
+
+
+if __name__ == "__main__":
+    unittest.main()
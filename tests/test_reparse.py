@@ -0,0 +1,97 @@
+import logging
+import shutil
+import unittest
+from argparse import Namespace
+from pathlib import Path
+
+from globals.constants import OUTPUT_COLUMNS
+from globals.errors import (
+    InvalidFlushThresholdError, InvalidSourceDirectoryError, InvalidWorkersError)
+from reparse import (
+    find_results_files, logger, main, parse_results_file, validate_arguments)
+from tests.test_parsers import PATH_TO_SIMULATION_RESULT
+
+RESULTS_FILE_NAMES = (
+    "Florianópolis_ACCESS-CM2_Histórico.out.csv",
+    "São Paulo_GFDL-CM4_SSP245.out.csv",
+    "Vitória_INM-CM4_8_SSP585.out.csv")
+
+
+class TestReparse(unittest.TestCase):
+
+    RESULTS_DIR = Path(__file__).parent / "samples" / "reparse"
+
+    def setUp(self):
+        self.RESULTS_DIR.mkdir(exist_ok=True)
+        for file_name in RESULTS_FILE_NAMES:
+            shutil.copy(PATH_TO_SIMULATION_RESULT, self.RESULTS_DIR / file_name)
+        (self.RESULTS_DIR / "notes.txt").touch()
+        self.args = Namespace(
+            results_dir=self.RESULTS_DIR,
+            output_dir=self.RESULTS_DIR,
+            workers=2,
+            flush_rows=10,
+            output_format="csv",
+            layout="long")
+
+    def test_find_results_files(self):
+        self.assertListEqual(
+            [file.name for file in find_results_files(self.RESULTS_DIR)],
+            sorted(RESULTS_FILE_NAMES))
+
+    def test_parse_results_file(self):
+        content = parse_results_file(self.RESULTS_DIR / RESULTS_FILE_NAMES[2])
+
+        self.assertEqual(len(content), 7)
+        self.assertTupleEqual(content[0][:3], ("Vitória", "INM-CM4-8", "SSP585"))
+
+    def test_validate_arguments(self):
+        self.assertIsNone(validate_arguments(self.args))
+        for option, value, error in (
+                ("results_dir", self.RESULTS_DIR / "missing", InvalidSourceDirectoryError),
+                ("workers", 0, InvalidWorkersError),
+                ("flush_rows", -1, InvalidFlushThresholdError)):
+            with self.subTest(option=option):
+                args = Namespace(**vars(self.args) | {option: value})
+                with self.assertRaises(error):
+                    validate_arguments(args)
+
+    def test_main(self):
+        (self.RESULTS_DIR / "Broken_Model_SSP245.out.csv").write_text(
+            "no results here", encoding="utf-8")
+        main(self.args)
+
+        output_files = list(self.RESULTS_DIR.glob("*-consolidated.csv"))
+        self.assertEqual(len(output_files), 1)
+        with open(output_files[0], encoding="utf-8") as output_file:
+            rows = output_file.read().splitlines()
+        self.assertEqual(rows[0], ",".join(OUTPUT_COLUMNS))
+        self.assertEqual(len(rows), 1 + 7 * len(RESULTS_FILE_NAMES))
+        self.assertCountEqual(
+            {tuple(row.split(",")[:3]) for row in rows[1:]},
+            {("Florianópolis", "ACCESS-CM2", "Histórico"),
+             ("São Paulo", "GFDL-CM4", "SSP245"),
+             ("Vitória", "INM-CM4-8", "SSP585")})
+
+    def test_main_in_process(self):
+        self.args.workers = 1
+        (self.RESULTS_DIR / "Broken_Model_SSP245.out.csv").write_text(
+            "no results here", encoding="utf-8")
+        with self.assertLogs(logger, level=logging.ERROR):
+            main(self.args)
+
+        output_files = list(self.RESULTS_DIR.glob("*-consolidated.csv"))
+        with open(output_files[0], encoding="utf-8") as output_file:
+            rows = output_file.read().splitlines()
+        self.assertListEqual(
+            [tuple(row.split(",")[:3]) for row in rows[1::7]],
+            [("Florianópolis", "ACCESS-CM2", "Histórico"),
+             ("São Paulo", "GFDL-CM4", "SSP245"),
+             ("Vitória", "INM-CM4-8", "SSP585")])
+
+    def tearDown(self):
+        shutil.rmtree(self.RESULTS_DIR)
+
+
+if __name__ == '__main__':
+    unittest.main()
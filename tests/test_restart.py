@@ -0,0 +1,86 @@
+import logging
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+from agents.restart import AdaptiveRestartPolicy, FixedRestartPolicy, logger
+
+MOCK_STRINGS = {
+    "read_resources": "agents.restart.AdaptiveRestartPolicy._read_resources",
+}
+
+
+class TestFixedRestartPolicy(unittest.TestCase):
+
+    def test_should_restart(self):
+        policy = FixedRestartPolicy(3)
+        self.assertListEqual(
+            [policy.should_restart(iteration) for iteration in range(1, 7)],
+            [False, False, True, False, False, True])
+
+
+class TestAdaptiveRestartPolicy(unittest.TestCase):
+
+    def _record(self, policy, durations, resources=None):
+        with patch(MOCK_STRINGS["read_resources"], return_value=resources):
+            for duration in durations:
+                policy.record_iteration(duration, None)
+
+    def test_baseline(self):
+        policy = AdaptiveRestartPolicy(window=3)
+        self._record(policy, [1.0, 3.0, 2.0])
+        self.assertEqual(policy.baseline_latency, 2.0)
+        self.assertFalse(policy.should_restart(3))
+
+    def test_steady_latency(self):
+        policy = AdaptiveRestartPolicy(window=3)
+        self._record(policy, [1.0, 1.1, 0.9, 1.2, 1.0, 1.3])
+        self.assertFalse(policy.should_restart(6))
+
+    def test_degraded_latency(self):
+        policy = AdaptiveRestartPolicy(window=3)
+        self._record(policy, [1.0, 1.0, 1.0, 2.0, 2.0, 1.0])
+        with self.assertLogs(logger, level=logging.INFO) as log_context:
+            self.assertTrue(policy.should_restart(6))
+            self.assertIn("iteration latency grew", log_context.output[0])
+
+    def test_degraded_memory(self):
+        policy = AdaptiveRestartPolicy(window=3)
+        self._record(policy, [1.0], resources=(100, 10))
+        self._record(policy, [1.0], resources=(250, 10))
+        with self.assertLogs(logger, level=logging.INFO) as log_context:
+            self.assertTrue(policy.should_restart(2))
+            self.assertIn("memory grew from 100 to 250", log_context.output[0])
+
+    def test_degraded_handles(self):
+        policy = AdaptiveRestartPolicy(window=3)
+        self._record(policy, [1.0], resources=(100, 10))
+        self._record(policy, [1.0], resources=(120, 25))
+        with self.assertLogs(logger, level=logging.INFO) as log_context:
+            self.assertTrue(policy.should_restart(2))
+            self.assertIn("handles grew from 10 to 25", log_context.output[0])
+
+    def test_reset(self):
+        policy = AdaptiveRestartPolicy(window=3)
+        self._record(policy, [1.0, 1.0, 1.0, 2.0, 2.0, 2.0], resources=(100, 10))
+        policy.reset()
+        self.assertIsNone(policy.baseline_latency)
+        self.assertIsNone(policy.baseline_resources)
+        self.assertFalse(policy.should_restart(7))
+
+    def test_read_resources(self):
+        process = MagicMock()
+        process.pid = os.getpid()
+        memory, handles = AdaptiveRestartPolicy._read_resources(process)
+        self.assertGreater(memory, 0)
+        self.assertGreater(handles, 0)
+
+    def test_read_resources_without_process(self):
+        self.assertIsNone(AdaptiveRestartPolicy._read_resources(None))
+        process = MagicMock()
+        process.pid = -1
+        self.assertIsNone(AdaptiveRestartPolicy._read_resources(process))
+
+
+if __name__ == "__main__":
+    unittest.main()
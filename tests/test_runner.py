@@ -0,0 +1,43 @@
+import unittest
+
+from agents.runner import HeadlessRunner
+from agents.simulator import NetunoSimulator
+from agents.sweep import ParameterSweep
+from globals.constants import SIMULATION_PARAMETERS
+from tests.test_parsers import PATH_TO_PRECIPITATION_DIR
+
+
+class TestHeadlessRunner(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.simulator = NetunoSimulator(**SIMULATION_PARAMETERS)
+        cls.batch = sorted(PATH_TO_PRECIPITATION_DIR.glob("*.csv"))[:2]
+
+    def test_initialization_with_sweep_is_vectorized(self):
+        runner = HeadlessRunner(self.simulator, False, ParameterSweep({}), 10)
+        self.assertTrue(runner.vectorized)
+        self.assertEqual(runner.max_columns, 10)
+
+    def test_run_one_by_one_matches_at_once(self):
+        one_by_one = HeadlessRunner(self.simulator, False).run(self.batch)
+        at_once = HeadlessRunner(self.simulator, True).run(self.batch)
+
+        self.assertEqual(len(one_by_one), 7 * len(self.batch))
+        self.assertEqual(len(at_once), len(one_by_one))
+        for row, expected_row in zip(at_once, one_by_one):
+            self.assertTupleEqual(row[:5], expected_row[:5])
+            self.assertAlmostEqual(row[5], expected_row[5])
+        self.assertEqual(one_by_one[0][:3], ("Belo Horizonte", "MRI-ESM2", "SSP585"))
+
+    def test_run_with_sweep(self):
+        sweep = ParameterSweep({"catchment_area": [50, 100]})
+        results = HeadlessRunner(self.simulator, False, sweep, 10).run(self.batch)
+
+        self.assertEqual(len(results), 7 * 2 * len(self.batch))
+        self.assertEqual(results[0][-1], 50)
+        self.assertEqual(results[7][-1], 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
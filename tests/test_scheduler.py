@@ -0,0 +1,34 @@
+import unittest
+from pathlib import Path
+
+from agents.scheduler import SimulationScheduler
+
+PATH_TO_PRECIPITATION_DIR = Path(Path(__file__).parent.parent, "example")
+
+
+class TestSimulationScheduler(unittest.TestCase):
+
+    def test_order_groups_initial_dates(self):
+        FILES = [
+            Path("Vitória_GFDL-CM4_SSP245.csv"),
+            Path("Florianópolis_ACCESS-CM2_Histórico.csv"),
+            Path("Belo Horizonte_MRI-ESM2_SSP585.csv"),
+            Path("Brasília_ACCESS-CM2_SSP245.csv"),
+            Path("(Netuno)Brasília_GFDL-CM4_Histórico.csv"),
+        ]
+        self.assertListEqual(SimulationScheduler.order(FILES), [
+            Path("(Netuno)Brasília_GFDL-CM4_Histórico.csv"),
+            Path("Florianópolis_ACCESS-CM2_Histórico.csv"),
+            Path("Brasília_ACCESS-CM2_SSP245.csv"),
+            Path("Vitória_GFDL-CM4_SSP245.csv"),
+            Path("Belo Horizonte_MRI-ESM2_SSP585.csv"),
+        ])
+
+    def test_order_is_stable(self):
+        files = list(PATH_TO_PRECIPITATION_DIR.iterdir())
+        self.assertListEqual(
+            SimulationScheduler.order(files), SimulationScheduler.order(reversed(files)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from agents.parsers import PrecipitationParser
+from agents.simulator import NetunoSimulator
+from globals.constants import SIMULATION_PARAMETERS
+from globals.errors import EmptyPrecipitationSeriesError
+from tests.test_parsers import PATH_TO_PRECIPITATION_DIR, SAMPLE_RESULTS
+
+PATH_TO_PRECIPITATION = Path(
+    PATH_TO_PRECIPITATION_DIR, "(Netuno)Florianópolis_ACCESS-CM2_Histórico.csv")
+SAMPLE_PARAMETERS = SIMULATION_PARAMETERS | {"upper_tank_capacity": 0}
+
+
+class TestNetunoSimulator(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.precipitation = PrecipitationParser(PATH_TO_PRECIPITATION).to_list()
+
+    def test_initialization(self):
+        simulator = NetunoSimulator(**SIMULATION_PARAMETERS | {
+            "number_of_residents": 2,
+            "rainwater_replacement_percentage": 150,
+            "coefficient_of_loss": 0})
+        self.assertEqual(simulator.total_demand, 1206)
+        self.assertEqual(simulator.rainwater_demand, 1206)
+        self.assertEqual(simulator.coefficient_of_loss, 0.1)
+
+    def test_daily_inflow_below_disposal(self):
+        simulator = NetunoSimulator(**SIMULATION_PARAMETERS)
+        self.assertEqual(simulator._daily_inflow(2), 0)
+
+    def test_daily_inflow_above_disposal(self):
+        simulator = NetunoSimulator(**SIMULATION_PARAMETERS)
+        self.assertAlmostEqual(simulator._daily_inflow(3), 120)
+
+    def test_simulate_matches_netuno_sample(self):
+        simulator = NetunoSimulator(**SAMPLE_PARAMETERS)
+        results = simulator.simulate(self.precipitation)
+
+        self.assertListEqual(list(results), list(SAMPLE_RESULTS))
+        for metric, expected in SAMPLE_RESULTS.items():
+            with self.subTest(metric=metric):
+                self.assertEqual(results[metric].label, expected.label)
+                self.assertEqual(results[metric].unit, expected.unit)
+                self.assertAlmostEqual(results[metric].value, expected.value, delta=0.01)
+
+    def test_simulate_demand_always_met(self):
+        simulator = NetunoSimulator(**SIMULATION_PARAMETERS | {
+            "lower_tank_capacity": 1e9, "upper_tank_capacity": 1e9})
+        results = simulator.simulate([1000] + [0] * 9)
+
+        self.assertAlmostEqual(results["period_when_demand_is_fully_met"].value, 100)
+        self.assertAlmostEqual(results["period_when_demand_is_not_met"].value, 0)
+        self.assertAlmostEqual(results["average_rainwater_overflow"].value, 0)
+
+    def test_simulate_upper_tank_limits_consumption(self):
+        simulator = NetunoSimulator(**SIMULATION_PARAMETERS | {
+            "lower_tank_capacity": 1e9, "upper_tank_capacity": 100})
+        results = simulator.simulate([1000, 0])
+
+        self.assertAlmostEqual(results["average_rainwater_consumption"].value, 100)
+        self.assertAlmostEqual(results["period_when_demand_is_partially_met"].value, 100)
+
+    def test_simulate_empty_series(self):
+        with self.assertRaises(EmptyPrecipitationSeriesError):
+            NetunoSimulator(**SIMULATION_PARAMETERS).simulate([])
+
+    def test_to_list(self):
+        simulator = NetunoSimulator(**SAMPLE_PARAMETERS)
+        results = simulator.to_list(
+            self.precipitation, "Florianópolis", "ACCESS-CM2", "Histórico")
+
+        self.assertEqual(len(results), len(SAMPLE_RESULTS))
+        for row, (metric, expected) in zip(results, SAMPLE_RESULTS.items()):
+            with self.subTest(metric=metric):
+                self.assertTupleEqual(
+                    row[:5], ("Florianópolis", "ACCESS-CM2", "Histórico", metric,
+                              expected.label))
+                self.assertAlmostEqual(row[5], expected.value, delta=0.01)
+                self.assertEqual(row[6], expected.unit)
+
+
+class TestNetunoSimulatorBatch(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.files = sorted(PATH_TO_PRECIPITATION_DIR.glob("*.csv"))
+        cls.series = [PrecipitationParser(file).to_array() for file in cls.files]
+
+    def assertResultsAlmostEqual(self, actual, expected):
+        self.assertListEqual(list(actual), list(expected))
+        for metric, variable in expected.items():
+            with self.subTest(metric=metric):
+                self.assertEqual(actual[metric].label, variable.label)
+                self.assertEqual(actual[metric].unit, variable.unit)
+                self.assertAlmostEqual(actual[metric].value, variable.value)
+
+    def test_daily_inflow_batch(self):
+        simulator = NetunoSimulator(**SIMULATION_PARAMETERS)
+        result = simulator._daily_inflow_batch(np.array([[0, 2], [3, 10]]))
+        np.testing.assert_allclose(result, [[0, 0], [120, 400]])
+
+    def test_simulate_batch_matches_simulate(self):
+        for parameters in (SIMULATION_PARAMETERS, SAMPLE_PARAMETERS):
+            simulator = NetunoSimulator(**parameters)
+            results = simulator.simulate_batch(np.column_stack(self.series))
+
+            self.assertEqual(len(results), len(self.series))
+            for result, precipitation in zip(results, self.series):
+                self.assertResultsAlmostEqual(result, simulator.simulate(precipitation))
+
+    def test_stack(self):
+        simulators = [
+            NetunoSimulator(**SIMULATION_PARAMETERS),
+            NetunoSimulator(**SIMULATION_PARAMETERS | {"lower_tank_capacity": 500})]
+        stacked = NetunoSimulator.stack(simulators, 2)
+
+        np.testing.assert_array_equal(stacked.lower_tank_capacity, [150, 150, 500, 500])
+        np.testing.assert_array_equal(stacked.total_demand, [603] * 4)
+
+    def test_simulate_batch_with_stacked_parameters(self):
+        simulators = [
+            NetunoSimulator(**SAMPLE_PARAMETERS),
+            NetunoSimulator(**SIMULATION_PARAMETERS | {"lower_tank_capacity": 500})]
+        stacked = NetunoSimulator.stack(simulators, len(self.series))
+        results = stacked.simulate_batch(np.tile(np.column_stack(self.series), (1, 2)))
+
+        for column, result in enumerate(results):
+            simulator = simulators[column // len(self.series)]
+            precipitation = self.series[column % len(self.series)]
+            self.assertResultsAlmostEqual(result, simulator.simulate(precipitation))
+
+    def test_simulate_many_with_different_lengths(self):
+        simulator = NetunoSimulator(**SIMULATION_PARAMETERS)
+        series = [self.series[0], self.series[1][:365], self.series[2]]
+        results = simulator.simulate_many(series)
+
+        self.assertEqual(len(results), len(series))
+        for result, precipitation in zip(results, series):
+            self.assertResultsAlmostEqual(result, simulator.simulate(precipitation))
+
+    def test_simulate_many_with_empty_series(self):
+        with self.assertRaises(EmptyPrecipitationSeriesError):
+            NetunoSimulator(**SIMULATION_PARAMETERS).simulate_many(
+                [np.array([1.0, 2.0]), np.array([])])
+
+    def test_many_to_list(self):
+        simulator = NetunoSimulator(**SIMULATION_PARAMETERS)
+        identifiers = [("city", "model", "scenario"), ("city2", "model2", "scenario2")]
+        results = simulator.many_to_list(self.series[:2], identifiers)
+
+        self.assertEqual(len(results), 2 * len(SAMPLE_RESULTS))
+        self.assertListEqual(
+            [row[:4] for row in results[:len(SAMPLE_RESULTS)]],
+            [identifiers[0] + (metric,) for metric in SAMPLE_RESULTS])
+        self.assertListEqual(
+            [row[:4] for row in results[len(SAMPLE_RESULTS):]],
+            [identifiers[1] + (metric,) for metric in SAMPLE_RESULTS])
+
+
+if __name__ == "__main__":
+    unittest.main()
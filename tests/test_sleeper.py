@@ -18,9 +18,10 @@ class TestSleeper(unittest.TestCase):
         mock_function = MagicMock(side_effect=[False, False, True])
 
         with patch(MOCK_STRINGS["sleep"]) as mock_sleep:
-            Sleeper.until_true(mock_function)
+            waited = Sleeper.until_true(mock_function)
             mock_sleep.assert_called_with(0.01)
 
+        self.assertIsInstance(waited, float)
         self.assertEqual(mock_function.call_count, 3)
 
     def test_sleep_until_timeout(self):
@@ -0,0 +1,64 @@
+import json
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from agents.spool import SpoolAutomator
+from globals.constants import NETUNO_RESULTS_PATH, SIMULATION_PARAMETERS
+from tests.test_parsers import PATH_TO_PRECIPITATION_DIR
+
+PRECIPITATION_FILE = Path(
+    PATH_TO_PRECIPITATION_DIR, "(Netuno)Florianópolis_ACCESS-CM2_Histórico.csv")
+
+
+class TestSpoolAutomator(unittest.TestCase):
+
+    def setUp(self):
+        self.SPOOL_DIR = Path(__file__).parent / "samples" / "test-spool"
+        self.automator = SpoolAutomator(5, spool_dir=self.SPOOL_DIR)
+
+    def _read_requests(self) -> list[dict]:
+        return [
+            json.loads(request.read_text(encoding="utf-8"))
+            for request in sorted(self.SPOOL_DIR.glob("*.json"))]
+
+    def test_set_delays(self):
+        self.assertEqual(self.automator.wait, 0.5)
+        self.automator.set_delays(0.1, 0.2)
+        self.assertEqual(self.automator.wait, 0.2)
+
+    def test_run_first_simulation(self):
+        with patch("time.sleep") as sleep_mock:
+            result = self.automator.run_first_simulation(
+                PRECIPITATION_FILE, "1980-12-01", **SIMULATION_PARAMETERS)
+        sleep_mock.assert_called_once_with(0.5)
+        self.assertEqual(
+            result,
+            NETUNO_RESULTS_PATH / "(Netuno)Florianópolis_ACCESS-CM2_Histórico.out.csv")
+        self.assertListEqual(self._read_requests(), [{
+            "precipitation_path": str(PRECIPITATION_FILE.resolve()),
+            "date": "1980-12-01",
+            "parameters": SIMULATION_PARAMETERS,
+            "output_path": str(result.resolve()),
+        }])
+        self.assertListEqual(list(self.SPOOL_DIR.glob("*.tmp")), [])
+        self.assertIn("simulate_export", self.automator.tracer.durations)
+
+    def test_run_simulation_reuses_parameters(self):
+        with patch("time.sleep"):
+            self.automator.run_first_simulation(
+                PRECIPITATION_FILE, "1980-12-01", **SIMULATION_PARAMETERS)
+            self.automator.run_simulation(PRECIPITATION_FILE, "2015-01-01")
+        requests = self._read_requests()
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(requests[1]["date"], "2015-01-01")
+        self.assertDictEqual(requests[1]["parameters"], SIMULATION_PARAMETERS)
+
+    def tearDown(self):
+        for file in self.SPOOL_DIR.iterdir():
+            file.unlink()
+        self.SPOOL_DIR.rmdir()
+
+
+if __name__ == "__main__":
+    unittest.main()
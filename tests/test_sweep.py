@@ -0,0 +1,82 @@
+import unittest
+
+from agents.parsers import PrecipitationParser
+from agents.simulator import NetunoSimulator
+from agents.sweep import ParameterSweep
+from globals.constants import OUTPUT_COLUMNS, SIMULATION_PARAMETERS
+from globals.errors import InvalidSweepSpecificationError
+from tests.test_parsers import PATH_TO_PRECIPITATION_DIR
+
+
+class TestParameterSweep(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        files = sorted(PATH_TO_PRECIPITATION_DIR.glob("*.csv"))[:3]
+        cls.series = [PrecipitationParser(file).to_array()[:1000] for file in files]
+        cls.series[1] = cls.series[1][:365]
+        cls.identifiers = [
+            ("city", "model", "scenario"),
+            ("city2", "model2", "scenario2"),
+            ("city3", "model3", "scenario3")]
+
+    def test_from_specifications_list(self):
+        sweep = ParameterSweep.from_specifications(["catchment_area=50,75.5, 100"])
+        self.assertDictEqual(sweep.values, {"catchment_area": [50, 75.5, 100]})
+
+    def test_from_specifications_range(self):
+        sweep = ParameterSweep.from_specifications(
+            ["lower_tank_capacity=100:200:50", "number_of_residents=1:2:0.3"])
+        self.assertDictEqual(sweep.values, {
+            "lower_tank_capacity": [100, 150, 200],
+            "number_of_residents": [1, 1.3, 1.6, 1.9]})
+
+    def test_from_specifications_invalid(self):
+        INVALID_SPECIFICATIONS = [
+            "unknown_parameter=1,2",
+            "catchment_area",
+            "catchment_area=a,b",
+            "catchment_area=100:50:10",
+            "catchment_area=50:100:0",
+            "catchment_area=50:100",
+        ]
+        for specification in INVALID_SPECIFICATIONS:
+            with (
+                    self.subTest(specification=specification),
+                    self.assertRaises(InvalidSweepSpecificationError)):
+                ParameterSweep.from_specifications([specification])
+
+    def test_columns(self):
+        sweep = ParameterSweep({"catchment_area": [50], "lower_tank_capacity": [100]})
+        self.assertTupleEqual(
+            sweep.columns, OUTPUT_COLUMNS + ("catchment_area", "lower_tank_capacity"))
+
+    def test_grid(self):
+        sweep = ParameterSweep({"catchment_area": [50, 75], "lower_tank_capacity": [100]})
+        self.assertListEqual(sweep.grid(), [
+            {"catchment_area": 50, "lower_tank_capacity": 100},
+            {"catchment_area": 75, "lower_tank_capacity": 100}])
+
+    def test_run_matches_individual_simulations(self):
+        sweep = ParameterSweep({
+            "lower_tank_capacity": [100, 500, 1000],
+            "upper_tank_capacity": [0, 150]})
+        for max_columns in (1, 4, 100):
+            with self.subTest(max_columns=max_columns):
+                results = sweep.run(self.series, self.identifiers, max_columns)
+
+                expected = []
+                for precipitation, identifier in zip(self.series, self.identifiers):
+                    for point in sweep.grid():
+                        simulator = NetunoSimulator(**SIMULATION_PARAMETERS | point)
+                        for row in simulator.to_list(precipitation, *identifier):
+                            expected.append(row + tuple(point.values()))
+                self.assertEqual(len(results), len(expected))
+                for actual_row, expected_row in zip(results, expected):
+                    self.assertTupleEqual(actual_row[:5], expected_row[:5])
+                    self.assertAlmostEqual(actual_row[5], expected_row[5])
+                    self.assertTupleEqual(actual_row[6:], expected_row[6:])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import json
+import logging
+import unittest
+from pathlib import Path
+
+from agents.timing import AdaptiveTimer, logger
+from globals.constants import (
+    TIMING_BACKOFF_FACTOR, TIMING_LATENCY_FACTOR, TIMING_LATENCY_WINDOW, TIMING_LIMITS)
+
+
+class TestAdaptiveTimer(unittest.TestCase):
+
+    PROFILE_PATH = Path(__file__).parent / "samples" / "test-timing-profile.json"
+    DELAYS = {"keystroke_pause": 0.08, "explorer_wait": 0.1}
+
+    def test_record_success_without_responses(self):
+        timer = AdaptiveTimer(self.DELAYS, adaptive=True)
+        timer.record_success()
+        self.assertDictEqual(timer.delays, self.DELAYS)
+
+    def test_record_success_follows_slowest_response(self):
+        timer = AdaptiveTimer(self.DELAYS, adaptive=True)
+        timer.measure("keystroke_pause", 0.02)
+        timer.measure("keystroke_pause", 0.04)
+        timer.record_success()
+        self.assertAlmostEqual(
+            timer.delays["keystroke_pause"], 0.04 * TIMING_LATENCY_FACTOR)
+        self.assertEqual(timer.delays["explorer_wait"], 0.1)
+
+    def test_old_responses_are_forgotten(self):
+        timer = AdaptiveTimer(self.DELAYS, adaptive=True)
+        timer.measure("explorer_wait", 0.5)
+        for _ in range(TIMING_LATENCY_WINDOW):
+            timer.measure("explorer_wait", 0.1)
+        timer.record_success()
+        self.assertAlmostEqual(timer.delays["explorer_wait"], 0.1 * TIMING_LATENCY_FACTOR)
+
+    def test_measure_ignores_unknown_steps(self):
+        timer = AdaptiveTimer(self.DELAYS, adaptive=True)
+        timer.measure("unknown", 1.0)
+        timer.record_success()
+        self.assertDictEqual(timer.delays, self.DELAYS)
+
+    def test_record_failure_backs_off_delays(self):
+        timer = AdaptiveTimer(self.DELAYS, adaptive=True)
+        with self.assertLogs(logger, level=logging.INFO):
+            timer.record_failure()
+        self.assertGreater(timer.delays["keystroke_pause"], 0.08)
+        self.assertGreater(timer.delays["explorer_wait"], 0.1)
+        self.assertEqual(timer.margin, TIMING_LATENCY_FACTOR * TIMING_BACKOFF_FACTOR)
+
+    def test_margin_relaxes_after_failure(self):
+        timer = AdaptiveTimer(self.DELAYS, adaptive=True)
+        timer.measure("keystroke_pause", 0.02)
+        with self.assertLogs(logger, level=logging.INFO):
+            timer.record_failure()
+        timer.record_success()
+        widened_delay = timer.delays["keystroke_pause"]
+        self.assertGreater(widened_delay, 0.02 * TIMING_LATENCY_FACTOR)
+        for _ in range(100):
+            timer.record_success()
+        self.assertEqual(timer.margin, TIMING_LATENCY_FACTOR)
+        self.assertAlmostEqual(
+            timer.delays["keystroke_pause"], 0.02 * TIMING_LATENCY_FACTOR)
+
+    def test_delays_within_limits(self):
+        lower_limit, upper_limit = TIMING_LIMITS["keystroke_pause"]
+        timer = AdaptiveTimer(self.DELAYS, adaptive=True)
+        timer.measure("keystroke_pause", 10.0)
+        timer.record_success()
+        self.assertEqual(timer.delays["keystroke_pause"], upper_limit)
+        for _ in range(TIMING_LATENCY_WINDOW):
+            timer.measure("keystroke_pause", 0.0)
+        timer.record_success()
+        self.assertEqual(timer.delays["keystroke_pause"], lower_limit)
+        with self.assertLogs(logger, level=logging.INFO):
+            for _ in range(20):
+                timer.record_failure()
+        self.assertEqual(timer.delays["keystroke_pause"], upper_limit)
+
+    def test_delay_above_limit_never_increases(self):
+        timer = AdaptiveTimer({"explorer_wait": 3.0}, adaptive=True)
+        with self.assertLogs(logger, level=logging.INFO):
+            timer.record_failure()
+        self.assertEqual(timer.delays["explorer_wait"], 3.0)
+
+    def test_not_adaptive(self):
+        timer = AdaptiveTimer(self.DELAYS, adaptive=False)
+        timer.measure("keystroke_pause", 0.02)
+        timer.record_success()
+        timer.record_failure()
+        self.assertDictEqual(timer.delays, self.DELAYS)
+
+    def test_delay_below_limit_respected(self):
+        timer = AdaptiveTimer({"explorer_wait": 0}, adaptive=True)
+        timer.measure("explorer_wait", 0.0)
+        timer.record_success()
+        self.assertEqual(timer.delays["explorer_wait"], 0)
+        with self.assertLogs(logger, level=logging.INFO):
+            timer.record_failure()
+        self.assertEqual(timer.delays["explorer_wait"], 0)
+
+    def test_profile_round_trip(self):
+        timer = AdaptiveTimer(self.DELAYS, adaptive=True)
+        timer.measure("explorer_wait", 0.2)
+        with self.assertLogs(logger, level=logging.INFO):
+            timer.record_failure()
+        timer.record_success()
+        timer.save_profile(self.PROFILE_PATH)
+
+        with self.assertLogs(logger, level=logging.INFO):
+            loaded = AdaptiveTimer.from_profile(self.PROFILE_PATH, self.DELAYS)
+        self.assertTrue(loaded.adaptive)
+        self.assertDictEqual(loaded.delays, timer.delays)
+        self.assertEqual(loaded.margin, timer.margin)
+
+    def test_missing_profile(self):
+        timer = AdaptiveTimer.from_profile(self.PROFILE_PATH, self.DELAYS)
+        self.assertDictEqual(timer.delays, self.DELAYS)
+
+    def test_profile_ignores_unknown_steps(self):
+        with open(self.PROFILE_PATH, "w", encoding="utf-8") as profile_file:
+            json.dump({"delays": {"unknown": 1.0, "explorer_wait": 0.5}}, profile_file)
+
+        with self.assertLogs(logger, level=logging.INFO):
+            timer = AdaptiveTimer.from_profile(self.PROFILE_PATH, self.DELAYS)
+        self.assertDictEqual(timer.delays, self.DELAYS | {"explorer_wait": 0.5})
+
+    def test_unreadable_profile(self):
+        self.PROFILE_PATH.write_text("{not json", encoding="utf-8")
+
+        with self.assertLogs(logger, level=logging.WARNING) as log_context:
+            timer = AdaptiveTimer.from_profile(self.PROFILE_PATH, self.DELAYS)
+            self.assertIn("Ignoring unreadable timing profile", log_context.output[0])
+        self.assertDictEqual(timer.delays, self.DELAYS)
+
+    def tearDown(self):
+        self.PROFILE_PATH.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import json
+import unittest
+from pathlib import Path
+
+from agents.tracer import PhaseTracer
+
+
+class TestPhaseTracer(unittest.TestCase):
+
+    TRACE_PATH = Path(__file__).parent / "samples" / "test-trace.jsonl"
+
+    def test_span(self):
+        tracer = PhaseTracer()
+        with tracer.span("parsing"):
+            pass
+        self.assertEqual(len(tracer.durations["parsing"]), 1)
+        self.assertGreaterEqual(tracer.durations["parsing"][0], 0)
+
+    def test_span_with_exception(self):
+        tracer = PhaseTracer()
+        with self.assertRaises(ValueError), tracer.span("parsing"):
+            raise ValueError
+        self.assertEqual(len(tracer.durations["parsing"]), 1)
+
+    def test_trace_file(self):
+        tracer = PhaseTracer(self.TRACE_PATH)
+        tracer.iteration = 3
+        tracer.record("wait_result", 0.25)
+        with tracer.span("parsing"):
+            pass
+        with tracer.span("exporting", iteration=1):
+            pass
+        tracer.close()
+
+        with open(self.TRACE_PATH, encoding="utf-8") as trace_file:
+            spans = [json.loads(line) for line in trace_file]
+        self.assertListEqual(
+            [span["phase"] for span in spans], ["wait_result", "parsing", "exporting"])
+        self.assertListEqual([span["iteration"] for span in spans], [3, 3, 1])
+        self.assertEqual(spans[0]["duration"], 0.25)
+        self.assertLessEqual(spans[0]["start"], spans[1]["start"])
+
+    def test_percentile(self):
+        values = [float(value) for value in range(1, 21)]
+        self.assertEqual(PhaseTracer._percentile(values, 50), 10)
+        self.assertEqual(PhaseTracer._percentile(values, 95), 19)
+        self.assertEqual(PhaseTracer._percentile(values, 100), 20)
+        self.assertEqual(PhaseTracer._percentile([1.5], 95), 1.5)
+
+    def test_report(self):
+        tracer = PhaseTracer()
+        for duration in (0.3, 0.1, 0.2):
+            tracer.record("parsing", duration)
+        tracer.record("restart", 2.0)
+
+        lines = tracer.report()
+        self.assertEqual(len(lines), 3)
+        self.assertListEqual(
+            lines[0].split(), ["phase", "count", "total", "p50", "p95", "max"])
+        self.assertListEqual(
+            lines[1].split(), ["parsing", "3", "0.600", "0.200", "0.300", "0.300"])
+        self.assertListEqual(
+            lines[2].split(), ["restart", "1", "2.000", "2.000", "2.000", "2.000"])
+
+    def tearDown(self):
+        self.TRACE_PATH.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
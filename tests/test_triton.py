@@ -1,20 +1,42 @@
+import csv
+import json
 import logging
+import os
+import shutil
+import tarfile
+import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import pyarrow.parquet as pq
+
 from agents.validators import CommandLineArgsValidator
 from agents.manager import ProcessManager
+from agents.manifest import RunManifest
+from agents.parsers import FileNameParser, PrecipitationParser
+from agents.simulator import NetunoSimulator
+from globals.constants import (
+    FAKE_NETUNO_SPOOL_PATH, INITIAL_DATES, NETUNO_RESULTS_PATH, OUTPUT_COLUMNS,
+    SIMULATION_PARAMETERS, SIMULATION_RESULT_UNITS)
+from globals.errors import (
+    CustomTimeoutError, InvalidPrecipitationDataError, MismatchedSettingError)
+from globals.utils import setup_logger
 from tests.test_parsers import PATH_TO_SIMULATION_RESULT
-from triton import main, setup_logger
+from triton import batched, list_input_files, main, main_headless
+from triton import logger as triton_logger
 
 MOCK_STRINGS = {
     "popen": "subprocess.Popen",
     "sleep": "time.sleep",
     "run_first": "agents.automators.NetunoAutomator.run_first_simulation",
     "run_simulation": "agents.automators.NetunoAutomator.run_simulation",
-    "sleep_until": "agents.sleeper.Sleeper.until_true",
+    "wait_for": "agents.watcher.ResultWatcher.wait_for",
     "base_file_name": "agents.exporter.CSVExporter._get_base_file_name",
+    "parquet_file_name": "agents.parquet.ParquetExporter._get_base_file_name",
+    "simulate": "agents.simulator.NetunoSimulator.simulate",
+    "policy_reset": "agents.restart.FixedRestartPolicy.reset",
+    "check_settings": "agents.parsers.ResultParser.check_settings",
 }
 
 
@@ -57,10 +79,58 @@ class TestLoggerSetup(unittest.TestCase):
             self.assertIn("Test CRITICAL", log_context.output[0])
 
 
+class TestListInputFiles(unittest.TestCase):
+
+    INPUT_DIR = Path(__file__).parent / "samples" / "precipitation"
+    INDEX_PATH = Path(__file__).parent / "samples" / "index.sqlite"
+
+    def setUp(self):
+        shutil.copytree(Path(__file__).parent.parent / "example", self.INPUT_DIR)
+        Path(self.INPUT_DIR, "notes.txt").touch()
+        self.args = CommandLineArgsValidator()
+        self.args.precipitation_dir_path = self.INPUT_DIR
+        self.args.index = None
+        self.args.input_dirs = None
+        self.args.recursive = False
+        self.args.include = None
+        self.args.exclude = None
+        self.args.city = None
+        self.args.model = None
+        self.args.scenario = None
+
+    def test_list_input_files_only_csv(self):
+        self.assertCountEqual(
+            list_input_files(self.args), list(self.INPUT_DIR.glob("*.csv")))
+
+    def test_list_input_files_with_index(self):
+        self.args.index = self.INDEX_PATH
+
+        self.assertListEqual(
+            list_input_files(self.args),
+            [file for file in self.INPUT_DIR.iterdir() if file.suffix == ".csv"])
+
+    def test_list_input_files_with_invalid_file(self):
+        self.args.index = self.INDEX_PATH
+        Path(self.INPUT_DIR, "City_Model_SSP245.csv").write_text("1.0\nabc\n")
+
+        with (self.assertRaises(InvalidPrecipitationDataError),
+              self.assertLogs(triton_logger, level=logging.ERROR) as log_context):
+            list_input_files(self.args)
+        self.assertIn("City_Model_SSP245.csv", log_context.output[0])
+
+    def tearDown(self):
+        shutil.rmtree(self.INPUT_DIR)
+        self.INDEX_PATH.unlink(missing_ok=True)
+
+
 class TestMainFunction(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
+        # The results directory of Netuno 4 is relative to the working directory
+        cls.working_dir = tempfile.TemporaryDirectory()
+        cls.previous_dir = os.getcwd()
+        os.chdir(cls.working_dir.name)
         cls.SAMPLE_FILE_NAME = "test-consolidated.csv"
         cls.SAMPLE_RESULTS_FILE = Path(__file__).parent.parent / cls.SAMPLE_FILE_NAME
         cls.args = CommandLineArgsValidator()
@@ -72,6 +142,27 @@ class TestMainFunction(unittest.TestCase):
         cls.args.clean = False
         cls.args.save_every = 10
         cls.args.restart_every = 15
+        cls.args.engine = "netuno"
+        cls.args.resume = None
+        cls.args.cache = None
+        cls.args.cache_size = 100
+        cls.args.adaptive_timing = None
+        cls.args.trace = None
+        cls.args.archive = None
+        cls.args.keystroke_plans = False
+        cls.args.restart_policy = "fixed"
+        cls.args.flush_rows = None
+        cls.args.flush_interval = None
+        cls.args.output_format = "csv"
+        cls.args.layout = "long"
+        cls.args.index = None
+        cls.args.input_dirs = None
+        cls.args.recursive = False
+        cls.args.include = None
+        cls.args.exclude = None
+        cls.args.city = None
+        cls.args.model = None
+        cls.args.scenario = None
 
     def test_main_no_restart(self):
         self.args.save_every = 2
@@ -80,9 +171,10 @@ class TestMainFunction(unittest.TestCase):
         with (
                 patch(MOCK_STRINGS["run_first"]) as mock_first_simulation,
                 patch(MOCK_STRINGS["run_simulation"]) as mock_run_simulation,
+                patch(MOCK_STRINGS["check_settings"]),
                 patch(MOCK_STRINGS["base_file_name"]) as mock_base_file_name,
                 patch(MOCK_STRINGS["sleep"]),
-                patch(MOCK_STRINGS["sleep_until"])):
+                patch(MOCK_STRINGS["wait_for"], return_value=0.0)):
             mock_first_simulation.return_value = PATH_TO_SIMULATION_RESULT
             mock_run_simulation.return_value = PATH_TO_SIMULATION_RESULT
             mock_base_file_name.return_value = self.SAMPLE_FILE_NAME
@@ -90,6 +182,31 @@ class TestMainFunction(unittest.TestCase):
             mock_first_simulation.assert_called_once()
             self.assertEqual(mock_run_simulation.call_count, 4)
 
+    def test_main_clears_left_over_results_files(self):
+        self.args.clean = False
+        NETUNO_RESULTS_PATH.mkdir(exist_ok=True)
+        left_over = NETUNO_RESULTS_PATH / "(Netuno)Vitória_GFDL-CM4_SSP245.out.csv"
+        left_over.write_text("Resultados\n", encoding="utf-8")
+
+        def run_first_simulation(*args, **kwargs) -> Path:
+            self.assertFalse(left_over.exists())
+            return PATH_TO_SIMULATION_RESULT
+
+        with (
+                patch(MOCK_STRINGS["run_first"]) as mock_first_simulation,
+                patch(MOCK_STRINGS["run_simulation"]) as mock_run_simulation,
+                patch(MOCK_STRINGS["check_settings"]),
+                patch(MOCK_STRINGS["base_file_name"]) as mock_base_file_name,
+                patch(MOCK_STRINGS["sleep"]),
+                patch(MOCK_STRINGS["wait_for"], return_value=0.0)):
+            mock_first_simulation.side_effect = run_first_simulation
+            mock_run_simulation.return_value = PATH_TO_SIMULATION_RESULT
+            mock_base_file_name.return_value = self.SAMPLE_FILE_NAME
+            with self.assertLogs(triton_logger, level=logging.INFO) as log_context:
+                main(self.args, ProcessManager())
+        self.assertTrue(
+            any("results files left over" in line for line in log_context.output))
+
     def test_main_with_restart(self):
         file_count = len(list(self.args.precipitation_dir_path.iterdir()))
         self.args.save_every = file_count
@@ -104,10 +221,11 @@ class TestMainFunction(unittest.TestCase):
         with (
                 patch(MOCK_STRINGS["run_first"]) as mock_first_simulation,
                 patch(MOCK_STRINGS["run_simulation"]) as mock_run_simulation,
+                patch(MOCK_STRINGS["check_settings"]),
                 patch(MOCK_STRINGS["base_file_name"]) as mock_base_file_name,
                 patch(MOCK_STRINGS["popen"]) as popen_mock,
                 patch(MOCK_STRINGS["sleep"]),
-                patch(MOCK_STRINGS["sleep_until"])):
+                patch(MOCK_STRINGS["wait_for"], return_value=0.0)):
             popen_mock.return_value = first_process
             mock_first_simulation.return_value = PATH_TO_SIMULATION_RESULT
             mock_run_simulation.return_value = PATH_TO_SIMULATION_RESULT
@@ -117,9 +235,352 @@ class TestMainFunction(unittest.TestCase):
             self.assertEqual(mock_first_simulation.call_count, 2)
             self.assertEqual(mock_run_simulation.call_count, file_count - 2)
 
+    def test_main_with_cache(self):
+        self.args.save_every = 2
+        self.args.restart_every = 15
+        self.args.cache = Path(__file__).parent / "samples" / "test-cache.sqlite"
+        self.args.netuno_exe_path.touch()
+        files = list(self.args.precipitation_dir_path.iterdir())
+        distinct_inputs = {
+            (file.read_bytes(), INITIAL_DATES[FileNameParser.get_metadata(file)[2]])
+            for file in files}
+        calls = []
+        for _ in range(2):
+            self.SAMPLE_RESULTS_FILE.unlink(missing_ok=True)
+            with (
+                    patch(MOCK_STRINGS["run_first"]) as mock_first_simulation,
+                    patch(MOCK_STRINGS["run_simulation"]) as mock_run_simulation,
+                    patch(MOCK_STRINGS["check_settings"]),
+                    patch(MOCK_STRINGS["base_file_name"]) as mock_base_file_name,
+                    patch(MOCK_STRINGS["sleep"]),
+                    patch(MOCK_STRINGS["wait_for"], return_value=0.0)):
+                mock_first_simulation.return_value = PATH_TO_SIMULATION_RESULT
+                mock_run_simulation.return_value = PATH_TO_SIMULATION_RESULT
+                mock_base_file_name.return_value = self.SAMPLE_FILE_NAME
+                main(self.args, ProcessManager())
+                calls.append(
+                    mock_first_simulation.call_count + mock_run_simulation.call_count)
+        self.args.netuno_exe_path.unlink()
+        self.args.cache.unlink()
+        self.args.cache = None
+
+        self.assertListEqual(calls, [len(distinct_inputs), 0])
+        with open(self.SAMPLE_RESULTS_FILE, encoding="utf-8") as results_file:
+            self.assertEqual(len(results_file.read().splitlines()), 1 + 7 * len(files))
+
+    def test_main_retries_after_timeout(self):
+        self.args.save_every = 10
+        self.args.restart_every = 15
+        self.args.adaptive_timing = Path(__file__).parent / "samples" / "test-timing.json"
+        file_count = len(list(self.args.precipitation_dir_path.iterdir()))
+        manager = ProcessManager()
+        with (
+                patch(MOCK_STRINGS["run_first"]) as mock_first_simulation,
+                patch(MOCK_STRINGS["run_simulation"]) as mock_run_simulation,
+                patch(MOCK_STRINGS["check_settings"]),
+                patch(MOCK_STRINGS["base_file_name"]) as mock_base_file_name,
+                patch.object(manager, "restart_netuno") as mock_restart,
+                patch(MOCK_STRINGS["policy_reset"]) as mock_policy_reset,
+                patch(MOCK_STRINGS["wait_for"]) as mock_wait_for,
+                patch(MOCK_STRINGS["sleep"])):
+            mock_first_simulation.return_value = PATH_TO_SIMULATION_RESULT
+            mock_run_simulation.return_value = PATH_TO_SIMULATION_RESULT
+            mock_base_file_name.return_value = self.SAMPLE_FILE_NAME
+            mock_wait_for.side_effect = [0.5, CustomTimeoutError(30)] + [0.5] * file_count
+            main(self.args, manager)
+            mock_restart.assert_called_once()
+            mock_policy_reset.assert_called_once()
+            self.assertEqual(mock_first_simulation.call_count, 2)
+            self.assertEqual(mock_run_simulation.call_count, file_count - 1)
+
+        with open(self.args.adaptive_timing, encoding="utf-8") as profile_file:
+            self.assertIn("explorer_wait", json.load(profile_file)["delays"])
+        self.args.adaptive_timing.unlink()
+        self.args.adaptive_timing = None
+
+    def test_main_retries_after_mismatched_settings(self):
+        self.args.save_every = 10
+        self.args.restart_every = 15
+        file_count = len(list(self.args.precipitation_dir_path.iterdir()))
+        manager = ProcessManager()
+        with (
+                patch(MOCK_STRINGS["run_first"]) as mock_first_simulation,
+                patch(MOCK_STRINGS["run_simulation"]) as mock_run_simulation,
+                patch(MOCK_STRINGS["check_settings"]) as mock_check_settings,
+                patch(MOCK_STRINGS["base_file_name"]) as mock_base_file_name,
+                patch.object(manager, "restart_netuno") as mock_restart,
+                patch(MOCK_STRINGS["wait_for"], return_value=0.5),
+                patch(MOCK_STRINGS["sleep"])):
+            mock_first_simulation.return_value = PATH_TO_SIMULATION_RESULT
+            mock_run_simulation.return_value = PATH_TO_SIMULATION_RESULT
+            mock_base_file_name.return_value = self.SAMPLE_FILE_NAME
+            mock_check_settings.side_effect = [
+                None, MismatchedSettingError(PATH_TO_SIMULATION_RESULT, "date", "a", "b")
+            ] + [None] * file_count
+            with self.assertLogs(triton_logger, level=logging.WARNING) as log_context:
+                main(self.args, manager)
+            mock_restart.assert_called_once()
+            self.assertEqual(mock_first_simulation.call_count, 2)
+            self.assertEqual(mock_run_simulation.call_count, file_count - 1)
+        self.assertTrue(any("has 'b' as 'date'" in line for line in log_context.output))
+
+    def test_main_with_trace(self):
+        self.args.save_every = 2
+        self.args.restart_every = 3
+        self.args.trace = Path(__file__).parent / "samples" / "test-trace.jsonl"
+        file_count = len(list(self.args.precipitation_dir_path.iterdir()))
+        manager = ProcessManager()
+        with (
+                patch(MOCK_STRINGS["run_first"]) as mock_first_simulation,
+                patch(MOCK_STRINGS["run_simulation"]) as mock_run_simulation,
+                patch(MOCK_STRINGS["check_settings"]),
+                patch(MOCK_STRINGS["base_file_name"]) as mock_base_file_name,
+                patch.object(manager, "restart_netuno"),
+                patch(MOCK_STRINGS["wait_for"], return_value=0.5),
+                patch(MOCK_STRINGS["sleep"])):
+            mock_first_simulation.return_value = PATH_TO_SIMULATION_RESULT
+            mock_run_simulation.return_value = PATH_TO_SIMULATION_RESULT
+            mock_base_file_name.return_value = self.SAMPLE_FILE_NAME
+            with self.assertLogs("triton", level=logging.INFO) as log_context:
+                main(self.args, manager)
+            self.assertTrue(any("p95" in line for line in log_context.output))
+
+        with open(self.args.trace, encoding="utf-8") as trace_file:
+            spans = [json.loads(line) for line in trace_file]
+        self.args.trace.unlink()
+        self.args.trace = None
+
+        phases = [span["phase"] for span in spans]
+        self.assertEqual(phases.count("iteration"), file_count)
+        self.assertEqual(phases.count("wait_result"), file_count)
+        self.assertEqual(phases.count("parsing"), file_count)
+        self.assertEqual(phases.count("restart"), 1)
+        self.assertListEqual(
+            [span["iteration"] for span in spans if span["phase"] == "parsing"],
+            list(range(file_count)))
+        self.assertListEqual(
+            sorted({span["iteration"] for span in spans}), list(range(file_count)))
+
+    def test_main_fake_engine(self):
+        self.args.save_every = 2
+        self.args.restart_every = 3
+        self.args.engine = "fake"
+        self.args.netuno_exe_path = Path(__file__).parent.parent / "fake_netuno.py"
+        self.args.archive = Path(__file__).parent / "samples" / "test-results.tar.gz"
+        files = list(self.args.precipitation_dir_path.iterdir())
+        self.SAMPLE_RESULTS_FILE.unlink(missing_ok=True)
+        manager = ProcessManager(0)
+        try:
+            with (
+                    patch.dict(os.environ, {"FAKE_NETUNO_LATENCY": "0"}),
+                    patch(MOCK_STRINGS["base_file_name"]) as mock_base_file_name):
+                mock_base_file_name.return_value = self.SAMPLE_FILE_NAME
+                manager.run_netuno(self.args.netuno_exe_path)
+                main(self.args, manager)
+        finally:
+            manager.current_process.terminate()
+            manager.current_process.wait()
+            shutil.rmtree(FAKE_NETUNO_SPOOL_PATH, ignore_errors=True)
+            self.args.engine = "netuno"
+            self.args.netuno_exe_path = Path(__file__).parent / "netuno.exe"
+
+        with tarfile.open(self.args.archive) as archive:
+            self.assertEqual(len(archive.getnames()), len(files))
+        self.args.archive.unlink()
+        self.args.archive = None
+
+        with open(self.SAMPLE_RESULTS_FILE, encoding="utf-8") as results_file:
+            rows = list(csv.DictReader(results_file))
+        self.assertEqual(len(rows), 7 * len(files))
+        simulator = NetunoSimulator(**SIMULATION_PARAMETERS)
+        for file in files:
+            city, model, scenario = FileNameParser.get_metadata(file)
+            expected = simulator.simulate(PrecipitationParser(file).to_list())
+            row = next(
+                row for row in rows
+                if (row["city"], row["model"], row["scenario"]) == (city, model, scenario)
+                and row["metric"] == "potential_savings")
+            self.assertAlmostEqual(
+                float(row["value"]), expected["potential_savings"].value, places=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.SAMPLE_RESULTS_FILE.unlink(missing_ok=True)
+        RunManifest.path_for(cls.SAMPLE_RESULTS_FILE).unlink(missing_ok=True)
+        os.chdir(cls.previous_dir)
+        cls.working_dir.cleanup()
+
+
+class TestMainHeadlessFunction(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.SAMPLE_FILE_NAME = "test-headless-consolidated.csv"
+        cls.SAMPLE_RESULTS_FILE = Path(__file__).parent.parent / cls.SAMPLE_FILE_NAME
+        cls.PARQUET_FILE_NAME = "test-headless-consolidated.parquet"
+        cls.PARQUET_RESULTS_FILE = Path(__file__).parent.parent / cls.PARQUET_FILE_NAME
+        cls.args = CommandLineArgsValidator()
+        cls.args.precipitation_dir_path = Path(__file__).parent.parent / "example"
+        cls.args.save_every = 2
+        cls.args.batch_size = 2
+        cls.args.sweep = None
+        cls.args.workers = 1
+        cls.args.resume = None
+        cls.args.flush_rows = None
+        cls.args.flush_interval = None
+        cls.args.output_format = "csv"
+        cls.args.layout = "long"
+        cls.args.index = None
+        cls.args.input_dirs = None
+        cls.args.recursive = False
+        cls.args.include = None
+        cls.args.exclude = None
+        cls.args.city = None
+        cls.args.model = None
+        cls.args.scenario = None
+
+    def test_batched(self):
+        self.assertListEqual(list(batched(range(5), 2)), [[0, 1], [2, 3], [4]])
+
+    def test_main_headless(self):
+        self.args.engine = "headless"
+        file_count = len(list(self.args.precipitation_dir_path.glob("*.csv")))
+        with (
+                patch(MOCK_STRINGS["base_file_name"]) as mock_base_file_name,
+                patch(MOCK_STRINGS["popen"]) as popen_mock):
+            mock_base_file_name.return_value = self.SAMPLE_FILE_NAME
+            main_headless(self.args)
+            popen_mock.assert_not_called()
+
+        with open(self.SAMPLE_RESULTS_FILE, encoding="utf-8") as results_file:
+            rows = results_file.read().splitlines()
+        self.assertEqual(rows[0], ",".join(OUTPUT_COLUMNS))
+        self.assertEqual(len(rows), 1 + 7 * file_count)
+
+    def test_main_vectorized(self):
+        self.args.engine = "vectorized"
+        file_count = len(list(self.args.precipitation_dir_path.glob("*.csv")))
+        with patch(MOCK_STRINGS["base_file_name"]) as mock_base_file_name:
+            mock_base_file_name.return_value = self.SAMPLE_FILE_NAME
+            main_headless(self.args)
+
+        with open(self.SAMPLE_RESULTS_FILE, encoding="utf-8") as results_file:
+            rows = results_file.read().splitlines()
+        self.assertEqual(rows[0], ",".join(OUTPUT_COLUMNS))
+        self.assertEqual(len(rows), 1 + 7 * file_count)
+
+    def test_main_headless_with_workers(self):
+        self.args.engine = "headless"
+        self.args.workers = 2
+        with patch(MOCK_STRINGS["base_file_name"]) as mock_base_file_name:
+            mock_base_file_name.return_value = self.SAMPLE_FILE_NAME
+            main_headless(self.args)
+        self.args.workers = 1
+
+        with open(self.SAMPLE_RESULTS_FILE, encoding="utf-8") as results_file:
+            rows = results_file.read().splitlines()
+        expected_order = [
+            FileNameParser.get_metadata(file)
+            for file in self.args.precipitation_dir_path.iterdir()]
+        self.assertListEqual(
+            [tuple(row.split(",")[:3]) for row in rows[1::7]], expected_order)
+
+    def test_main_headless_with_sweep(self):
+        self.args.engine = "headless"
+        self.args.sweep = ["lower_tank_capacity=100,200", "catchment_area=50:100:25"]
+        self.args.batch_size = 100
+        file_count = len(list(self.args.precipitation_dir_path.glob("*.csv")))
+        with patch(MOCK_STRINGS["base_file_name"]) as mock_base_file_name:
+            mock_base_file_name.return_value = self.SAMPLE_FILE_NAME
+            main_headless(self.args)
+        self.args.sweep = None
+        self.args.batch_size = 2
+
+        with open(self.SAMPLE_RESULTS_FILE, encoding="utf-8") as results_file:
+            rows = results_file.read().splitlines()
+        self.assertEqual(
+            rows[0], ",".join(OUTPUT_COLUMNS + ("lower_tank_capacity", "catchment_area")))
+        self.assertEqual(len(rows), 1 + 7 * file_count * 6)
+        self.assertTrue(rows[1].endswith(",100.0,50.0"))
+
+    def test_main_headless_parquet(self):
+        self.args.engine = "headless"
+        self.args.output_format = "parquet"
+        file_count = len(list(self.args.precipitation_dir_path.glob("*.csv")))
+        with patch(MOCK_STRINGS["parquet_file_name"]) as mock_base_file_name:
+            mock_base_file_name.return_value = self.PARQUET_FILE_NAME
+            main_headless(self.args)
+        self.args.output_format = "csv"
+
+        results_file = pq.ParquetFile(self.PARQUET_RESULTS_FILE)
+        self.assertListEqual(results_file.schema_arrow.names, list(OUTPUT_COLUMNS))
+        self.assertEqual(results_file.metadata.num_rows, 7 * file_count)
+        self.assertEqual(results_file.num_row_groups, len(range(0, file_count, 2)))
+
+    def test_main_headless_wide(self):
+        self.args.engine = "headless"
+        self.args.layout = "wide"
+        file_count = len(list(self.args.precipitation_dir_path.glob("*.csv")))
+        with patch(MOCK_STRINGS["base_file_name"]) as mock_base_file_name:
+            mock_base_file_name.return_value = self.SAMPLE_FILE_NAME
+            main_headless(self.args)
+        self.args.layout = "long"
+
+        with open(self.SAMPLE_RESULTS_FILE, encoding="utf-8") as results_file:
+            rows = results_file.read().splitlines()
+        self.assertEqual(
+            rows[0], ",".join(OUTPUT_COLUMNS[:3] + tuple(SIMULATION_RESULT_UNITS)))
+        self.assertEqual(len(rows), 1 + file_count)
+        with open(self.SAMPLE_RESULTS_FILE.with_suffix(".metadata.json"),
+                  encoding="utf-8") as metadata_file:
+            metadata = json.load(metadata_file)
+        self.assertListEqual(list(metadata), list(SIMULATION_RESULT_UNITS))
+        self.assertEqual(metadata["potential_savings"]["unit"], "%")
+
+    def test_main_headless_resume(self):
+        self.args.engine = "headless"
+        all_files = list(self.args.precipitation_dir_path.glob("*.csv"))
+        with patch(MOCK_STRINGS["base_file_name"]) as mock_base_file_name:
+            mock_base_file_name.return_value = self.SAMPLE_FILE_NAME
+            main_headless(self.args)
+        with open(self.SAMPLE_RESULTS_FILE, encoding="utf-8") as results_file:
+            expected_rows = results_file.read().splitlines()
+
+        with open(self.SAMPLE_RESULTS_FILE, "r+", encoding="utf-8") as results_file:
+            results_file.writelines(line + "\n" for line in expected_rows[:-7])
+            results_file.truncate()
+        recorded_size = self.SAMPLE_RESULTS_FILE.stat().st_size
+        with open(self.SAMPLE_RESULTS_FILE, "a", encoding="utf-8") as results_file:
+            results_file.write("partial,row")
+        manifest = RunManifest(RunManifest.path_for(self.SAMPLE_RESULTS_FILE))
+        with manifest.connection:
+            manifest.connection.execute(
+                "DELETE FROM completed_files WHERE path = ?",
+                (str(all_files[-1].resolve()),))
+            manifest.connection.execute(
+                "UPDATE output SET size = ? WHERE id = 0", (recorded_size,))
+        manifest.close()
+
+        self.args.resume = self.SAMPLE_RESULTS_FILE
+        with patch(MOCK_STRINGS["simulate"], autospec=True,
+                   side_effect=NetunoSimulator.simulate) as mock_simulate:
+            main_headless(self.args)
+        self.args.resume = None
+
+        mock_simulate.assert_called_once()
+        with open(self.SAMPLE_RESULTS_FILE, encoding="utf-8") as results_file:
+            self.assertListEqual(results_file.read().splitlines(), expected_rows)
+
+    def tearDown(self):
+        for results_file in (self.SAMPLE_RESULTS_FILE, self.PARQUET_RESULTS_FILE):
+            results_file.unlink(missing_ok=True)
+            results_file.with_suffix(".metadata.json").unlink(missing_ok=True)
+            RunManifest.path_for(results_file).unlink(missing_ok=True)
+
     @classmethod
     def tearDownClass(cls):
         cls.SAMPLE_RESULTS_FILE.unlink(missing_ok=True)
+        RunManifest.path_for(cls.SAMPLE_RESULTS_FILE).unlink(missing_ok=True)
 
 
 if __name__ == "__main__":
@@ -3,9 +3,11 @@ from pathlib import Path
 
 from agents.validators import CommandLineArgsValidator
 from globals.errors import (
-    InvalidNetunoExecutableError, InvalidPartialSaveAttributeError,
-    InvalidRestartAttributeError, InvalidSourceDirectoryError, InvalidWaitAttributeError,
-    MissingInputDataError)
+    IncompatibleEngineError, IncompatibleFormatError, InvalidBatchSizeError,
+    InvalidCacheSizeError, InvalidFlushThresholdError, InvalidNetunoExecutableError,
+    InvalidPartialSaveAttributeError, InvalidRestartAttributeError, InvalidResumeFileError,
+    InvalidSourceDirectoryError, InvalidStartupTimeoutError, InvalidSweepSpecificationError,
+    InvalidWaitAttributeError, InvalidWorkersError, MissingInputDataError)
 
 
 class TestCommandLineArgsValidator(unittest.TestCase):
@@ -20,6 +22,25 @@ class TestCommandLineArgsValidator(unittest.TestCase):
         cls.validator = CommandLineArgsValidator()
         cls.validator.netuno_exe_path = cls.NETUNO_PATH
         cls.validator.precipitation_dir_path = cls.PRECIPITATION_PATH
+        cls.validator.engine = "netuno"
+        cls.validator.batch_size = 500
+        cls.validator.sweep = None
+        cls.validator.workers = 1
+        cls.validator.resume = None
+        cls.validator.cache = None
+        cls.validator.cache_size = 100
+        cls.validator.startup_probe = "fixed"
+        cls.validator.startup_timeout = 30
+        cls.validator.flush_rows = None
+        cls.validator.flush_interval = None
+        cls.validator.output_format = "csv"
+        cls.validator.input_dirs = None
+        cls.validator.recursive = False
+        cls.validator.include = None
+        cls.validator.exclude = None
+        cls.validator.city = None
+        cls.validator.model = None
+        cls.validator.scenario = None
 
     def test_validate_netuno_path_success(self):
         self.NETUNO_PATH.touch(exist_ok=True)
@@ -61,6 +82,33 @@ class TestCommandLineArgsValidator(unittest.TestCase):
         alternate_file.unlink()
         self.PRECIPITATION_PATH.rmdir()
 
+    def test_validate_precipitation_path_recursive(self):
+        nested_csv = Path(self.PRECIPITATION_PATH, "nested", "test.csv")
+        nested_csv.parent.mkdir(parents=True, exist_ok=True)
+        nested_csv.touch()
+
+        with self.assertRaises(MissingInputDataError):
+            self.validator._validate_precipitation_path()
+        self.validator.recursive = True
+        self.assertIsNone(self.validator._validate_precipitation_path())
+
+        self.validator.recursive = False
+        nested_csv.unlink()
+        nested_csv.parent.rmdir()
+        self.PRECIPITATION_PATH.rmdir()
+
+    def test_validate_precipitation_path_extra_dir(self):
+        self.PRECIPITATION_PATH.mkdir(exist_ok=True)
+        self.CSV_PATH.touch()
+        self.validator.input_dirs = [Path(self.BASE_PATH, "missing")]
+
+        with self.assertRaises(InvalidSourceDirectoryError):
+            self.validator._validate_precipitation_path()
+
+        self.validator.input_dirs = None
+        self.CSV_PATH.unlink()
+        self.PRECIPITATION_PATH.rmdir()
+
     def test_validate_save_every_n_success(self):
         self.validator.save_every = 5
 
@@ -88,12 +136,162 @@ class TestCommandLineArgsValidator(unittest.TestCase):
 
         self.assertIsNone(self.validator._validate_restart_every_n())
 
+    def test_validate_startup_timeout(self):
+        self.assertIsNone(self.validator._validate_startup_timeout())
+        self.validator.startup_timeout = 0
+        with self.assertRaises(InvalidStartupTimeoutError):
+            self.validator._validate_startup_timeout()
+        self.validator.startup_timeout = 30
+
     def test_validate_restart_every_n_failure(self):
         self.validator.restart_every = 0
 
         with self.assertRaises(InvalidRestartAttributeError):
             self.validator._validate_restart_every_n()
 
+    def test_validate_batch_size_success(self):
+        self.validator.batch_size = 5
+
+        self.assertIsNone(self.validator._validate_batch_size())
+
+    def test_validate_batch_size_failure(self):
+        self.validator.batch_size = 0
+
+        with self.assertRaises(InvalidBatchSizeError):
+            self.validator._validate_batch_size()
+
+        self.validator.batch_size = 500
+
+    def test_validate_sweep_success(self):
+        self.validator.engine = "vectorized"
+        self.validator.sweep = ["lower_tank_capacity=100:200:50"]
+
+        self.assertIsNone(self.validator._validate_sweep())
+
+        self.validator.engine = "netuno"
+        self.validator.sweep = None
+
+    def test_validate_sweep_invalid_specification(self):
+        self.validator.engine = "headless"
+        self.validator.sweep = ["unknown=1,2"]
+
+        with self.assertRaises(InvalidSweepSpecificationError):
+            self.validator._validate_sweep()
+
+        self.validator.engine = "netuno"
+        self.validator.sweep = None
+
+    def test_validate_sweep_incompatible_engine(self):
+        self.validator.sweep = ["lower_tank_capacity=100:200:50"]
+
+        with self.assertRaises(IncompatibleEngineError):
+            self.validator._validate_sweep()
+
+        self.validator.sweep = None
+
+    def test_validate_workers_success(self):
+        self.validator.engine = "headless"
+        self.validator.workers = 4
+
+        self.assertIsNone(self.validator._validate_workers())
+
+        self.validator.engine = "netuno"
+        self.validator.workers = 1
+
+    def test_validate_workers_failure(self):
+        self.validator.workers = 0
+
+        with self.assertRaises(InvalidWorkersError):
+            self.validator._validate_workers()
+
+        self.validator.workers = 1
+
+    def test_validate_workers_incompatible_engine(self):
+        self.validator.workers = 2
+
+        with self.assertRaises(IncompatibleEngineError):
+            self.validator._validate_workers()
+
+        self.validator.workers = 1
+
+    def test_validate_resume_path_success(self):
+        self.NETUNO_PATH.touch(exist_ok=True)
+        self.validator.resume = self.NETUNO_PATH
+
+        self.assertIsNone(self.validator._validate_resume_path())
+
+        self.validator.resume = None
+        self.NETUNO_PATH.unlink()
+
+    def test_validate_resume_path_failure(self):
+        self.validator.resume = Path(self.BASE_PATH, "missing-consolidated.csv")
+
+        with self.assertRaises(InvalidResumeFileError):
+            self.validator._validate_resume_path()
+
+        self.validator.resume = None
+
+    def test_validate_cache_success(self):
+        self.validator.cache = Path(self.BASE_PATH, "cache.sqlite")
+
+        self.assertIsNone(self.validator._validate_cache())
+
+        self.validator.cache = None
+
+    def test_validate_cache_size_failure(self):
+        self.validator.cache_size = 0
+
+        with self.assertRaises(InvalidCacheSizeError):
+            self.validator._validate_cache()
+
+        self.validator.cache_size = 100
+
+    def test_validate_cache_incompatible_engine(self):
+        self.validator.engine = "headless"
+        self.validator.cache = Path(self.BASE_PATH, "cache.sqlite")
+
+        with self.assertRaises(IncompatibleEngineError):
+            self.validator._validate_cache()
+
+        self.validator.engine = "netuno"
+        self.validator.cache = None
+
+    def test_validate_flush_thresholds_success(self):
+        self.validator.flush_rows = 100
+        self.validator.flush_interval = 0.5
+
+        self.assertIsNone(self.validator._validate_flush_thresholds())
+
+        self.validator.flush_rows = None
+        self.validator.flush_interval = None
+
+    def test_validate_flush_thresholds_failure(self):
+        for option, value in (("flush_rows", 0), ("flush_interval", -1.0)):
+            with self.subTest(option=option):
+                setattr(self.validator, option, value)
+
+                with self.assertRaises(InvalidFlushThresholdError):
+                    self.validator._validate_flush_thresholds()
+
+                setattr(self.validator, option, None)
+
+    def test_validate_output_format_success(self):
+        self.validator.output_format = "parquet"
+
+        self.assertIsNone(self.validator._validate_output_format())
+
+        self.validator.output_format = "csv"
+
+    def test_validate_output_format_resume(self):
+        self.validator.output_format = "parquet"
+        self.validator.resume = Path(self.BASE_PATH, "test-consolidated.parquet")
+
+        with self.assertRaises(IncompatibleFormatError):
+            self.validator._validate_output_format()
+
+        self.validator.output_format = "csv"
+        self.validator.resume = None
+
     def test_validate_arguments(self):
         self.PRECIPITATION_PATH.mkdir(exist_ok=True)
         self.NETUNO_PATH.touch(exist_ok=True)
@@ -108,6 +306,21 @@ class TestCommandLineArgsValidator(unittest.TestCase):
         self.NETUNO_PATH.unlink()
         self.PRECIPITATION_PATH.rmdir()
 
+    def test_validate_arguments_headless_ignores_netuno_path(self):
+        self.PRECIPITATION_PATH.mkdir(exist_ok=True)
+        self.NETUNO_PATH.unlink(missing_ok=True)
+        self.CSV_PATH.touch(exist_ok=True)
+        self.validator.save_every = 5
+        self.validator.wait = 2
+        self.validator.restart_every = 5
+        self.validator.engine = "headless"
+
+        self.assertIsNone(self.validator.validate_arguments())
+
+        self.validator.engine = "netuno"
+        self.CSV_PATH.unlink()
+        self.PRECIPITATION_PATH.rmdir()
+
 
 if __name__ == '__main__':
     unittest.main()
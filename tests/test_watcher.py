@@ -0,0 +1,136 @@
+import logging
+import shutil
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from agents.watcher import ResultWatcher, logger
+from globals.constants import RESULTS_FILE_STABLE_TIME
+from globals.errors import CustomTimeoutError
+from tests.test_sleeper import PATH_TO_SIMULATION_RESULT
+
+
+class TestResultWatcher(unittest.TestCase):
+
+    WATCHED_PATH = Path(__file__).parent / "watched"
+    RESULTS_PATH = WATCHED_PATH / "test.out.csv"
+
+    def setUp(self):
+        self.WATCHED_PATH.mkdir(exist_ok=True)
+        self.watcher = ResultWatcher(self.WATCHED_PATH)
+
+    def _write_results_later(self, delay: float) -> threading.Timer:
+        timer = threading.Timer(
+            delay, self.RESULTS_PATH.write_text, ("Resultados\n",), {"encoding": "utf-8"})
+        timer.start()
+        return timer
+
+    def test_wait_for_event(self):
+        self.watcher.start()
+        timer = self._write_results_later(0.05)
+
+        waited = self.watcher.wait_for(self.RESULTS_PATH, timeout=2)
+
+        timer.join()
+        self.assertTrue(self.RESULTS_PATH.is_file())
+        self.assertGreaterEqual(waited, 0.04)
+        self.assertLess(waited, 2)
+
+    def test_wait_for_existing_file(self):
+        self.watcher.start()
+        self.RESULTS_PATH.write_text("Resultados\n", encoding="utf-8")
+
+        self.assertLess(self.watcher.wait_for(self.RESULTS_PATH, timeout=2), 2)
+
+    def test_wait_for_timeout(self):
+        self.watcher.start()
+
+        with self.assertRaises(CustomTimeoutError):
+            self.watcher.wait_for(self.RESULTS_PATH, timeout=0.05)
+
+    def test_wait_for_unwatched_file(self):
+        self.watcher.start()
+
+        self.assertLess(self.watcher.wait_for(PATH_TO_SIMULATION_RESULT, timeout=1), 1)
+
+    def test_wait_for_without_start(self):
+        timer = self._write_results_later(0.05)
+
+        waited = self.watcher.wait_for(self.RESULTS_PATH, timeout=2)
+
+        timer.join()
+        self.assertGreaterEqual(waited, 0.04)
+
+    def test_wait_for_ignores_stale_close_event(self):
+        self.watcher.start()
+        if not self.watcher.reports_close:
+            self.skipTest("Backend does not report files being closed")
+        self.RESULTS_PATH.write_text("Resultados\n", encoding="utf-8")
+        time.sleep(0.1)
+        self.watcher.expect(self.RESULTS_PATH)
+        timer = self._write_results_later(0.3)
+
+        waited = self.watcher.wait_for(self.RESULTS_PATH, timeout=2)
+
+        timer.join()
+        self.assertGreaterEqual(waited, 0.25)
+
+    def test_wait_for_stable_size_without_close_events(self):
+        self.watcher.start()
+        self.watcher.reports_close = False
+        stop = threading.Event()
+
+        def write_slowly():
+            with open(self.RESULTS_PATH, "w", encoding="utf-8") as results_file:
+                for _ in range(6):
+                    results_file.write("Resultados\n")
+                    results_file.flush()
+                    stop.wait(0.05)
+
+        writer = threading.Thread(target=write_slowly)
+        writer.start()
+        waited = self.watcher.wait_for(self.RESULTS_PATH, timeout=2)
+        writer.join()
+
+        self.assertGreaterEqual(waited, 0.25 + RESULTS_FILE_STABLE_TIME)
+        self.assertEqual(self.RESULTS_PATH.read_text(encoding="utf-8").count("\n"), 6)
+        self.assertDictEqual(self.watcher.sizes, {})
+
+    def test_wait_for_ignores_stale_file(self):
+        self.watcher.start()
+        self.RESULTS_PATH.write_text("Resultados\n", encoding="utf-8")
+        for reports_close in (True, False):
+            with self.subTest(reports_close=reports_close):
+                self.watcher.reports_close = reports_close
+                self.watcher.expect(self.RESULTS_PATH)
+                with self.assertRaises(CustomTimeoutError):
+                    self.watcher.wait_for(self.RESULTS_PATH, timeout=0.7)
+                self.assertDictEqual(self.watcher.stale, {})
+
+    def test_wait_for_rewritten_stale_file(self):
+        self.watcher.start()
+        self.watcher.reports_close = False
+        self.RESULTS_PATH.write_text("Resultados\n", encoding="utf-8")
+        self.watcher.expect(self.RESULTS_PATH)
+        timer = self._write_results_later(0.3)
+
+        waited = self.watcher.wait_for(self.RESULTS_PATH, timeout=2)
+
+        timer.join()
+        self.assertGreaterEqual(waited, 0.25 + RESULTS_FILE_STABLE_TIME)
+
+    def test_start_missing_directory(self):
+        watcher = ResultWatcher(self.WATCHED_PATH / "missing")
+        with self.assertLogs(logger, level=logging.WARNING) as log_context:
+            watcher.start()
+            self.assertIn("polling it instead", log_context.output[0])
+        self.assertIsNone(watcher.observer)
+
+    def tearDown(self):
+        self.watcher.stop()
+        shutil.rmtree(self.WATCHED_PATH, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
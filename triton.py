@@ -1,101 +1,606 @@
 import logging
+import os
+import re
 import time
 from argparse import ArgumentParser
+from collections.abc import Iterable, Iterator
+from contextlib import closing
+from functools import partial
+from itertools import chain, islice
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from agents.automators import NetunoAutomator
+from agents.cache import ResultCache
 from agents.declutter import Declutter
+from agents.dispatcher import ParallelDispatcher
 from agents.exporter import CSVExporter
+from agents.indexer import InputIndex
 from agents.manager import ProcessManager
+from agents.manifest import RunManifest
 from agents.parsers import FileNameParser, ResultParser
-from agents.sleeper import Sleeper
+from agents.pipeline import Pipeline
+from agents.readiness import FixedWaitProbe, IdleProbe, ResponseProbe, WindowProbe
+from agents.restart import AdaptiveRestartPolicy, FixedRestartPolicy
+from agents.runner import HeadlessRunner
+from agents.scheduler import SimulationScheduler
+from agents.simulator import NetunoSimulator
+from agents.spool import SpoolAutomator
+from agents.sweep import ParameterSweep
+from agents.timing import AdaptiveTimer
+from agents.tracer import PhaseTracer
 from agents.validators import CommandLineArgsValidator
-from globals.constants import INITIAL_DATES, NETUNO_RESULTS_PATH, SIMULATION_PARAMETERS
+from agents.watcher import ResultWatcher
+from globals.constants import (
+    INITIAL_DATES, INPUT_INDEX_PATH, KEYSTROKE_PAUSE, NETUNO_RESULTS_PATH,
+    NETUNO_STARTUP_TIMEOUT, OUTPUT_COLUMNS, RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_PATH,
+    RESULTS_FILES_KEPT, SIMULATION_PARAMETERS, TIMING_PROFILE_PATH)
 from globals.errors import (
+    CustomTimeoutError, IncompatibleEngineError, IncompatibleFormatError,
+    InvalidBatchSizeError, InvalidCacheSizeError, InvalidFlushThresholdError,
     InvalidNetunoExecutableError, InvalidPartialSaveAttributeError,
-    InvalidSourceDirectoryError, MissingInputDataError)
+    InvalidPrecipitationDataError, InvalidSourceDirectoryError, InvalidResumeFileError,
+    InvalidStartupTimeoutError, InvalidSweepSpecificationError, InvalidWorkersError,
+    MismatchedSettingError, MissingInputDataError, NetunoUnresponsiveError)
+from globals.types import ResultTuple
+from globals.utils import get_export_path, setup_logger
+
+if TYPE_CHECKING:
+    from agents.automators import NetunoAutomator
 
 logger = logging.getLogger("triton")
 
 
-def setup_logger(
-        logger: logging.Logger, quiet_count: int = 0, verbose: bool = False) -> None:
+def list_input_files(args: CommandLineArgsValidator) -> Iterable[Path]:
+    """
+    Lists the precipitation files to be simulated, i.e. the CSV files of the input
+    directories that pass the given filters. If an index is requested, every file is
+    validated upfront through it, so invalid files stop the run before any simulation
+    starts.
+
+    Args:
+        args (CommandLineArgsValidator): Validated command line arguments.
+
+    Raises:
+        InvalidPrecipitationDataError: If the index finds any invalid file.
+
+    Returns:
+        Iterable[Path]: Precipitation files, listed lazily if there is no index.
+    """
+    files = args.discover_inputs()
+    if not args.index:
+        return files
+    index = InputIndex(args.index)
+    try:
+        entries = index.build(files, os.cpu_count() or 1)
+    finally:
+        index.close()
+    invalid_files = []
+    for entry in entries:
+        if entry.error:
+            logger.error(f"Invalid precipitation file '{entry.path.name}': {entry.error}")
+            invalid_files.append(entry.path)
+    if invalid_files:
+        raise InvalidPrecipitationDataError(invalid_files)
+    logger.info(f"Validated {len(entries)} precipitation file(s) through the index")
+    return [entry.path for entry in entries]
+
+
+def setup_exporter(
+        args: CommandLineArgsValidator,
+        columns: tuple[str, ...] = OUTPUT_COLUMNS) -> CSVExporter:
     """
-    Configures a logger for the application, defining output format and log level according
-    to quiet or verbose arguments.
+    Creates the exporter for the run, in the chosen format, either with a new output file
+    (and a new manifest) or appending to the one being resumed, and attaches the manifest of
+    completed input files to it.
 
     Args:
-        logger (logging.Logger): Logger channel to be configured.
-        quiet_count (int): Number of times the 'quiet' flag was provided. Defaults to 0.
-        verbose (bool): Whether the 'verbose' flag was provided. Defaults to False.
+        args (CommandLineArgsValidator): Validated command line arguments.
+        columns (tuple[str, ...], optional): Columns of the output file. Defaults to
+            `globals.constants.OUTPUT_COLUMNS`.
+
+    Returns:
+        CSVExporter: Exporter for the run.
     """
-    if verbose:
-        log_level = logging.DEBUG
-    elif quiet_count == 1:
-        log_level = logging.WARNING
-    elif quiet_count >= 2:
-        log_level = logging.ERROR
+    if args.resume:
+        logger.info(f"Resuming the run whose results are at '{args.resume.resolve()}'")
+        exporter = CSVExporter.resume(
+            args.resume, columns, args.flush_rows, args.flush_interval, args.layout)
     else:
-        log_level = logging.INFO
+        exporter_class = CSVExporter
+        if args.output_format == "parquet":
+            # PyArrow takes a noticeable time to import, which CSV runs do not need
+            from agents.parquet import ParquetExporter
+            exporter_class = ParquetExporter
+        exporter = exporter_class(
+            Path(__file__).parent, columns, args.flush_rows, args.flush_interval,
+            args.layout)
+        RunManifest.path_for(exporter.output_path).unlink(missing_ok=True)
+    exporter.use_manifest(RunManifest(RunManifest.path_for(exporter.output_path)))
+    return exporter
 
-    logger.propagate = True
-    logger.setLevel(log_level)
 
-    formatter = logging.Formatter(
-        fmt="%(asctime)s  %(levelname)-8.8s: %(message)s",
-        datefmt="%Y-%m-%dT%H:%M:%S%z")
-    handler = logging.StreamHandler()
-    handler.setLevel(log_level)
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+def skip_completed(files: Iterable[Path], manifest: RunManifest) -> Iterator[Path]:
+    """
+    Filters out, lazily, the input files already completed according to the manifest.
 
+    Args:
+        files (Iterable[Path]): Input files.
+        manifest (RunManifest): Manifest of the run.
 
-def main(args: CommandLineArgsValidator, manager: ProcessManager) -> None:
-    global_start_time = time.perf_counter()
-    automator = NetunoAutomator(args.wait)
-    exporter = CSVExporter(Path(__file__).parent)
-    NETUNO_RESULTS_PATH.mkdir(exist_ok=True)
-    declutter = Declutter(NETUNO_RESULTS_PATH)
+    Yields:
+        Iterator[Path]: Input files not completed yet.
+    """
+    for file in files:
+        if manifest.is_completed(file):
+            logger.debug(f"Skipping file '{file.name}', which was already processed")
+        else:
+            yield file
 
-    dir_generator = args.precipitation_dir_path.iterdir()
-    first_file = next(dir_generator)
-    city, model, scenario = FileNameParser.get_metadata(first_file)
-    logger.info(
-        f"Processing first file, containing data from the city of '{city}', "
-        f"model '{model}', scenario '{scenario}'")
-    results_file = automator.run_first_simulation(
-        first_file, INITIAL_DATES[scenario], **SIMULATION_PARAMETERS)
 
-    Sleeper.until_true(results_file.is_file)
-    exporter.add_results(ResultParser(results_file).to_list(city, model, scenario))
+def open_cache(args: CommandLineArgsValidator) -> ResultCache | None:
+    """
+    Opens the result cache, if enabled, bound to the version of the Netuno 4 executable.
 
-    iteration_start_time = time.perf_counter()
-    reconfigure = False
-    for counter, input_file in enumerate(dir_generator, start=2):
-        iteration = counter - 1
-        if iteration % args.restart_every == 0:
-            manager.restart_netuno()
-            reconfigure = True
-        city, model, scenario = FileNameParser.get_metadata(input_file)
-        logger.info(f"Processing city of '{city}', model '{model}', scenario '{scenario}'")
+    Args:
+        args (CommandLineArgsValidator): Validated command line arguments.
+
+    Returns:
+        ResultCache | None: Result cache, or None if it is disabled.
+    """
+    if not args.cache:
+        return None
+    return ResultCache(
+        args.cache, ResultCache.netuno_version(args.netuno_exe_path), args.cache_size)
+
+
+def skip_cached(
+        files: Iterable[Path],
+        cache: ResultCache,
+        exporter: CSVExporter,
+        deferred: dict[str, list[Path]]) -> Iterator[Path]:
+    """
+    Filters out, lazily, the input files whose results are cached, adding their results to
+    the exporter instead. Files identical to one still being simulated are deferred, to be
+    added by `add_deferred_results()` once its results are cached.
+
+    Args:
+        files (Iterable[Path]): Input files.
+        cache (ResultCache): Result cache.
+        exporter (CSVExporter): Exporter to which cached results are added.
+        deferred (dict[str, list[Path]]): Files deferred, by cache key of the file being
+            simulated, which is updated in place.
+
+    Yields:
+        Iterator[Path]: Input files whose results are not cached.
+    """
+    for file in files:
+        city, model, scenario = FileNameParser.get_metadata(file)
+        key = ResultCache.key_for(file, SIMULATION_PARAMETERS, INITIAL_DATES[scenario])
+        if key in deferred:
+            logger.debug(f"Deferring file '{file.name}', identical to one being simulated")
+            deferred[key].append(file)
+            continue
+        results = cache.get(key)
+        if results is None:
+            deferred[key] = []
+            yield file
+            continue
+        logger.info(
+            f"Using cached results for city of '{city}', model '{model}', "
+            f"scenario '{scenario}'")
+        exporter.add_results(
+            NetunoSimulator.results_to_list(results, city, model, scenario), [file])
+
+
+def add_deferred_results(
+        input_file: Path,
+        cache: ResultCache,
+        exporter: CSVExporter,
+        deferred: dict[str, list[Path]]) -> None:
+    """
+    Adds the results of the files deferred by `skip_cached()` until an identical file was
+    simulated, taking them from the cache.
+
+    Args:
+        input_file (Path): Path to the simulated precipitation file, whose results are
+            cached.
+        cache (ResultCache): Result cache.
+        exporter (CSVExporter): Exporter to which the results are added.
+        deferred (dict[str, list[Path]]): Files deferred, by cache key of the file being
+            simulated.
+    """
+    scenario = FileNameParser.get_metadata(input_file)[2]
+    key = ResultCache.key_for(input_file, SIMULATION_PARAMETERS, INITIAL_DATES[scenario])
+    for file in deferred.pop(key, []):
+        city, model, scenario = FileNameParser.get_metadata(file)
+        logger.info(
+            f"Using the results of '{input_file.name}' for city of '{city}', model "
+            f"'{model}', scenario '{scenario}'")
+        exporter.add_results(
+            NetunoSimulator.results_to_list(cache.get(key), city, model, scenario), [file])
+
+
+def collect_results(
+        results_file: Path,
+        input_file: Path,
+        cache: ResultCache | None,
+        tracer: PhaseTracer,
+        iteration: int) -> list[ResultTuple]:
+    """
+    Parses the results of a simulation run by Netuno 4, storing them in the cache, if any.
+
+    Args:
+        results_file (Path): Path to the results file generated by Netuno 4.
+        input_file (Path): Path to the simulated precipitation file.
+        cache (ResultCache | None): Result cache, if enabled.
+        tracer (PhaseTracer): Tracer of the phases of each iteration.
+        iteration (int): Iteration of the simulation, under which parsing is traced.
+
+    Returns:
+        list[ResultTuple]: Results in the format of `ResultParser.to_list()`.
+    """
+    city, model, scenario = FileNameParser.get_metadata(input_file)
+    with tracer.span("parsing", iteration):
+        results = ResultParser(results_file).parse_results()
+    if cache:
+        cache.put(
+            ResultCache.key_for(input_file, SIMULATION_PARAMETERS, INITIAL_DATES[scenario]),
+            results)
+    return NetunoSimulator.results_to_list(results, city, model, scenario)
+
+
+def open_timer(args: CommandLineArgsValidator) -> AdaptiveTimer:
+    """
+    Creates the timer of the delays used while automating Netuno 4, which is adaptive (and
+    loaded from its profile) only if requested.
+
+    Args:
+        args (CommandLineArgsValidator): Validated command line arguments.
+
+    Returns:
+        AdaptiveTimer: Timer for the run.
+    """
+    default_delays = {"keystroke_pause": KEYSTROKE_PAUSE, "explorer_wait": args.wait / 10}
+    if args.adaptive_timing:
+        return AdaptiveTimer.from_profile(args.adaptive_timing, default_delays)
+    return AdaptiveTimer(default_delays, adaptive=False)
+
+
+def create_restart_policy(
+        args: CommandLineArgsValidator) -> FixedRestartPolicy | AdaptiveRestartPolicy:
+    """
+    Creates the policy that decides when Netuno 4 is restarted.
+
+    Args:
+        args (CommandLineArgsValidator): Validated command line arguments.
+
+    Returns:
+        FixedRestartPolicy | AdaptiveRestartPolicy: Policy selected by the arguments.
+    """
+    if args.restart_policy == "adaptive":
+        return AdaptiveRestartPolicy()
+    return FixedRestartPolicy(args.restart_every)
+
+
+def create_startup_probe(
+        args: CommandLineArgsValidator) -> FixedWaitProbe | IdleProbe | WindowProbe:
+    """
+    Creates the probe that waits until Netuno 4 is ready to receive input after starting.
+
+    Args:
+        args (CommandLineArgsValidator): Validated command line arguments.
+
+    Returns:
+        FixedWaitProbe | IdleProbe | WindowProbe: Probe selected by the arguments.
+    """
+    if args.startup_probe == "window":
+        return WindowProbe(args.startup_timeout)
+    if args.startup_probe == "idle":
+        return IdleProbe(args.startup_timeout)
+    return FixedWaitProbe()
+
+
+def create_automator(
+        args: CommandLineArgsValidator,
+        tracer: PhaseTracer) -> "NetunoAutomator | SpoolAutomator":
+    """
+    Creates the automator of the selected engine: the Netuno 4 GUI, replaying compiled
+    keystroke plans if requested, or, with the 'fake' engine, the spool of requests
+    consumed by `fake_netuno.py`. With adaptive timing, the GUI automator measures how long
+    Netuno 4 takes to respond with a `ResponseProbe`.
+
+    Args:
+        args (CommandLineArgsValidator): Validated command line arguments.
+        tracer (PhaseTracer): Tracer of the phases of each iteration.
+
+    Returns:
+        NetunoAutomator | SpoolAutomator: Automator of the selected engine.
+    """
+    if args.engine == "fake":
+        return SpoolAutomator(args.wait, tracer)
+    probe = ResponseProbe() if args.adaptive_timing else None
+    # PyAutoGUI requires a display as soon as it is imported, which headless runs lack
+    if args.keystroke_plans:
+        from agents.plans import PlannedAutomator
+        return PlannedAutomator(args.wait, tracer, probe)
+    from agents.automators import NetunoAutomator
+    return NetunoAutomator(args.wait, tracer, probe)
+
+
+def run_netuno_simulation(
+        automator: "NetunoAutomator | SpoolAutomator",
+        watcher: ResultWatcher,
+        timer: AdaptiveTimer,
+        input_file: Path,
+        date: str,
+        reconfigure: bool) -> Path:
+    """
+    Runs the simulation of a file in Netuno 4, setting up the parameters first if needed,
+    and waits for its results to be written, updating the timer with the response times
+    measured by the automator. The results must have been simulated with the inputs that
+    were entered.
+
+    Args:
+        automator (NetunoAutomator | SpoolAutomator): Automator of Netuno 4.
+        watcher (ResultWatcher): Watcher of the results directory.
+        timer (AdaptiveTimer): Timer of the delays used by the automator.
+        input_file (Path): Path to the precipitation file.
+        date (str): Initial date of the simulation.
+        reconfigure (bool): Whether the simulation parameters must be set up.
+
+    Raises:
+        CustomTimeoutError: If the results file is not written in time.
+        NetunoUnresponsiveError: If Netuno 4 does not respond to the keys sent to it.
+        MismatchedSettingError: If the results were simulated with other inputs.
+
+    Returns:
+        Path: Path to the results file.
+    """
+    watcher.expect(get_export_path(input_file))
+    try:
         if reconfigure:
             results_file = automator.run_first_simulation(
-                input_file, INITIAL_DATES[scenario], **SIMULATION_PARAMETERS)
-            reconfigure = False
+                input_file, date, **SIMULATION_PARAMETERS)
         else:
-            results_file = automator.run_simulation(input_file, INITIAL_DATES[scenario])
-        Sleeper.until_true(results_file.is_file)
+            results_file = automator.run_simulation(input_file, date)
+    finally:
+        for step, latency in automator.pop_responses():
+            timer.measure(step, latency)
+    waited = watcher.wait_for(results_file)
+    logger.debug(f"Results file '{results_file.name}' written after {waited:.3f}s")
+    automator.tracer.record("wait_result", waited)
+    ResultParser(results_file).check_settings(input_file, date, SIMULATION_PARAMETERS)
+    timer.record_success()
+    automator.set_delays(**timer.delays)
+    return results_file
 
-        exporter.add_results(ResultParser(results_file).to_list(city, model, scenario))
+
+def simulate_with_retry(
+        automator: "NetunoAutomator | SpoolAutomator",
+        watcher: ResultWatcher,
+        timer: AdaptiveTimer,
+        manager: ProcessManager,
+        policy: FixedRestartPolicy | AdaptiveRestartPolicy,
+        input_file: Path,
+        date: str,
+        reconfigure: bool) -> Path:
+    """
+    Runs the simulation of a file with `run_netuno_simulation()`. If it fails (its results
+    are not written in time, Netuno 4 does not respond or the results were simulated with
+    other inputs), backs off the delays, restarts Netuno 4 (resetting the restart policy,
+    as a scheduled restart does) and tries once more.
+
+    Args:
+        automator (NetunoAutomator | SpoolAutomator): Automator of Netuno 4.
+        watcher (ResultWatcher): Watcher of the results directory.
+        timer (AdaptiveTimer): Timer of the delays used by the automator.
+        manager (ProcessManager): Manager of the Netuno 4 process.
+        policy (FixedRestartPolicy | AdaptiveRestartPolicy): Restart policy.
+        input_file (Path): Path to the precipitation file.
+        date (str): Initial date of the simulation.
+        reconfigure (bool): Whether the simulation parameters must be set up.
+
+    Raises:
+        CustomTimeoutError: If the results file is not written in time again.
+        NetunoUnresponsiveError: If Netuno 4 does not respond again.
+        MismatchedSettingError: If the results were simulated with other inputs again.
+
+    Returns:
+        Path: Path to the results file.
+    """
+    try:
+        return run_netuno_simulation(
+            automator, watcher, timer, input_file, date, reconfigure)
+    except (CustomTimeoutError, NetunoUnresponsiveError, MismatchedSettingError) as error:
+        logger.warning(
+            f"Simulation of file '{input_file.name}' failed, restarting Netuno 4 and "
+            f"trying again. Details: {error}")
+        timer.record_failure()
+        automator.set_delays(**timer.delays)
+        with automator.tracer.span("restart"):
+            manager.restart_netuno()
+        policy.reset()
+        return run_netuno_simulation(automator, watcher, timer, input_file, date, True)
+
+
+def simulate_iteration(
+        automator: "NetunoAutomator | SpoolAutomator",
+        watcher: ResultWatcher,
+        timer: AdaptiveTimer,
+        manager: ProcessManager,
+        policy: FixedRestartPolicy | AdaptiveRestartPolicy,
+        task: tuple[int, Path]) -> Path:
+    """
+    Runs an iteration of the GUI stage of the pipeline: restarts Netuno 4 if the policy
+    says so, then simulates a file with `simulate_with_retry()`, setting up the parameters
+    on the first iteration and after restarts. Its results are parsed and exported
+    elsewhere, while the next file is simulated.
+
+    Args:
+        automator (NetunoAutomator | SpoolAutomator): Automator of Netuno 4.
+        watcher (ResultWatcher): Watcher of the results directory.
+        timer (AdaptiveTimer): Timer of the delays used by the automator.
+        manager (ProcessManager): Manager of the Netuno 4 process.
+        policy (FixedRestartPolicy | AdaptiveRestartPolicy): Restart policy.
+        task (tuple[int, Path]): Number of files simulated before and path to the
+            precipitation file.
+
+    Raises:
+        CustomTimeoutError: If the results file is not written in time, even after
+            restarting Netuno 4.
+        NetunoUnresponsiveError: If Netuno 4 does not respond, even after restarting it.
+        MismatchedSettingError: If the results were simulated with other inputs, even
+            after restarting Netuno 4.
+
+    Returns:
+        Path: Path to the results file.
+    """
+    iteration, input_file = task
+    iteration_start_time = time.perf_counter()
+    automator.tracer.iteration = iteration
+    reconfigure = iteration == 0
+    if iteration and policy.should_restart(iteration):
+        with automator.tracer.span("restart"):
+            manager.restart_netuno()
+        policy.reset()
+        reconfigure = True
+    city, model, scenario = FileNameParser.get_metadata(input_file)
+    if iteration:
+        logger.info(f"Processing city of '{city}', model '{model}', scenario '{scenario}'")
+    else:
+        logger.info(
+            f"Processing first file, containing data from the city of '{city}', "
+            f"model '{model}', scenario '{scenario}'")
+    results_file = simulate_with_retry(
+        automator, watcher, timer, manager, policy, input_file, INITIAL_DATES[scenario],
+        reconfigure)
+    iteration_time = time.perf_counter() - iteration_start_time
+    automator.tracer.record("iteration", iteration_time)
+    policy.record_iteration(iteration_time, manager.current_process)
+    return results_file
+
+
+def handle_results(
+        simulations: Iterable[tuple[tuple[int, Path], Path]],
+        args: CommandLineArgsValidator,
+        exporter: CSVExporter,
+        cache: ResultCache | None,
+        deferred: dict[str, list[Path]],
+        declutter: Declutter,
+        timer: AdaptiveTimer,
+        tracer: PhaseTracer) -> int:
+    """
+    Runs the results stage of the pipeline: parses the results of each simulation and
+    saves them to disk every `save_every` files, releasing their results files to the
+    declutter once saved. Spans are traced under the iteration of each simulation, since
+    the automator may already be running a later one.
+
+    Args:
+        simulations (Iterable[tuple[tuple[int, Path], Path]]): Number of files simulated
+            before, path to the precipitation file and path to its results file, for each
+            simulation.
+        args (CommandLineArgsValidator): Validated command line arguments.
+        exporter (CSVExporter): Exporter of the results.
+        cache (ResultCache | None): Result cache, if enabled.
+        deferred (dict[str, list[Path]]): Files deferred by `skip_cached()`.
+        declutter (Declutter): Declutter of the results directory.
+        timer (AdaptiveTimer): Timer of the delays used by the automator.
+        tracer (PhaseTracer): Tracer of the phases of each iteration.
+
+    Returns:
+        int: Number of files simulated.
+    """
+    counter = iteration = 0
+    consumed = []
+    for counter, ((iteration, input_file), results_file) in enumerate(
+            simulations, start=1):
+        exporter.add_results(
+            collect_results(results_file, input_file, cache, tracer, iteration),
+            [input_file])
+        if cache:
+            add_deferred_results(input_file, cache, exporter, deferred)
+        consumed.append(results_file.name)
         if counter % args.save_every == 0:
             logger.info(f"Saving the results to disk after processing {counter} file(s)")
-            exporter.save_results()
-            if args.clean:
-                declutter.clear_results_files()
+            with tracer.span("exporting", iteration):
+                exporter.save_results()
+            declutter.release(consumed)
+            consumed = []
+            if args.adaptive_timing:
+                timer.save_profile(args.adaptive_timing)
+    with tracer.span("exporting", iteration):
+        exporter.save_results()
+    declutter.release(consumed)
+    return counter
+
+
+def main(
+        args: CommandLineArgsValidator,
+        manager: ProcessManager,
+        input_files: Iterable[Path] | None = None) -> None:
+    global_start_time = time.perf_counter()
+    tracer = PhaseTracer(args.trace)
+    policy = create_restart_policy(args)
+    automator = create_automator(args, tracer)
+    timer = open_timer(args)
+    automator.set_delays(**timer.delays)
+    exporter = setup_exporter(args)
+    NETUNO_RESULTS_PATH.mkdir(exist_ok=True)
+    declutter = Declutter(
+        NETUNO_RESULTS_PATH, 0 if args.clean else RESULTS_FILES_KEPT, args.archive)
+    # Files kept by an earlier run have the same names as the exports of this one
+    if declutter.clear_results_files():
+        logger.info(
+            f"Deleted the results files left over at '{NETUNO_RESULTS_PATH.resolve()}'")
+    watcher = ResultWatcher(NETUNO_RESULTS_PATH)
+    watcher.start()
+
+    cache = open_cache(args)
+
+    dir_generator = skip_completed(
+        SimulationScheduler.order(
+            list_input_files(args) if input_files is None else input_files),
+        exporter.manifest)
+    deferred = {}
+    if cache:
+        dir_generator = skip_cached(dir_generator, cache, exporter, deferred)
+    first_file = next(dir_generator, None)
+    if first_file is None:
+        logger.info("No input files left to simulate")
+        exporter.save_results()
+        exporter.close()
+        watcher.stop()
+        tracer.close()
+        return
 
-    declutter.clear_results_files()
-    exporter.save_results()
+    # Results are parsed and exported here, while the next file is simulated
+    simulations = Pipeline().imap(
+        partial(simulate_iteration, automator, watcher, timer, manager, policy),
+        enumerate(chain([first_file], dir_generator)))
+    iteration_start_time = time.perf_counter()
+    declutter.start()
+    try:
+        with closing(simulations):
+            counter = handle_results(
+                simulations, args, exporter, cache, deferred, declutter, timer, tracer)
+    finally:
+        declutter.stop()
+    watcher.stop()
+    exporter.close()
     logger.info(f"Successfully saved results at '{exporter.output_path.resolve()}'")
+    if cache:
+        logger.info(f"Result cache hits: {cache.hits}, misses: {cache.misses}")
+        cache.close()
+    if args.adaptive_timing:
+        timer.save_profile(args.adaptive_timing)
+        logger.info(f"Saved timing profile at '{args.adaptive_timing.resolve()}'")
+    logger.debug(f"Final timings: {timer.describe()}")
+    tracer.close()
+    report_level = logging.INFO if args.trace else logging.DEBUG
+    for line in tracer.report():
+        logger.log(report_level, line)
+    if args.trace:
+        logger.info(f"Saved trace of every phase at '{args.trace.resolve()}'")
 
     end_time = time.perf_counter()
     total_iteration_time = end_time - iteration_start_time
@@ -103,10 +608,79 @@ def main(args: CommandLineArgsValidator, manager: ProcessManager) -> None:
         f"Completed all operations. "
         f"Total time: {end_time - global_start_time:.2f}s. "
         f"Total iteration time: {total_iteration_time:.2f}s. "
-        f"Average iteration time ({iteration} entries): "
-        f"{total_iteration_time/iteration:.2f}s")
+        f"Average iteration time ({counter} entries): "
+        f"{total_iteration_time/max(counter, 1):.2f}s")
+
+    if args.clean:
+        declutter.clear_results_files()
+        Declutter.remove_results_dir()
+    else:
+        logger.info(
+            f"Kept the last {len(declutter.recent)} results file(s) at "
+            f"'{NETUNO_RESULTS_PATH.resolve()}'")
 
-    Declutter.remove_results_dir()
+
+def batched(files: Iterable[Path], batch_size: int) -> Iterator[list[Path]]:
+    """
+    Splits an iterable of files into lists of up to `batch_size` files, lazily.
+
+    Args:
+        files (Iterable[Path]): Files to be split.
+        batch_size (int): Maximum number of files per batch.
+
+    Yields:
+        Iterator[list[Path]]: Consecutive batches of files.
+    """
+    iterator = iter(files)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+def main_headless(
+        args: CommandLineArgsValidator, input_files: Iterable[Path] | None = None) -> None:
+    global_start_time = time.perf_counter()
+    sweep = ParameterSweep.from_specifications(args.sweep) if args.sweep else None
+    runner = HeadlessRunner(
+        NetunoSimulator(**SIMULATION_PARAMETERS),
+        args.engine == "vectorized",
+        sweep,
+        args.batch_size)
+    exporter = setup_exporter(args, sweep.columns if sweep else OUTPUT_COLUMNS)
+
+    if input_files is None:
+        input_files = list_input_files(args)
+    input_files = skip_completed(input_files, exporter.manifest)
+    batches = batched(input_files, args.batch_size if runner.vectorized else 1)
+    if args.workers > 1:
+        logger.info(f"Distributing the simulations over {args.workers} processes")
+        results = ParallelDispatcher(args.workers).imap(runner.run, batches)
+    else:
+        results = ((batch, runner.run(batch)) for batch in batches)
+
+    counter = failed = unsaved = 0
+    for batch, content in results:
+        counter += len(batch)
+        if content is None:
+            failed += len(batch)
+            continue
+        exporter.add_results(content, batch)
+        unsaved += len(batch)
+        if unsaved >= args.save_every:
+            logger.info(f"Saving the results to disk after processing {counter} file(s)")
+            exporter.save_results()
+            unsaved = 0
+    if unsaved:
+        exporter.save_results()
+    exporter.close()
+    logger.info(f"Successfully saved results at '{exporter.output_path.resolve()}'")
+    if failed:
+        logger.warning(f"Could not simulate {failed} file(s), see errors above")
+
+    total_time = time.perf_counter() - global_start_time
+    logger.info(
+        f"Completed all operations. "
+        f"Total time: {total_time:.2f}s. "
+        f"Average iteration time ({counter} entries): {total_time/max(counter, 1):.4f}s")
 
 
 if __name__ == "__main__":
@@ -128,7 +702,8 @@ if __name__ == "__main__":
             "Overrides --quiet"))
     parser.add_argument(
         "--clean", action="store_true", default=False,
-        help="delete result files generated by Netuno after parsing them")
+        help="delete result files generated by Netuno as soon as their results are saved. "
+        f"Otherwise, the last {RESULTS_FILES_KEPT} are kept")
     parser.add_argument(
         "-w", "--wait", type=float, default=1, metavar="T",
         help="configurable wait for the selection of files in Windows Explorer. "
@@ -138,10 +713,148 @@ if __name__ == "__main__":
         "-n", "--save-every", type=int, default=10, dest="save_every", metavar="N",
         help="number of files to process before saving the in-memory results to a file. "
         "Must be a positive integer. Defaults to 10.")
+    parser.add_argument(
+        "--format", choices=("csv", "parquet"), default="csv", dest="output_format",
+        help="format of the consolidated output file. 'parquet' writes a compressed, "
+        "columnar file (one row group per save), which is only readable after the run and "
+        "cannot be resumed. Defaults to 'csv'.")
+    parser.add_argument(
+        "--layout", choices=("long", "wide"), default="long",
+        help="layout of the consolidated output file. 'long' writes one row per metric of "
+        "each simulation, while 'wide' writes one row per simulation, with one column per "
+        "metric, and the labels and units of the metrics to a JSON sidecar file. Defaults "
+        "to 'long'.")
+    parser.add_argument(
+        "--flush-rows", type=int, metavar="R",
+        help="also save results to disk as soon as at least R rows are pending (checked "
+        "after each file). Must be a positive integer. Disabled by default")
+    parser.add_argument(
+        "--flush-interval", type=float, metavar="S",
+        help="also save results to disk as soon as S seconds have passed since the last "
+        "save (checked after each file). Must be a positive number. Disabled by default")
     parser.add_argument(
         "-r", "--restart-every", type=int, default=15, dest="restart_every", metavar="K",
-        help="number of files to process before restarting the Netuno process. "
-        "Must be a positive integer. Defaults to 15.")
+        help="number of files to process before restarting the Netuno process, with the "
+        "'fixed' restart policy. Must be a positive integer. Defaults to 15.")
+    parser.add_argument(
+        "--restart-policy", choices=("fixed", "adaptive"), default="fixed",
+        help="when to restart the Netuno process. 'fixed' restarts it every K files (see "
+        "--restart-every), while 'adaptive' restarts it only when its iteration latency, "
+        "memory or open handles grow past a threshold, compared to the first iterations "
+        "after it started. Defaults to 'fixed'")
+    parser.add_argument(
+        "--startup-probe", choices=("fixed", "window", "idle"), default="fixed",
+        help="how to tell when Netuno 4 is ready to receive input, after it is started or "
+        "restarted. 'fixed' waits a fixed time, while 'window' waits until its window is "
+        "shown (only on Windows) and 'idle' until its process stops using the CPU, "
+        "failing after --startup-timeout seconds. Defaults to 'fixed'")
+    parser.add_argument(
+        "--startup-timeout", type=float, default=NETUNO_STARTUP_TIMEOUT, metavar="S",
+        help="maximum time, in seconds, to wait for Netuno 4 to be ready with the 'window' "
+        "and 'idle' probes. Must be a positive number. Defaults to "
+        f"{NETUNO_STARTUP_TIMEOUT}.")
+    parser.add_argument(
+        "-e", "--engine", choices=("netuno", "fake", "headless", "vectorized"),
+        default="netuno",
+        help="simulation backend. 'netuno' automates the Netuno 4 GUI, while 'headless' "
+        "reproduces its water balance in Python, without starting Netuno (in which case "
+        "the path to the executable is ignored and Netuno options have no effect), and "
+        "'vectorized' does the same with NumPy, for many files at once. 'fake' runs the "
+        "same loop as 'netuno', with the path to 'fake_netuno.py' as the executable, "
+        "requesting simulations through files instead of the GUI, to benchmark the loop "
+        "without Windows. Defaults to 'netuno'.")
+    parser.add_argument(
+        "-b", "--batch-size", type=int, default=500, dest="batch_size", metavar="B",
+        help="number of files simulated at once, and saved together, by the 'vectorized' "
+        "engine. Must be a positive integer. Defaults to 500.")
+    parser.add_argument(
+        "-s", "--sweep", action="append", metavar="NAME=VALUES",
+        help="simulate every combination of values of the given parameter, which may be "
+        "repeated for other parameters, e.g. 'lower_tank_capacity=100:1000:50' (inclusive "
+        "range) or 'catchment_area=50,75,100'. Names are the keys of "
+        "SIMULATION_PARAMETERS, whose values are used for parameters not swept. Only "
+        "supported by headless engines, which process it like the 'vectorized' engine, "
+        "with at most B columns per array. The values are included as extra output "
+        "columns.")
+    parser.add_argument(
+        "-j", "--workers", type=int, default=1, metavar="N",
+        help="number of processes that run simulations in parallel, each with a batch of "
+        "files (or a single file, for the 'headless' engine) at a time. Results are saved "
+        "in the same order as the input files, and files whose simulation fails are "
+        "skipped. Only supported by headless engines. Must be a positive integer. "
+        "Defaults to 1.")
+    parser.add_argument(
+        "--resume", type=Path, metavar="path/to/consolidated.csv",
+        help="resume an interrupted run, appending to its output file and skipping the "
+        "input files already saved to it, according to the manifest kept next to it "
+        "(which every run creates, with the extension '.manifest.sqlite'). Files modified "
+        "since then are processed again")
+    parser.add_argument(
+        "--cache", nargs="?", type=Path, const=RESULT_CACHE_PATH, metavar="path/to/cache",
+        help="reuse the results of files simulated before with the same contents, "
+        "parameters and initial date, kept in a SQLite database (defaults to "
+        f"'{RESULT_CACHE_PATH}'). Cached results are discarded whenever the Netuno 4 "
+        "executable changes. Only supported by the 'netuno' engine")
+    parser.add_argument(
+        "--adaptive-timing", nargs="?", type=Path, const=TIMING_PROFILE_PATH,
+        metavar="path/to/profile",
+        help="adapt the pause after each keystroke and the wait for Windows Explorer to "
+        "how long Netuno 4 takes to open and close Windows Explorer, backing off when a "
+        "simulation fails. Learned timings are saved to "
+        f"a JSON profile (defaults to '{TIMING_PROFILE_PATH}') and reused by the next run")
+    parser.add_argument(
+        "--trace", type=Path, metavar="path/to/trace.jsonl",
+        help="write how long each phase of every iteration took (file selection, date "
+        "typing, simulation and export, waiting for results, parsing, exporting and "
+        "restarting) to a JSONL file, and report the p50, p95 and maximum duration of "
+        "each phase at the end. Only used by the 'netuno' engine")
+    parser.add_argument(
+        "--keystroke-plans", action="store_true", default=False,
+        help="compile the inputs of each simulation into a plan once, then replay it for "
+        "every file as a few batched key sequences, pausing only where Netuno 4 needs time "
+        "to respond, instead of after every keystroke. Only used by the 'netuno' engine")
+    parser.add_argument(
+        "--archive", type=Path, metavar="path/to/results.tar.gz",
+        help="add every results file generated by Netuno, once its results are saved, to a "
+        "compressed tarball (which is overwritten), instead of only keeping the last "
+        f"{RESULTS_FILES_KEPT} (or none, with --clean). Only used by the 'netuno' engine")
+    parser.add_argument(
+        "-i", "--input-dir", action="append", type=Path, dest="input_dirs",
+        metavar="path/to/precipitation",
+        help="another directory with precipitation files, searched after the previous "
+        "ones. May be repeated")
+    parser.add_argument(
+        "-R", "--recursive", action="store_true", default=False,
+        help="also search every subdirectory of the precipitation directories (e.g. "
+        "'city/model/scenario' trees). Files are found lazily, so simulations start as "
+        "soon as the first one is found, except with the 'netuno' engine, which schedules "
+        "every file upfront")
+    parser.add_argument(
+        "--include", action="append", metavar="GLOB",
+        help="only simulate files whose paths end with a match of the glob pattern, e.g. "
+        "'*_SSP245.csv' or 'Florianópolis/*/*.csv'. May be repeated, in which case "
+        "matching any of them is enough")
+    parser.add_argument(
+        "--exclude", action="append", metavar="GLOB",
+        help="skip files whose paths end with a match of the glob pattern. May be repeated")
+    for field in ("city", "model", "scenario"):
+        parser.add_argument(
+            f"--{field}", type=re.compile, metavar="REGEX",
+            help=f"only simulate files whose {field}, parsed from their names, contains a "
+            "match of the regular expression")
+    parser.add_argument(
+        "--index", nargs="?", type=Path, const=INPUT_INDEX_PATH, metavar="path/to/index",
+        help="validate every precipitation file before any simulation starts (known "
+        "scenario, numeric and non-negative values, and the same number of rows as most "
+        "files of the same scenario), in parallel, stopping if any is invalid. Files are "
+        "recorded in a SQLite index (defaults to "
+        f"'{INPUT_INDEX_PATH}'), with their size, modification time, hash and metadata, "
+        "so unchanged files are not read again by the next run")
+    parser.add_argument(
+        "--cache-size", type=int, default=RESULT_CACHE_MAX_ENTRIES, metavar="N",
+        help="maximum number of results kept in the cache, evicting the least recently "
+        f"used ones beyond it. Must be a positive integer. Defaults to "
+        f"{RESULT_CACHE_MAX_ENTRIES}.")
 
     validator = CommandLineArgsValidator()
     parser.parse_args(namespace=validator)
@@ -153,15 +866,38 @@ if __name__ == "__main__":
             InvalidNetunoExecutableError,
             InvalidSourceDirectoryError,
             InvalidPartialSaveAttributeError,
+            InvalidBatchSizeError,
+            InvalidSweepSpecificationError,
+            InvalidWorkersError,
+            InvalidResumeFileError,
+            InvalidCacheSizeError,
+            InvalidFlushThresholdError,
+            InvalidStartupTimeoutError,
+            IncompatibleEngineError,
+            IncompatibleFormatError,
             MissingInputDataError) as exception:
         logger.exception(f"Command line arguments validation failed. Details:\n{exception}")
         raise SystemExit
 
-    manager = ProcessManager()
-    manager.run_netuno(validator.netuno_exe_path)
     try:
-        main(validator, manager)
+        input_files = list_input_files(validator)
+    except InvalidPrecipitationDataError as exception:
+        logger.exception(f"Precipitation data validation failed. Details:\n{exception}")
+        raise SystemExit
+
+    if validator.engine in ("headless", "vectorized"):
+        try:
+            main_headless(validator, input_files)
+        except Exception as exception:
+            logger.exception(
+                f"An error occurred during the operation. Details:\n{exception}")
+        raise SystemExit
+
+    manager = ProcessManager(probe=create_startup_probe(validator))
+    try:
+        manager.run_netuno(validator.netuno_exe_path)
+        main(validator, manager, input_files)
     except Exception as exception:
         logger.exception(f"An error occurred during the operation. Details:\n{exception}")
     finally:
-        manager.current_process.terminate()
+        manager.terminate()